@@ -3,27 +3,133 @@ Script para verificar se a carga completa do CSV foi realizada na tabela embeddi
 Compara o número de registros do arquivo CSV com o total de registros nos chunks.
 """
 
-import pandas as pd
 from src.vectorstore.supabase_client import supabase
 from src.utils.logging_config import get_logger
+import json
+import logging
+import os
 import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Tuple
+
+try:
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - dependência opcional
+    PYARROW_AVAILABLE = False
 
 logger = get_logger(__name__)
 
+# Contagens de linhas já calculadas, por (caminho, tamanho, mtime) do CSV;
+# resolvido a partir da raiz do projeto, não do diretório de execução
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_COUNT_CACHE_PATH = os.path.join(PROJECT_ROOT, '.cache', 'csv_counts.json')
+
+
+def _chave_cache_csv(file_path: str, modo: str) -> str:
+    """Chave que muda sempre que o arquivo é alterado (uma chamada a stat)."""
+    stat = os.stat(file_path)
+    return f"{modo}:{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def _ler_cache_contagens() -> dict:
+    try:
+        with open(CSV_COUNT_CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_cache_contagens(cache: dict) -> None:
+    """Grava o cache de forma atômica (arquivo temporário + rename)."""
+    try:
+        os.makedirs(os.path.dirname(CSV_COUNT_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{CSV_COUNT_CACHE_PATH}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CSV_COUNT_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"⚠️ Não foi possível gravar o cache de contagens: {e}")
+
+
+def _contar_linhas_arquivo(file_path: str, block_size: int) -> int:
+    """Conta as linhas do arquivo em blocos binários, sem parsear células."""
+    linhas = 0
+    ultimo_byte = b''
+    with open(file_path, 'rb') as f:
+        while True:
+            bloco = f.read(block_size)
+            if not bloco:
+                break
+            linhas += bloco.count(b'\n')
+            ultimo_byte = bloco[-1:]
+    
+    # Última linha sem quebra de linha final também é um registro
+    if ultimo_byte and ultimo_byte != b'\n':
+        linhas += 1
+    return max(linhas - 1, 0)
+
+
+def _contar_registros_parseados(file_path: str, block_size: int) -> int:
+    """Conta os registros parseando o CSV (respeita quebras de linha entre aspas).
+    
+    Usa o leitor em streaming do pyarrow (multithread, um lote por vez) quando
+    instalado; caso contrário, o pandas em blocos lendo apenas a primeira coluna.
+    """
+    if PYARROW_AVAILABLE:
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=block_size),
+        )
+        return sum(batch.num_rows for batch in reader)
+    
+    import pandas as pd
+    # Com uma única coluna, um bloco de 1M de linhas ocupa poucos MB
+    return sum(len(chunk) for chunk in pd.read_csv(file_path, usecols=[0], chunksize=1_000_000))
+
 
-def contar_registros_csv(file_path: str) -> int:
+def contar_registros_csv(file_path: str, block_size: int = 1 << 20, exato: bool = False) -> int:
     """
     Conta o número de registros (linhas) no arquivo CSV, excluindo o cabeçalho.
     
+    Por padrão o arquivo é lido em blocos binários de 1 MiB e as quebras de
+    linha são contadas com bytes.count, sem parsear células nem montar um
+    DataFrame. Isso assume registros sem quebras de linha dentro de campos
+    entre aspas (caso do creditcard.csv); para CSVs com esses campos use
+    ``exato=True``, que parseia o arquivo em streaming.
+    
+    O resultado fica em cache em .cache/csv_counts.json, indexado por
+    caminho, tamanho e mtime: execuções seguintes sobre o mesmo arquivo
+    custam apenas um stat.
+    
     Args:
         file_path: Caminho do arquivo CSV
+        block_size: Tamanho de cada bloco lido
+        exato: Parsear o CSV em vez de contar quebras de linha
         
     Returns:
         Número total de registros no CSV
     """
     try:
-        df = pd.read_csv(file_path)
-        total = len(df)
+        chave = _chave_cache_csv(file_path, 'parse' if exato else 'linhas')
+        cache = _ler_cache_contagens()
+        if chave in cache:
+            total = cache[chave]
+            logger.info(f"📊 Total de registros no CSV: {total:,} (cache)")
+            return total
+        
+        if exato:
+            total = _contar_registros_parseados(file_path, block_size)
+        else:
+            total = _contar_linhas_arquivo(file_path, block_size)
+        
+        # Descarta contagens de versões anteriores do mesmo arquivo
+        prefixo = chave.rsplit('|', 2)[0] + '|'
+        cache = {k: v for k, v in cache.items() if not k.startswith(prefixo)}
+        cache[chave] = total
+        _gravar_cache_contagens(cache)
         logger.info(f"📊 Total de registros no CSV: {total:,}")
         return total
     except Exception as e:
@@ -36,42 +142,120 @@ def contar_registros_chunks() -> int:
     Conta o número de registros extraídos dos chunks na tabela embeddings.
     Cada chunk contém múltiplas linhas do CSV original.
     
+    A contagem é feita no Postgres pela função count_chunk_records()
+    (migration 0008; com a migration 0010 ela apenas soma a coluna
+    pré-calculada chunk_lines): apenas o total trafega pela rede. Se a função ainda
+    não existir no banco, os chunks são baixados e contados localmente.
+    
     Returns:
         Número total de registros nos chunks
     """
+    # Métrica barata e independente da contagem de registros: mesmo que a
+    # contagem falhe, o número de chunks já foi registrado
     try:
-        # Buscar todos os chunks
-        response = supabase.table('embeddings').select('chunk_text').execute()
-        
-        if not response.data:
+        logger.info(f"📦 Total de chunks na tabela: {_contar_total_chunks():,}")
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível contar os chunks: {e}")
+    
+    try:
+        response = supabase.rpc('count_chunk_records').execute()
+        total_registros = int(response.data or 0)
+        logger.info(f"📊 Total de registros extraídos dos chunks: {total_registros:,}")
+        return total_registros
+    except Exception as e:
+        logger.warning(f"⚠️ count_chunk_records() indisponível ({e}); contando localmente. "
+                       f"Aplique a migration 0008 para contar no servidor.")
+        return _contar_registros_chunks_local()
+
+
+# Linha vazia ou só com espaços (em qualquer posição do texto)
+_LINHA_EM_BRANCO = re.compile(r'^[^\S\n]*$', re.MULTILINE)
+
+
+def _contar_linhas_validas(chunk_text: str) -> int:
+    """Conta as linhas não vazias do chunk (cada linha representa um registro).
+    
+    Equivale a contar as linhas de ``chunk_text.strip().split('\\n')`` que não
+    são só espaços, sem criar a lista de linhas nem cópias com strip: total
+    de linhas menos as linhas em branco encontradas pela regex.
+    """
+    return chunk_text.count('\n') + 1 - len(_LINHA_EM_BRANCO.findall(chunk_text))
+
+
+def _contar_registros_pagina(textos: list) -> int:
+    """Conta as linhas não vazias de vários chunks em uma única varredura.
+    
+    Os chunks são unidos por uma quebra de linha: a junção nunca emenda a
+    última linha de um chunk com a primeira do seguinte, então o total é
+    igual à soma de _contar_linhas_validas em cada chunk, sem laço Python
+    por chunk.
+    """
+    return _contar_linhas_validas('\n'.join(textos))
+
+
+def _buscar_pagina_chunks(offset: int, batch_size: int, tentativas: int = 3) -> list:
+    """Busca uma página de chunk_text, repetindo a requisição em falhas transitórias."""
+    for tentativa in range(1, tentativas + 1):
+        try:
+            response = (
+                supabase.table('embeddings')
+                .select('chunk_text')
+                .order('id')
+                .range(offset, offset + batch_size - 1)
+                .execute()
+            )
+            return response.data or []
+        except Exception as e:
+            if tentativa == tentativas:
+                raise
+            logger.warning(f"⚠️ Falha ao buscar chunks {offset:,}+ (tentativa {tentativa}/{tentativas}): {e}")
+            time.sleep(tentativa)
+
+
+def _contar_total_chunks() -> int:
+    """Número de linhas da tabela embeddings (contagem exata, nenhuma linha transferida)."""
+    response = supabase.table('embeddings').select('id', count='exact', head=True).execute()
+    return response.count or 0
+
+
+def _contar_pagina(offset: int, batch_size: int) -> Tuple[int, int]:
+    """Busca e conta uma página; retorna (chunks lidos, registros)."""
+    textos = [row.get('chunk_text') or '' for row in _buscar_pagina_chunks(offset, batch_size)]
+    # Log dos primeiros 5 chunks para debug; a contagem extra só roda com DEBUG ativo
+    if offset == 0 and logger.isEnabledFor(logging.DEBUG):
+        for idx, chunk_text in enumerate(textos[:5], 1):
+            logger.debug("Chunk %d: %d registros", idx, _contar_linhas_validas(chunk_text))
+    return len(textos), _contar_registros_pagina(textos)
+
+
+def _contar_registros_chunks_local(batch_size: int = 5000, max_workers: int = 4) -> int:
+    """Baixa os chunk_text em páginas e conta as linhas não vazias de cada um.
+    
+    As páginas (ordenadas por id para que a paginação seja estável) são
+    buscadas em paralelo: o tempo é dominado pela rede, não pela contagem.
+    Cada thread descarta o texto após contar, então no máximo max_workers
+    páginas ficam em memória ao mesmo tempo.
+    """
+    try:
+        total_chunks = _contar_total_chunks()
+        if total_chunks == 0:
             logger.warning("⚠️ Nenhum chunk encontrado na tabela embeddings")
             return 0
         
-        total_chunks = len(response.data)
-        logger.info(f"📦 Total de chunks na tabela: {total_chunks:,}")
-        
-        # Contar registros em cada chunk
+        chunks_lidos = 0
         total_registros = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_contar_pagina, offset, batch_size)
+                for offset in range(0, total_chunks, batch_size)
+            ]
+            for future in as_completed(futures):
+                lidos, registros = future.result()
+                chunks_lidos += lidos
+                total_registros += registros
+                logger.info(f"📦 {chunks_lidos:,}/{total_chunks:,} chunks processados ({total_registros:,} registros)")
         
-        for idx, row in enumerate(response.data, 1):
-            chunk_text = row.get('chunk_text', '')
-            
-            if not chunk_text:
-                continue
-            
-            # Contar linhas no chunk (cada linha representa um registro)
-            # Considerando que cada registro está em uma linha separada
-            linhas = chunk_text.strip().split('\n')
-            
-            # Filtrar linhas vazias
-            linhas_validas = [linha for linha in linhas if linha.strip()]
-            
-            num_registros = len(linhas_validas)
-            total_registros += num_registros
-            
-            if idx <= 5:  # Log dos primeiros 5 chunks para debug
-                logger.debug(f"Chunk {idx}: {num_registros} registros")
-        
+        logger.info(f"📦 Total de chunks na tabela: {chunks_lidos:,}")
         logger.info(f"📊 Total de registros extraídos dos chunks: {total_registros:,}")
         return total_registros
         
@@ -80,6 +264,28 @@ def contar_registros_chunks() -> int:
         raise
 
 
+def _comparar_no_servidor(total_csv: int) -> Tuple[int, int, float]:
+    """Compara os totais com verificacao_carga() (migration 0009) em uma única chamada.
+    
+    O Postgres conta os chunks e os registros extraídos e calcula a diferença
+    e o percentual em relação ao total do CSV: nenhum chunk_text trafega.
+    
+    Returns:
+        (registros nos chunks, diferença, percentual carregado)
+    """
+    response = supabase.rpc('verificacao_carga', {'expected_total': total_csv}).execute()
+    linha = response.data[0]
+    logger.info(f"📦 Total de chunks na tabela: {linha['num_chunks']:,}")
+    logger.info(f"📊 Total de registros extraídos dos chunks: {linha['chunks_total']:,}")
+    return int(linha['chunks_total']), int(linha['diferenca']), float(linha['percentual'])
+
+
+def _escrever_bloco(linhas: list) -> None:
+    """Escreve as linhas no stdout com um único write (sem intercalar com outras saídas)."""
+    sys.stdout.write('\n'.join(linhas) + '\n')
+    sys.stdout.flush()
+
+
 def verificar_carga_completa(csv_path: str):
     """
     Verifica se a carga do CSV foi completa comparando os totais.
@@ -87,44 +293,48 @@ def verificar_carga_completa(csv_path: str):
     Args:
         csv_path: Caminho do arquivo CSV original
     """
-    print("\n" + "="*70)
-    print("🔍 VERIFICAÇÃO DE CARGA COMPLETA - EMBEDDINGS")
-    print("="*70 + "\n")
+    separador = "=" * 70
+    # Cabeçalho escrito antes das contagens (que podem demorar), em um único write
+    _escrever_bloco([
+        "", separador,
+        "🔍 VERIFICAÇÃO DE CARGA COMPLETA - EMBEDDINGS",
+        separador, "",
+        "📁 Analisando arquivo CSV...",
+        "🔎 Analisando chunks na tabela embeddings...",
+    ])
     
     try:
-        # Contar registros no CSV
-        print("📁 Analisando arquivo CSV...")
         total_csv = contar_registros_csv(csv_path)
+        try:
+            total_chunks, diferenca, percentual = _comparar_no_servidor(total_csv)
+        except Exception as e:
+            logger.warning(f"⚠️ verificacao_carga() indisponível ({e}); comparando localmente. "
+                           f"Aplique a migration 0009 para comparar no servidor.")
+            total_chunks = contar_registros_chunks()
+            diferenca = total_csv - total_chunks
+            percentual = (total_chunks / total_csv * 100) if total_csv > 0 else 0
         
-        # Contar registros nos chunks
-        print("\n🔎 Analisando chunks na tabela embeddings...")
-        total_chunks = contar_registros_chunks()
-        
-        # Comparar totais
-        print("\n" + "="*70)
-        print("📊 RESULTADO DA VERIFICAÇÃO")
-        print("="*70)
-        print(f"✅ Registros no arquivo CSV:        {total_csv:>10,}")
-        print(f"📦 Registros extraídos dos chunks:  {total_chunks:>10,}")
-        print("-"*70)
-        
-        diferenca = total_csv - total_chunks
-        percentual = (total_chunks / total_csv * 100) if total_csv > 0 else 0
-        
-        print(f"📈 Percentual carregado:            {percentual:>9.2f}%")
-        print(f"📉 Diferença:                       {diferenca:>10,}")
-        print("="*70)
-        
+        linhas = [
+            "", separador,
+            "📊 RESULTADO DA VERIFICAÇÃO",
+            separador,
+            f"✅ Registros no arquivo CSV:        {total_csv:>10,}",
+            f"📦 Registros extraídos dos chunks:  {total_chunks:>10,}",
+            "-" * 70,
+            f"📈 Percentual carregado:            {percentual:>9.2f}%",
+            f"📉 Diferença:                       {diferenca:>10,}",
+            separador, "",
+        ]
         if total_chunks == total_csv:
-            print("\n✅ CARGA COMPLETA! Todos os registros foram carregados com sucesso.")
+            linhas.append("✅ CARGA COMPLETA! Todos os registros foram carregados com sucesso.")
         elif total_chunks > total_csv:
-            print(f"\n⚠️ ATENÇÃO! Há {diferenca * -1:,} registros A MAIS nos chunks.")
-            print("   Pode haver duplicação ou linhas extras no processamento.")
+            linhas.append(f"⚠️ ATENÇÃO! Há {diferenca * -1:,} registros A MAIS nos chunks.")
+            linhas.append("   Pode haver duplicação ou linhas extras no processamento.")
         else:
-            print(f"\n❌ CARGA INCOMPLETA! Faltam {diferenca:,} registros ({100-percentual:.2f}%).")
-            print("   Recomenda-se reprocessar o arquivo CSV.")
-        
-        print("\n" + "="*70 + "\n")
+            linhas.append(f"❌ CARGA INCOMPLETA! Faltam {diferenca:,} registros ({100-percentual:.2f}%).")
+            linhas.append("   Recomenda-se reprocessar o arquivo CSV.")
+        linhas += ["", separador, ""]
+        _escrever_bloco(linhas)
         
         return {
             'csv_total': total_csv,
@@ -136,7 +346,7 @@ def verificar_carga_completa(csv_path: str):
         
     except Exception as e:
         logger.error(f"❌ Erro na verificação: {e}")
-        print(f"\n❌ Erro ao verificar carga: {e}\n")
+        _escrever_bloco(["", f"❌ Erro ao verificar carga: {e}", ""])
         raise
 
 
@@ -0,0 +1,63 @@
+-- ============================================================================
+-- Migration 0006: Busca de similaridade da memória guiada pelo índice HNSW
+-- Reescreve search_memory_similarity() para que o ORDER BY ... LIMIT seja
+-- resolvido pelo índice idx_agent_memory_embeddings_vector (HNSW, cosseno)
+-- Autor: Sistema Multiagente EDA AI Minds
+-- ============================================================================
+
+-- A versão da migration 0005 calculava a distância cosseno três vezes por
+-- linha e filtrava o threshold no mesmo nível do ORDER BY. Aqui a subconsulta
+-- obtém os k vizinhos mais próximos pelo índice (distância calculada uma vez)
+-- e o threshold é aplicado apenas sobre esses k candidatos. O resultado é
+-- equivalente: linhas além do k-ésimo vizinho são mais distantes e não
+-- entrariam no LIMIT.
+CREATE OR REPLACE FUNCTION search_memory_similarity(
+    p_agent_name VARCHAR(100),
+    p_session_id UUID,
+    p_query_embedding vector(1536),
+    p_similarity_threshold DECIMAL(4,3) DEFAULT 0.800,
+    p_limit INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+    id UUID,
+    source_text TEXT,
+    similarity DECIMAL(4,3),
+    embedding_type VARCHAR(50),
+    conversation_id UUID,
+    context_id UUID,
+    metadata JSONB
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        nearest.id,
+        nearest.source_text,
+        (1 - nearest.distance)::DECIMAL(4,3) AS similarity,
+        nearest.embedding_type,
+        nearest.conversation_id,
+        nearest.context_id,
+        nearest.metadata
+    FROM (
+        SELECT
+            ame.id,
+            ame.source_text,
+            ame.embedding_type,
+            ame.conversation_id,
+            ame.context_id,
+            ame.metadata,
+            ame.embedding <=> p_query_embedding AS distance
+        FROM agent_memory_embeddings ame
+        WHERE ame.agent_name = p_agent_name
+          AND (p_session_id IS NULL OR ame.session_id = p_session_id)
+        ORDER BY ame.embedding <=> p_query_embedding
+        LIMIT p_limit
+    ) AS nearest
+    WHERE (1 - nearest.distance) >= p_similarity_threshold
+    ORDER BY nearest.distance;
+$$;
+
+COMMENT ON FUNCTION search_memory_similarity IS 'Busca k vizinhos mais próximos via índice HNSW e aplica o threshold de similaridade';
+
+-- ============================================================================
+-- FIM DA MIGRATION 0006
+-- ============================================================================
@@ -0,0 +1,50 @@
+-- ============================================================================
+-- Migration 0007: Embeddings em meia precisão (halfvec)
+-- Armazena public.embeddings.embedding como halfvec(384) em vez de vector(384)
+-- Requer pgvector >= 0.7.0
+-- Autor: Sistema Multiagente EDA AI Minds
+-- ============================================================================
+
+-- halfvec usa 2 bytes por dimensão: a tabela e o índice HNSW ficam com metade
+-- do tamanho e as varreduras de similaridade leem metade dos dados. Para
+-- embeddings normalizados do all-MiniLM-L6-v2 a diferença de similaridade
+-- cosseno em relação ao float32 fica na ordem de 1e-3.
+
+drop index if exists idx_embeddings_embedding_hnsw;
+
+alter table public.embeddings
+    alter column embedding type halfvec(384) using embedding::halfvec(384);
+
+create index idx_embeddings_embedding_hnsw
+    on public.embeddings using hnsw (embedding halfvec_cosine_ops);
+
+-- A assinatura muda de tipo, então a função anterior precisa ser removida
+drop function if exists match_embeddings(vector, float, int);
+
+create or replace function match_embeddings(
+    query_embedding halfvec(384),
+    similarity_threshold float default 0.5,
+    match_count int default 10
+)
+returns table (
+    id uuid,
+    chunk_text text,
+    metadata jsonb,
+    similarity float
+)
+language sql stable
+as $$
+    select
+        embeddings.id,
+        embeddings.chunk_text,
+        embeddings.metadata,
+        1 - (embeddings.embedding <=> query_embedding) as similarity
+    from embeddings
+    where 1 - (embeddings.embedding <=> query_embedding) > similarity_threshold
+    order by similarity desc
+    limit match_count;
+$$;
+
+-- ============================================================================
+-- FIM DA MIGRATION 0007
+-- ============================================================================
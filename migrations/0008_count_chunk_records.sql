@@ -0,0 +1,23 @@
+-- ============================================================================
+-- Migration 0008: Contagem de registros dos chunks no servidor
+-- Cria count_chunk_records(), usada por debug/verificar_carga_completa.py
+-- Autor: Sistema Multiagente EDA AI Minds
+-- ============================================================================
+
+-- Cada linha não vazia de chunk_text corresponde a um registro do CSV
+-- original. Antes o script baixava todos os chunk_text para contar as linhas
+-- em Python; aqui a soma é feita no Postgres e apenas o total trafega.
+create or replace function count_chunk_records()
+returns bigint
+language sql stable
+as $$
+    select count(*)
+    from embeddings,
+         regexp_split_to_table(embeddings.chunk_text, E'\n') as line
+    where embeddings.chunk_text is not null
+      and line ~ '\S';
+$$;
+
+-- ============================================================================
+-- FIM DA MIGRATION 0008
+-- ============================================================================
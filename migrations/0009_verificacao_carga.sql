@@ -0,0 +1,37 @@
+-- ============================================================================
+-- Migration 0009: Verificação de carga em uma única chamada
+-- Cria verificacao_carga(), usada por debug/verificar_carga_completa.py
+-- Autor: Sistema Multiagente EDA AI Minds
+-- ============================================================================
+
+-- Recebe o total de registros do CSV (contado no cliente) e devolve, em uma
+-- única linha, o número de chunks, os registros extraídos deles (mesma regra
+-- de count_chunk_records, migration 0008) e a comparação com o esperado.
+create or replace function verificacao_carga(expected_total bigint)
+returns table (
+    num_chunks bigint,
+    chunks_total bigint,
+    csv_total bigint,
+    diferenca bigint,
+    percentual double precision
+)
+language sql stable
+as $$
+    with totais as (
+        select (select count(*) from embeddings) as num_chunks,
+               count_chunk_records() as chunks_total
+    )
+    select totais.num_chunks,
+           totais.chunks_total,
+           expected_total,
+           expected_total - totais.chunks_total,
+           case when expected_total > 0
+                then totais.chunks_total * 100.0 / expected_total
+                else 0
+           end::double precision
+    from totais;
+$$;
+
+-- ============================================================================
+-- FIM DA MIGRATION 0009
+-- ============================================================================
@@ -0,0 +1,32 @@
+-- ============================================================================
+-- Migration 0010: Contagem de linhas pré-calculada por chunk
+-- Adiciona embeddings.chunk_lines e passa count_chunk_records() a somá-la
+-- Autor: Sistema Multiagente EDA AI Minds
+-- ============================================================================
+
+-- Número de linhas não vazias do chunk (mesma regra da migration 0008),
+-- calculado uma única vez na inserção. No modo 'n' o ^ casa no início de
+-- cada linha e a classe [^\n] não atravessa quebras: cada casamento é uma
+-- linha com ao menos um caractere não branco. regexp_count exige Postgres 15+.
+-- A coluna é preenchida para as linhas existentes (reescreve a tabela).
+alter table embeddings
+    add column if not exists chunk_lines integer
+    generated always as (coalesce(regexp_count(chunk_text, '^[^\n]*\S', 1, 'n'), 0)) stored;
+
+-- Índice estreito: a soma pode ser feita por index-only scan, sem ler o heap
+-- (vetores e chunk_text)
+create index if not exists embeddings_chunk_lines_idx on embeddings (chunk_lines);
+
+-- A contagem deixa de reprocessar todos os chunk_text a cada verificação;
+-- verificacao_carga() (migration 0009) usa esta função e herda o ganho
+create or replace function count_chunk_records()
+returns bigint
+language sql stable
+as $$
+    select coalesce(sum(chunk_lines), 0)::bigint
+    from embeddings;
+$$;
+
+-- ============================================================================
+-- FIM DA MIGRATION 0010
+-- ============================================================================
@@ -271,6 +271,16 @@ class BaseAgent(ABC):
             self.logger.error(f"Erro ao recuperar estatísticas: {e}")
             return {'memory_available': False, 'error': str(e)}
     
+    async def close_memory(self) -> None:
+        """Persiste as interações ainda em buffer e encerra o sistema de memória."""
+        if not self.has_memory:
+            return
+        
+        try:
+            await self._memory_manager.close()
+        except Exception as e:
+            self.logger.error(f"Erro ao encerrar memória: {e}")
+    
     # ========================================================================
     # MÉTODOS DE VISUALIZAÇÃO
     # ========================================================================
@@ -13,7 +13,7 @@ from __future__ import annotations
 import json
 import pandas as pd
 import numpy as np
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Protocol, Union, runtime_checkable
 from datetime import datetime
 
 try:
@@ -27,6 +27,16 @@ except (ImportError, RuntimeError) as e:
 from src.agent.base_agent import BaseAgent, AgentError
 
 
+@runtime_checkable
+class EmbeddingsCompliantAgent(Protocol):
+    """Interface mínima de um agente que responde apenas via tabela embeddings."""
+    
+    def load_from_embeddings(self, dataset_filter: Optional[str] = None,
+                             limit: int = 1000) -> Dict[str, Any]: ...
+    
+    def validate_architecture_compliance(self) -> Dict[str, Any]: ...
+
+
 class EmbeddingsAnalysisAgent(BaseAgent):
     """Agente para análise inteligente de dados via embeddings.
     
@@ -17,7 +17,9 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(root_dir))
 
+import asyncio
 import re
+import threading
 from typing import Any, Dict, List, Optional, Union, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -26,19 +28,6 @@ from src.agent.base_agent import BaseAgent, AgentError
 from src.agent.csv_analysis_agent import EmbeddingsAnalysisAgent
 from src.data.data_processor import DataProcessor
 
-# Import condicional do RAGAgent (pode falhar se Supabase não configurado)
-try:
-    from src.agent.rag_agent import RAGAgent
-    RAG_AGENT_AVAILABLE = True
-except ImportError as e:
-    RAG_AGENT_AVAILABLE = False
-    RAGAgent = None
-    print(f"⚠️ RAGAgent não disponível: {str(e)[:100]}...")
-except RuntimeError as e:
-    RAG_AGENT_AVAILABLE = False  
-    RAGAgent = None
-    print(f"⚠️ RAGAgent não disponível: {str(e)[:100]}...")
-
 # Import do cliente Supabase para verificação de dados
 try:
     from src.vectorstore.supabase_client import supabase
@@ -91,6 +80,14 @@ except RuntimeError as e:
     print(f"⚠️ Prompt Manager não disponível: {str(e)[:100]}...")
 
 
+# Hyperscan (opcional): varredura multi-padrão em passada única
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
 class QueryType(Enum):
     """Tipos de consultas que o orquestrador pode processar."""
     CSV_ANALYSIS = "csv_analysis"      # Análise de dados CSV
@@ -122,6 +119,133 @@ class OrchestratorResponse:
     error: Optional[str] = None
 
 
+# Palavras-chave para classificação de consultas
+CSV_KEYWORDS = frozenset([
+    'csv', 'tabela', 'dados', 'análise', 'estatística', 'correlação',
+    'gráfico', 'plot', 'visualização', 'resumo', 'describe', 'dataset',
+    'colunas', 'linhas', 'média', 'mediana', 'fraude', 'outlier',
+    'tipos de dados', 'numéricos', 'categóricos', 'distribuição',
+    'intervalo', 'mínimo', 'máximo', 'min', 'max', 'range', 'amplitude',
+    'variância', 'desvio', 'percentil', 'quartil', 'valores'
+])
+
+RAG_KEYWORDS = frozenset([
+    'buscar', 'procurar', 'encontrar', 'pesquisar', 'consultar',
+    'conhecimento', 'base', 'documento', 'texto', 'similar',
+    'contexto', 'embedding', 'semântica', 'retrieval'
+])
+
+DATA_KEYWORDS = frozenset([
+    'carregar', 'upload', 'importar', 'abrir', 'arquivo',
+    'dados sintéticos', 'gerar dados', 'criar dados', 'load'
+])
+
+LLM_KEYWORDS = frozenset([
+    'explicar', 'explique', 'interpretar', 'interprete', 'insight', 'insights', 
+    'conclusão', 'conclusões', 'recomendação', 'recomendações', 'recomende',
+    'sugestão', 'sugestões', 'sugira', 'opinião', 'análise detalhada', 
+    'relatório', 'sumário', 'resume', 'resumo detalhado', 'padrão', 'padrões', 
+    'tendência', 'tendências', 'previsão', 'hipótese', 'teoria', 'tire', 'conclua',
+    'analise', 'avalie', 'considere', 'entenda', 'compreenda', 'descoberta',
+    'descobrimentos', 'comportamento', 'anomalia', 'anômalo', 'suspeito',
+    'detalhado', 'profundo', 'aprofunde', 'discuta', 'comente', 'o que',
+    'quais', 'como', 'por que', 'porque'
+])
+
+GENERAL_KEYWORDS = frozenset([
+    'olá', 'oi', 'ajuda', 'como', 'o que', 'qual', 'quando',
+    'onde', 'por que', 'definir', 'status', 'sistema'
+])
+
+# Estatísticas que o agente CSV calcula com dados reais
+STATS_KEYWORDS = frozenset([
+    'intervalo', 'mínimo', 'máximo', 'min', 'max', 'range', 'amplitude',
+    'variância', 'desvio', 'percentil', 'quartil',
+    'média', 'mediana', 'mean', 'median', 'tendência central'
+])
+
+
+class KeywordScanner:
+    """Encontra, em uma única passada, quais palavras-chave ocorrem no texto.
+    
+    Equivale a ``{kw for kw in keywords if kw in text}``: usa um banco
+    Hyperscan quando disponível e, caso contrário, uma única regex com
+    alternância em lookahead (mais longa primeiro). Na regex, cada posição
+    reporta só a palavra mais longa que começa ali; as demais que começam na
+    mesma posição são prefixos dela e são recuperadas por ``_prefixes``.
+    """
+    
+    def __init__(self, keywords):
+        self.keywords = tuple(sorted(set(keywords), key=lambda kw: (-len(kw), kw)))
+        self._prefixes = {
+            kw: frozenset(other for other in self.keywords if kw.startswith(other))
+            for kw in self.keywords
+        }
+        self._pattern = re.compile(
+            "(?=(" + "|".join(re.escape(kw) for kw in self.keywords) + "))"
+        )
+        self._database = None
+        if HYPERSCAN_AVAILABLE:
+            try:
+                self._database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+                self._database.compile(
+                    expressions=[re.escape(kw).encode("utf-8") for kw in self.keywords],
+                    ids=list(range(len(self.keywords))),
+                    elements=len(self.keywords),
+                    flags=[0] * len(self.keywords),
+                )
+                self._scratch_lock = threading.Lock()
+            except Exception:
+                self._database = None
+    
+    def scan(self, text: str) -> frozenset:
+        """Retorna o conjunto de palavras-chave contidas em ``text``."""
+        if self._database is not None:
+            found = set()
+            
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(pattern_id)
+            
+            # O scratch do Hyperscan não pode ser usado por duas threads ao mesmo tempo
+            with self._scratch_lock:
+                self._database.scan(text.encode("utf-8"), match_event_handler=on_match)
+            return frozenset(self.keywords[pattern_id] for pattern_id in found)
+        
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._prefixes[match.group(1)]
+        return frozenset(found)
+    
+    def scan_many(self, texts: List[str]) -> List[frozenset]:
+        """Equivale a ``[self.scan(t) for t in texts]``, com um único bloqueio do scratch."""
+        if self._database is None:
+            return [self.scan(text) for text in texts]
+        
+        found_per_text = [set() for _ in texts]
+        
+        def on_match(pattern_id, start, end, flags, context):
+            context.add(pattern_id)
+        
+        with self._scratch_lock:
+            for text, found in zip(texts, found_per_text):
+                self._database.scan(text.encode("utf-8"), match_event_handler=on_match, context=found)
+        return [frozenset(self.keywords[pattern_id] for pattern_id in found) for found in found_per_text]
+
+
+_CLASSIFICATION_SCANNER = KeywordScanner(
+    CSV_KEYWORDS | RAG_KEYWORDS | DATA_KEYWORDS | LLM_KEYWORDS | GENERAL_KEYWORDS | STATS_KEYWORDS
+)
+
+# Termos que exigem consultar os dados reais antes de responder via LLM;
+# basta saber se algum ocorre, então uma única busca na regex compilada
+DATA_SPECIFIC_KEYWORDS = (
+    'tipos de dados', 'colunas', 'variáveis', 'estatísticas', 'resumo',
+    'distribuição', 'correlação', 'missing', 'nulos', 'formato',
+    'csv', 'arquivo', 'dataset', 'base de dados', 'planilha'
+)
+_DATA_SPECIFIC_PATTERN = re.compile("|".join(re.escape(kw) for kw in DATA_SPECIFIC_KEYWORDS))
+
+
 class OrchestratorAgent(BaseAgent):
     """Agente central que coordena todos os agentes especializados."""
     
@@ -178,18 +302,23 @@ class OrchestratorAgent(BaseAgent):
                 self.logger.warning(f"⚠️ {error_msg}")
         
         # RAG Agent (requer Supabase configurado)
-        if enable_rag_agent and RAG_AGENT_AVAILABLE:
+        if enable_rag_agent:
             try:
-                self.agents["rag"] = RAGAgent()
-                self.logger.info("✅ Agente RAG inicializado")
-            except Exception as e:
-                error_msg = f"RAG Agent: {str(e)}"
+                # Import tardio: o agente RAG puxa o modelo de embeddings
+                # (sentence-transformers/torch), desnecessário sem RAG
+                from src.agent.rag_agent import RAGAgent
+            except (ImportError, RuntimeError) as e:
+                error_msg = f"RAG Agent: Dependências não disponíveis (Supabase não configurado): {str(e)[:100]}"
                 initialization_errors.append(error_msg)
                 self.logger.warning(f"⚠️ {error_msg}")
-        elif enable_rag_agent and not RAG_AGENT_AVAILABLE:
-            error_msg = "RAG Agent: Dependências não disponíveis (Supabase não configurado)"
-            initialization_errors.append(error_msg)
-            self.logger.warning(f"⚠️ {error_msg}")
+            else:
+                try:
+                    self.agents["rag"] = RAGAgent()
+                    self.logger.info("✅ Agente RAG inicializado")
+                except Exception as e:
+                    error_msg = f"RAG Agent: {str(e)}"
+                    initialization_errors.append(error_msg)
+                    self.logger.warning(f"⚠️ {error_msg}")
 
         # LLM Manager (camada de abstração para múltiplos provedores)
         if enable_llm_manager and LLM_MANAGER_AVAILABLE:
@@ -340,7 +469,61 @@ class OrchestratorAgent(BaseAgent):
                     "agents_used": []
                 }
             )
-    
+
+    def process_batch(self, queries: List[str], context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Processa várias consultas independentes.
+
+        As consultas são classificadas antes do processamento e as do tipo
+        RAG_SEARCH têm seus embeddings gerados em uma única chamada ao modelo,
+        que o agente RAG reutiliza em vez de codificar cada consulta.
+
+        Args:
+            queries: Consultas do usuário
+            context: Contexto adicional comum a todas as consultas
+
+        Returns:
+            Respostas na mesma ordem de queries
+        """
+        base_context = dict(context or {})
+        query_contexts = [dict(base_context) for _ in queries]
+
+        if "rag" in self.agents:
+            rag_indexes = [
+                i for i, query_type in enumerate(self._classify_batch(queries, base_context))
+                if query_type == QueryType.RAG_SEARCH
+            ]
+            if len(rag_indexes) > 1:
+                try:
+                    embedding_results = self.agents["rag"].embedding_generator.generate_embeddings_for_texts(
+                        [queries[i] for i in rag_indexes]
+                    )
+                    for i, embedding_result in zip(rag_indexes, embedding_results):
+                        query_contexts[i]["query_embedding_result"] = embedding_result
+                    self.logger.info(f"🔍 Embeddings de {len(rag_indexes)} consultas RAG gerados em lote")
+                except Exception as e:
+                    self.logger.warning(f"Falha ao gerar embeddings em lote, usando por consulta: {e}")
+
+        return [
+            self.process(query, query_context or None)
+            for query, query_context in zip(queries, query_contexts)
+        ]
+
+    async def aprocess(self, query: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Versão assíncrona de process para consultas independentes.
+
+        A consulta roda em uma thread do executor padrão, de modo que várias
+        chamadas combinadas com asyncio.gather esperam os provedores LLM em
+        paralelo (o tempo total passa a ser o da consulta mais lenta).
+
+        Args:
+            query: Consulta do usuário
+            context: Contexto adicional
+
+        Returns:
+            Resposta consolidada, como em process
+        """
+        return await asyncio.to_thread(self.process, query, context)
+
     def _check_data_availability(self) -> bool:
         """Verifica se há dados disponíveis na base de dados.
         
@@ -571,8 +754,45 @@ class OrchestratorAgent(BaseAgent):
         Returns:
             Tipo da consulta identificado
         """
-        query_lower = query.lower()
+        return self._classify_with_keywords(
+            query,
+            context,
+            _CLASSIFICATION_SCANNER.scan(query.lower()),
+            self._check_data_availability()
+        )
+    
+    def _classify_batch(self, queries: List[str], context: Optional[Dict[str, Any]] = None) -> List[QueryType]:
+        """Classifica várias consultas de uma vez.
         
+        A disponibilidade de dados (consulta ao Supabase) é verificada uma única
+        vez e as palavras-chave de todas as consultas são buscadas em uma só
+        varredura do scanner.
+        
+        Args:
+            queries: Consultas do usuário
+            context: Contexto adicional comum (copiado para cada consulta)
+        
+        Returns:
+            Tipos identificados, na mesma ordem de queries
+        """
+        has_supabase_data = self._check_data_availability()
+        found_per_query = _CLASSIFICATION_SCANNER.scan_many([query.lower() for query in queries])
+        return [
+            self._classify_with_keywords(
+                query,
+                dict(context) if context is not None else None,
+                found,
+                has_supabase_data
+            )
+            for query, found in zip(queries, found_per_query)
+        ]
+    
+    def _classify_with_keywords(self,
+                                query: str,
+                                context: Optional[Dict[str, Any]],
+                                found: frozenset,
+                                has_supabase_data: bool) -> QueryType:
+        """Classifica a consulta a partir das palavras-chave já encontradas."""
         # Verificar se é solicitação de visualização
         viz_type = self._detect_visualization_need(query)
         if viz_type:
@@ -582,56 +802,15 @@ class OrchestratorAgent(BaseAgent):
                 context = {}
             context['visualization_requested'] = viz_type
         
-        # Palavras-chave para cada tipo de consulta
-        csv_keywords = [
-            'csv', 'tabela', 'dados', 'análise', 'estatística', 'correlação',
-            'gráfico', 'plot', 'visualização', 'resumo', 'describe', 'dataset',
-            'colunas', 'linhas', 'média', 'mediana', 'fraude', 'outlier',
-            'tipos de dados', 'numéricos', 'categóricos', 'distribuição',
-            'intervalo', 'mínimo', 'máximo', 'min', 'max', 'range', 'amplitude',
-            'variância', 'desvio', 'percentil', 'quartil', 'valores'
-        ]
-        
-        rag_keywords = [
-            'buscar', 'procurar', 'encontrar', 'pesquisar', 'consultar',
-            'conhecimento', 'base', 'documento', 'texto', 'similar',
-            'contexto', 'embedding', 'semântica', 'retrieval'
-        ]
-        
-        data_keywords = [
-            'carregar', 'upload', 'importar', 'abrir', 'arquivo',
-            'dados sintéticos', 'gerar dados', 'criar dados', 'load'
-        ]
-        
-        llm_keywords = [
-            'explicar', 'explique', 'interpretar', 'interprete', 'insight', 'insights', 
-            'conclusão', 'conclusões', 'recomendação', 'recomendações', 'recomende',
-            'sugestão', 'sugestões', 'sugira', 'opinião', 'análise detalhada', 
-            'relatório', 'sumário', 'resume', 'resumo detalhado', 'padrão', 'padrões', 
-            'tendência', 'tendências', 'previsão', 'hipótese', 'teoria', 'tire', 'conclua',
-            'analise', 'avalie', 'considere', 'entenda', 'compreenda', 'descoberta',
-            'descobrimentos', 'comportamento', 'anomalia', 'anômalo', 'suspeito',
-            'detalhado', 'profundo', 'aprofunde', 'discuta', 'comente', 'o que',
-            'quais', 'como', 'por que', 'porque'
-        ]
-        
-        general_keywords = [
-            'olá', 'oi', 'ajuda', 'como', 'o que', 'qual', 'quando',
-            'onde', 'por que', 'definir', 'status', 'sistema'
-        ]
-        
         # Verificar contexto de arquivo
         has_file_context = context and 'file_path' in context
         
-        # CORREÇÃO: Verificar se há dados carregados no Supabase
-        has_supabase_data = self._check_data_availability()
-        
         # Classificar baseado em palavras-chave e contexto
-        csv_score = sum(1 for kw in csv_keywords if kw in query_lower)
-        rag_score = sum(1 for kw in rag_keywords if kw in query_lower)
-        data_score = sum(1 for kw in data_keywords if kw in query_lower)
-        llm_score = sum(3 for kw in llm_keywords if kw in query_lower)  # Peso triplicado para LLM
-        general_score = sum(1 for kw in general_keywords if kw in query_lower)
+        csv_score = len(found & CSV_KEYWORDS)
+        rag_score = len(found & RAG_KEYWORDS)
+        data_score = len(found & DATA_KEYWORDS)
+        llm_score = 3 * len(found & LLM_KEYWORDS)  # Peso triplicado para LLM
+        general_score = len(found & GENERAL_KEYWORDS)
         
         # PRIORIDADE: Se há visualização detectada, sempre usar CSV_ANALYSIS
         # porque apenas o EmbeddingsAnalysisAgent tem o método _handle_visualization_query
@@ -641,12 +820,7 @@ class OrchestratorAgent(BaseAgent):
         
         # PRIORIDADE 2: Se há palavras-chave de estatísticas (min, max, intervalo), usar CSV_ANALYSIS
         # porque o agente CSV tem método específico para calcular estatísticas reais
-        stats_keywords = [
-            'intervalo', 'mínimo', 'máximo', 'min', 'max', 'range', 'amplitude',
-            'variância', 'desvio', 'percentil', 'quartil',
-            'média', 'mediana', 'mean', 'median', 'tendência central'
-        ]
-        if has_supabase_data and any(kw in query_lower for kw in stats_keywords):
+        if has_supabase_data and found & STATS_KEYWORDS:
             self.logger.info("📊 Redirecionando para CSV analysis (estatísticas solicitadas)")
             return QueryType.CSV_ANALYSIS
         
@@ -833,13 +1007,7 @@ context = {"file_path": "caminho/para/seu/arquivo.csv"}
         self.logger.info("🤖 Delegando para LLM Manager")
         
         # 1. VERIFICAÇÃO OBRIGATÓRIA: Identificar se consulta requer dados específicos
-        data_specific_keywords = [
-            'tipos de dados', 'colunas', 'variáveis', 'estatísticas', 'resumo',
-            'distribuição', 'correlação', 'missing', 'nulos', 'formato',
-            'csv', 'arquivo', 'dataset', 'base de dados', 'planilha'
-        ]
-        
-        needs_data_analysis = any(keyword in query.lower() for keyword in data_specific_keywords)
+        needs_data_analysis = _DATA_SPECIFIC_PATTERN.search(query.lower()) is not None
         
         # 2. VERIFICAR ESTADO DOS DADOS
         has_loaded_data = self._check_data_availability()
@@ -1445,6 +1613,17 @@ context = {"file_path": "fraude.csv"}
                 metadata={"no_data_context": True}
             )
     
+    def reset_session(self) -> None:
+        """Reinicia o estado de sessão sem recriar agentes nem clientes LLM.
+
+        Limpa histórico, contexto de dados e a sessão de memória atual; os
+        agentes especializados e o LLM Manager permanecem inicializados.
+        """
+        self.conversation_history.clear()
+        self.current_data_context.clear()
+        self._current_session_id = None
+        self.logger.debug("Sessão do orquestrador reiniciada")
+
     async def clear_persistent_data_context(self) -> Dict[str, Any]:
         """Limpa contexto de dados da memória persistente."""
         if not self.has_memory or not self._current_session_id:
@@ -11,10 +11,12 @@ Este agente combina:
 """
 from __future__ import annotations
 from typing import List, Dict, Any, Optional, Union, Tuple
+import asyncio
 import time
 import io
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from src.agent.base_agent import BaseAgent, AgentError
@@ -22,6 +24,11 @@ from src.embeddings.chunker import TextChunker, ChunkStrategy, TextChunk
 from src.embeddings.generator import EmbeddingGenerator, EmbeddingProvider
 from src.embeddings.vector_store import VectorStore, VectorSearchResult
 from src.api.sonar_client import send_sonar_query
+from src.settings import RAG_SEARCH_CACHE_TTL_SECONDS
+
+
+# Limite de entradas do cache local de buscas vetoriais
+_SEARCH_CACHE_MAX_ENTRIES = 256
 
 
 class RAGAgent(BaseAgent):
@@ -49,8 +56,13 @@ class RAGAgent(BaseAgent):
             description="Agente RAG para consultas contextualizadas com busca vetorial",
             enable_memory=True  # Habilita sistema de memória
         )
-        # Cache de buscas em memória local (otimização)
-        self._search_cache: Dict[str, Any] = {}
+        # Cache de buscas em memória local (otimização): chave -> (validade monotônica, resultados).
+        # Ingestões/remoções deste agente limpam o cache; o TTL limita resultados
+        # obsoletos quando a tabela embeddings é alterada por outro processo.
+        self._search_cache: Dict[bytes, Tuple[float, List[VectorSearchResult]]] = {}
+        self._search_cache_ttl = RAG_SEARCH_CACHE_TTL_SECONDS
+        self._search_cache_hits = 0
+        self._search_cache_misses = 0
         self._relevance_scores: Dict[str, float] = {}
         
         # Inicializar componentes
@@ -96,21 +108,12 @@ class RAGAgent(BaseAgent):
         
         try:
             # 1. Chunking
-            self.logger.info("Executando chunking...")
-            chunks = self.chunker.chunk_text(text, source_id, chunk_strategy)
-            
+            chunks = self._chunk_for_ingestion(text, source_id, chunk_strategy)
             if not chunks:
                 return self._build_response(
                     "Nenhum chunk válido foi criado a partir do texto",
                     metadata={"error": True}
                 )
-
-            # OTIMIZAÇÃO BALANCEADA: Enriquecimento leve para manter precisão sem comprometer velocidade
-            if chunk_strategy == ChunkStrategy.CSV_ROW:
-                chunks = self._enrich_csv_chunks_light(chunks)
-            
-            chunk_stats = self.chunker.get_stats(chunks)
-            self.logger.info(f"Criados {len(chunks)} chunks")
             
             # 2. Geração de embeddings (MODO ASSÍNCRONO para performance)
             self.logger.info("Gerando embeddings com processamento assíncrono...")
@@ -132,42 +135,61 @@ class RAGAgent(BaseAgent):
                 self.logger.error(f"Erro no processamento assíncrono: {e}, fallback para síncrono")
                 embedding_results = self.embedding_generator.generate_embeddings_batch(chunks)
             
-            if not embedding_results:
-                return self._build_response(
-                    "Falha na geração de embeddings",
-                    metadata={"error": True, "chunk_stats": chunk_stats}
-                )
-            
-            embedding_stats = self.embedding_generator.get_embedding_stats(embedding_results)
-            self.logger.info(f"Gerados {len(embedding_results)} embeddings")
-            
             # 3. Armazenamento
-            self.logger.info("Armazenando no vector store...")
-            stored_ids = self.vector_store.store_embeddings(embedding_results, source_type)
-            
-            processing_time = time.perf_counter() - start_time
+            return self._store_ingestion(chunks, embedding_results, source_id, source_type, chunk_strategy, start_time)
             
-            # Estatísticas consolidadas
-            stats = {
-                "source_id": source_id,
-                "source_type": source_type,
-                "processing_time": processing_time,
-                "chunks_created": len(chunks),
-                "embeddings_generated": len(embedding_results),
-                "embeddings_stored": len(stored_ids),
-                "chunk_strategy": chunk_strategy.value,
-                "chunk_stats": chunk_stats,
-                "embedding_stats": embedding_stats,
-                "success_rate": len(stored_ids) / len(chunks) * 100 if chunks else 0
-            }
-            
-            response = f"✅ Ingestão concluída para '{source_id}'\n" \
-                      f"📊 {len(chunks)} chunks → {len(embedding_results)} embeddings → {len(stored_ids)} armazenados\n" \
-                      f"⏱️ Processado em {processing_time:.2f}s"
+        except Exception as e:
+            self.logger.error(f"Erro na ingestão: {str(e)}")
+            return self._build_response(
+                f"Erro na ingestão: {str(e)}",
+                metadata={"error": True}
+            )
+    
+    async def ingest_text_async(self, 
+                                text: str, 
+                                source_id: str,
+                                source_type: str = "text",
+                                chunk_strategy: ChunkStrategy = ChunkStrategy.FIXED_SIZE) -> Dict[str, Any]:
+        """Versão assíncrona de ``ingest_text``.
+        
+        Embeddings e gravação no vector store rodam fora do event loop, então
+        várias fontes podem ser ingeridas em paralelo com ``asyncio.gather``:
+        a latência total fica próxima à da fonte mais lenta, não à soma.
+        
+        Args:
+            text: Texto para processar
+            source_id: Identificador único da fonte
+            source_type: Tipo da fonte (text, csv, document)
+            chunk_strategy: Estratégia de chunking
+        
+        Returns:
+            Resultado do processamento com estatísticas
+        """
+        self.logger.info(f"Iniciando ingestão assíncrona: {len(text)} chars, fonte: {source_id}")
+        start_time = time.perf_counter()
+        
+        try:
+            chunks = self._chunk_for_ingestion(text, source_id, chunk_strategy)
+            if not chunks:
+                return self._build_response(
+                    "Nenhum chunk válido foi criado a partir do texto",
+                    metadata={"error": True}
+                )
             
-            self.logger.info(f"Ingestão concluída: {stats['success_rate']:.1f}% sucesso")
+            try:
+                from src.embeddings.async_generator import AsyncEmbeddingGenerator
+                generator = AsyncEmbeddingGenerator(provider=self.embedding_generator.provider, max_workers=4)
+                embedding_results = await generator.generate_embeddings_async(chunks)
+            except Exception as e:
+                self.logger.error(f"Erro no processamento assíncrono: {e}, fallback para síncrono")
+                embedding_results = await asyncio.to_thread(
+                    self.embedding_generator.generate_embeddings_batch, chunks
+                )
             
-            return self._build_response(response, metadata=stats)
+            return await asyncio.to_thread(
+                self._store_ingestion,
+                chunks, embedding_results, source_id, source_type, chunk_strategy, start_time
+            )
             
         except Exception as e:
             self.logger.error(f"Erro na ingestão: {str(e)}")
@@ -176,6 +198,69 @@ class RAGAgent(BaseAgent):
                 metadata={"error": True}
             )
     
+    def _chunk_for_ingestion(self, 
+                             text: str, 
+                             source_id: str,
+                             chunk_strategy: ChunkStrategy) -> List[TextChunk]:
+        """Divide o texto em chunks (com enriquecimento leve para CSV)."""
+        self.logger.info("Executando chunking...")
+        chunks = self.chunker.chunk_text(text, source_id, chunk_strategy)
+        
+        # OTIMIZAÇÃO BALANCEADA: Enriquecimento leve para manter precisão sem comprometer velocidade
+        if chunks and chunk_strategy == ChunkStrategy.CSV_ROW:
+            chunks = self._enrich_csv_chunks_light(chunks)
+        
+        return chunks
+    
+    def _store_ingestion(self,
+                         chunks: List[TextChunk],
+                         embedding_results: List[Any],
+                         source_id: str,
+                         source_type: str,
+                         chunk_strategy: ChunkStrategy,
+                         start_time: float) -> Dict[str, Any]:
+        """Armazena os embeddings gerados e monta a resposta da ingestão."""
+        chunk_stats = self.chunker.get_stats(chunks)
+        self.logger.info(f"Criados {len(chunks)} chunks")
+        
+        if not embedding_results:
+            return self._build_response(
+                "Falha na geração de embeddings",
+                metadata={"error": True, "chunk_stats": chunk_stats}
+            )
+        
+        embedding_stats = self.embedding_generator.get_embedding_stats(embedding_results)
+        self.logger.info(f"Gerados {len(embedding_results)} embeddings")
+        
+        self.logger.info("Armazenando no vector store...")
+        stored_ids = self.vector_store.store_embeddings(embedding_results, source_type)
+        # Novos dados invalidam buscas já cacheadas
+        self._search_cache.clear()
+        
+        processing_time = time.perf_counter() - start_time
+        
+        # Estatísticas consolidadas
+        stats = {
+            "source_id": source_id,
+            "source_type": source_type,
+            "processing_time": processing_time,
+            "chunks_created": len(chunks),
+            "embeddings_generated": len(embedding_results),
+            "embeddings_stored": len(stored_ids),
+            "chunk_strategy": chunk_strategy.value,
+            "chunk_stats": chunk_stats,
+            "embedding_stats": embedding_stats,
+            "success_rate": len(stored_ids) / len(chunks) * 100 if chunks else 0
+        }
+        
+        response = f"✅ Ingestão concluída para '{source_id}'\n" \
+                  f"📊 {len(chunks)} chunks → {len(embedding_results)} embeddings → {len(stored_ids)} armazenados\n" \
+                  f"⏱️ Processado em {processing_time:.2f}s"
+        
+        self.logger.info(f"Ingestão concluída: {stats['success_rate']:.1f}% sucesso")
+        
+        return self._build_response(response, metadata=stats)
+    
     def ingest_csv_data(self, 
                        csv_text: str, 
                        source_id: str,
@@ -410,7 +495,8 @@ class RAGAgent(BaseAgent):
         
         Args:
             query: Consulta do usuário
-            context: Contexto adicional (filtros, configurações)
+            context: Contexto adicional (filtros, configurações; 'query_embedding_result'
+                reutiliza um embedding já calculado para a consulta)
         
         Returns:
             Resposta contextualizada baseada na busca vetorial
@@ -425,18 +511,36 @@ class RAGAgent(BaseAgent):
             max_results = config.get('max_results', 5)
             include_context = config.get('include_context', True)
             
-            # 1. Gerar embedding da query
-            self.logger.debug("Gerando embedding da consulta...")
-            query_embedding_result = self.embedding_generator.generate_embedding(query)
+            # 1. Gerar embedding da query (ou reutilizar o pré-calculado em lote)
+            query_embedding_result = config.get('query_embedding_result')
+            if query_embedding_result is None:
+                self.logger.debug("Gerando embedding da consulta...")
+                query_embedding_result = self.embedding_generator.generate_embedding(query)
             query_embedding = query_embedding_result.embedding
             
-            # 2. Busca vetorial
-            self.logger.debug(f"Executando busca vetorial (threshold={similarity_threshold})")
-            search_results = self.vector_store.search_similar(
-                query_embedding=query_embedding,
-                similarity_threshold=similarity_threshold,
-                limit=max_results
-            )
+            # 2. Busca vetorial (consultas com o mesmo embedding quantizado reutilizam os resultados)
+            search_key = self._embedding_cache_key(query_embedding, similarity_threshold, max_results)
+            search_results = None
+            cached_entry = self._search_cache.get(search_key)
+            if cached_entry is not None:
+                if cached_entry[0] > time.monotonic():
+                    search_results = cached_entry[1]
+                else:
+                    del self._search_cache[search_key]
+            if search_results is not None:
+                self._search_cache_hits += 1
+                self.logger.debug("Resultados da busca vetorial recuperados do cache local")
+            else:
+                self._search_cache_misses += 1
+                self.logger.debug(f"Executando busca vetorial (threshold={similarity_threshold})")
+                search_results = self.vector_store.search_similar(
+                    query_embedding=query_embedding,
+                    similarity_threshold=similarity_threshold,
+                    limit=max_results
+                )
+                if len(self._search_cache) >= _SEARCH_CACHE_MAX_ENTRIES:
+                    self._search_cache.pop(next(iter(self._search_cache)))
+                self._search_cache[search_key] = (time.monotonic() + self._search_cache_ttl, search_results)
             # 3. Construir contexto a partir dos resultados
             context_pieces = []
             source_info = {}
@@ -567,6 +671,29 @@ RESPOSTA FUNDAMENTADA:"""
                 metadata={"error": True, "query": query}
             )
     
+    def process_batch(self, queries: List[str], context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Processa várias consultas RAG gerando todos os embeddings de uma vez.
+        
+        Args:
+            queries: Consultas do usuário
+            context: Contexto comum a todas as consultas (mesmo formato de process)
+        
+        Returns:
+            Respostas na mesma ordem de queries
+        """
+        base_context = dict(context or {})
+        try:
+            embedding_results = self.embedding_generator.generate_embeddings_for_texts(queries)
+        except Exception as e:
+            self.logger.warning(f"Falha ao gerar embeddings em lote, usando por consulta: {e}")
+            return [self.process(query, base_context) for query in queries]
+        
+        self.logger.info(f"🔍 Embeddings de {len(queries)} consultas gerados em lote")
+        return [
+            self.process(query, {**base_context, "query_embedding_result": embedding_result})
+            for query, embedding_result in zip(queries, embedding_results)
+        ]
+    
     def get_knowledge_base_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas da base de conhecimento."""
         try:
@@ -595,6 +722,35 @@ RESPOSTA FUNDAMENTADA:"""
                 metadata={"error": True}
             )
     
+    @staticmethod
+    def _embedding_cache_key(query_embedding: List[float],
+                             similarity_threshold: float,
+                             max_results: int) -> bytes:
+        """Chave do cache local: embedding quantizado em int8 + parâmetros da busca.
+        
+        A quantização faz consultas quase idênticas (mesmo texto com variações
+        mínimas de caixa/pontuação) caírem na mesma entrada. O vetor é
+        normalizado antes (a busca é por cosseno), de modo que todos os
+        componentes cabem em [-127, 127] mesmo com provedores que não
+        normalizam os embeddings.
+        """
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        quantized = np.clip(np.round(vector * 127), -127, 127).astype(np.int8)
+        return quantized.tobytes() + f"|{similarity_threshold}|{max_results}".encode()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache local de buscas vetoriais."""
+        total = self._search_cache_hits + self._search_cache_misses
+        return {
+            "entries": len(self._search_cache),
+            "hits": self._search_cache_hits,
+            "misses": self._search_cache_misses,
+            "hit_rate": self._search_cache_hits / total if total else 0.0
+        }
+    
     # ========================================================================
     # MÉTODOS DE MEMÓRIA ESPECÍFICOS PARA RAG
     # ========================================================================
@@ -778,6 +934,7 @@ RESPOSTA FUNDAMENTADA:"""
         """Remove todos os embeddings de uma fonte específica."""
         try:
             deleted_count = self.vector_store.delete_embeddings_by_source(source_id)
+            self._search_cache.clear()
             
             if deleted_count > 0:
                 message = f"✅ Removidos {deleted_count:,} embeddings da fonte '{source_id}'"
@@ -15,19 +15,35 @@ from __future__ import annotations
 import io
 import os
 import base64
+import codecs
 import requests
 import chardet
 import pandas as pd
 import numpy as np
 import inspect
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Union, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
 import warnings
 from datetime import datetime, timedelta
 
+try:
+    import pyarrow  # noqa: F401 - habilita o leitor CSV multithread do pandas
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - dependência opcional
+    PYARROW_AVAILABLE = False
+
+from src.settings import CSV_PYARROW_ENGINE
 from src.utils.logging_config import get_logger
 
+# Opções de pd.read_csv aceitas pela engine pyarrow; com qualquer outra
+# (nrows, chunksize, skipfooter...) a leitura usa a engine C padrão
+_PYARROW_CSV_OPTIONS = frozenset({
+    'encoding', 'sep', 'delimiter', 'header', 'names', 'usecols', 'dtype',
+    'na_values', 'keep_default_na', 'na_filter', 'true_values', 'false_values',
+    'quotechar', 'decimal', 'parse_dates', 'index_col',
+})
+
 
 class DataLoaderError(Exception):
     """Exceção personalizada para erros de carregamento de dados."""
@@ -112,13 +128,34 @@ class DataLoader:
         
         self.logger.info(f"✅ DataLoader: Acesso autorizado para agente: {self.caller_agent}")
     
-    def load_from_file(self, file_path: str, **pandas_kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    def _read_csv(self, source: Union[Path, BinaryIO], **kwargs) -> pd.DataFrame:
+        """Lê um CSV com a engine C do pandas ou, se habilitada, com a pyarrow.
+        
+        A engine pyarrow (multithread) só é usada com CSV_PYARROW_ENGINE=true:
+        ela infere datas ISO e timestamps (colunas que a engine C mantém como
+        texto) e trata nulos de outra forma, então os dtypes do DataFrame
+        ingerido mudam. Sem pyarrow, com opções que a engine não suporta ou
+        se ela falhar, usa a engine C.
+        """
+        if PYARROW_AVAILABLE and CSV_PYARROW_ENGINE and set(kwargs) - {'low_memory'} <= _PYARROW_CSV_OPTIONS:
+            start = source.tell() if hasattr(source, 'tell') else None
+            try:
+                pyarrow_kwargs = {k: v for k, v in kwargs.items() if k != 'low_memory'}
+                return pd.read_csv(source, engine='pyarrow', **pyarrow_kwargs)
+            except Exception as e:
+                self.logger.debug(f"Engine pyarrow falhou ({e}); usando engine C")
+                if start is not None:
+                    source.seek(start)
+        return pd.read_csv(source, **kwargs)
+    
+    def load_from_file(self, file_path: Union[str, Path, BinaryIO], **pandas_kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Carrega dados de arquivo local com detecção automática de encoding.
         
         ⚠️ CONFORMIDADE: Apenas agente de ingestão autorizado.
         
         Args:
-            file_path: Caminho para o arquivo CSV
+            file_path: Caminho para o arquivo CSV ou arquivo binário já aberto
+                (ex.: SpooledTemporaryFile), lido a partir da posição atual
             **pandas_kwargs: Argumentos adicionais para pd.read_csv()
             
         Returns:
@@ -130,6 +167,9 @@ class DataLoader:
         """
         self._validate_csv_access_authorization()
         
+        if hasattr(file_path, 'read'):
+            return self._load_from_buffer(file_path, **pandas_kwargs)
+        
         try:
             file_path = Path(file_path).resolve()
             
@@ -160,7 +200,7 @@ class DataLoader:
             default_kwargs.update(pandas_kwargs)
             
             # Carregar dados
-            df = pd.read_csv(file_path, **default_kwargs)
+            df = self._read_csv(file_path, **default_kwargs)
             
             # Informações do carregamento
             load_info = {
@@ -185,6 +225,55 @@ class DataLoader:
             self.logger.error(error_msg)
             raise DataLoaderError(error_msg) from e
     
+    def _load_from_buffer(self, buffer: BinaryIO, **pandas_kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Carrega CSV de um arquivo binário aberto (mesmas regras de load_from_file)."""
+        source_path = getattr(buffer, 'name', None) or '<buffer>'
+        
+        try:
+            start = buffer.tell()
+            file_size_mb = (buffer.seek(0, io.SEEK_END) - start) / (1024 * 1024)
+            buffer.seek(start)
+            if file_size_mb > self.max_file_size_mb:
+                raise DataLoaderError(f"Arquivo muito grande: {file_size_mb:.1f}MB (máximo: {self.max_file_size_mb}MB)")
+            
+            self.logger.warning(f"🚨 ACESSO CSV AUTORIZADO por {self.caller_agent}: {source_path} ({file_size_mb:.1f}MB)")
+            
+            encoding = pandas_kwargs.get('encoding')
+            if not encoding:
+                encoding = self._detect_sample_encoding(buffer.read(10240))
+                buffer.seek(start)
+                pandas_kwargs['encoding'] = encoding
+            
+            default_kwargs = {
+                'low_memory': False,
+                'encoding': encoding
+            }
+            default_kwargs.update(pandas_kwargs)
+            
+            df = self._read_csv(buffer, **default_kwargs)
+            
+            load_info = {
+                'source_type': 'file',
+                'source_path': str(source_path),
+                'file_size_mb': file_size_mb,
+                'encoding': encoding,
+                'rows': len(df),
+                'columns': len(df.columns),
+                'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024 * 1024),
+                'load_time': datetime.now().isoformat(),
+                'pandas_kwargs': default_kwargs
+            }
+            
+            self._last_loaded_info = load_info
+            self.logger.info(f"✅ Arquivo carregado: {load_info['rows']} linhas, {load_info['columns']} colunas")
+            
+            return df, load_info
+            
+        except Exception as e:
+            error_msg = f"Erro ao carregar arquivo {source_path}: {str(e)}"
+            self.logger.error(error_msg)
+            raise DataLoaderError(error_msg) from e
+    
     def load_from_url(self, url: str, **pandas_kwargs) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Carrega dados de URL remota.
         
@@ -238,7 +327,7 @@ class DataLoader:
             default_kwargs.update(pandas_kwargs)
             
             # Carregar dados
-            df = pd.read_csv(io.BytesIO(content), **default_kwargs)
+            df = self._read_csv(io.BytesIO(content), **default_kwargs)
             
             # Informações do carregamento
             load_info = {
@@ -348,7 +437,7 @@ class DataLoader:
             default_kwargs.update(pandas_kwargs)
             
             # Carregar dados
-            df = pd.read_csv(io.BytesIO(content), **default_kwargs)
+            df = self._read_csv(io.BytesIO(content), **default_kwargs)
             
             # Informações do carregamento
             load_info = {
@@ -436,6 +525,20 @@ class DataLoader:
             # Ler amostra do arquivo
             with open(file_path, 'rb') as f:
                 sample = f.read(10240)  # 10KB
+        except Exception as e:
+            self.logger.warning(f"Erro na detecção de encoding: {str(e)}, usando utf-8")
+            return 'utf-8'
+        
+        return self._detect_sample_encoding(sample)
+    
+    def _detect_sample_encoding(self, sample: bytes) -> str:
+        """Detecta encoding a partir de uma amostra (até 10KB) do conteúdo."""
+        try:
+            # Caminho rápido: amostra UTF-8 válida (inclui ASCII e os arquivos
+            # gerados por export_to_csv) dispensa a detecção estatística
+            if self._is_utf8_sample(sample):
+                self.logger.info("Encoding detectado: utf-8 (amostra UTF-8 válida)")
+                return 'utf-8'
             
             # Detectar encoding
             result = chardet.detect(sample)
@@ -449,8 +552,9 @@ class DataLoader:
                 self.logger.warning(f"Baixa confiança na detecção de encoding ({confidence:.2f})")
                 for encoding in self.supported_encodings:
                     try:
-                        with open(file_path, 'r', encoding=encoding) as f:
-                            f.read(1024)  # Teste de leitura
+                        # Teste de leitura (decodificador incremental tolera
+                        # caractere multibyte cortado no fim da amostra)
+                        codecs.getincrementaldecoder(encoding)().decode(sample[:4096])
                         self.logger.info(f"Usando encoding alternativo: {encoding}")
                         return encoding
                     except UnicodeDecodeError:
@@ -462,6 +566,16 @@ class DataLoader:
             self.logger.warning(f"Erro na detecção de encoding: {str(e)}, usando utf-8")
             return 'utf-8'
     
+    @staticmethod
+    def _is_utf8_sample(sample: bytes) -> bool:
+        """Verifica se a amostra é UTF-8 válida (tolerando caractere cortado no fim)."""
+        try:
+            sample.decode('utf-8')
+            return True
+        except UnicodeDecodeError as e:
+            # Amostra truncada no meio de um caractere multibyte
+            return e.reason == 'unexpected end of data' and e.start >= len(sample) - 3
+    
     def _create_fraud_data(self, num_rows: int, **kwargs) -> pd.DataFrame:
         """Gera dados sintéticos para detecção de fraude."""
         fraud_rate = kwargs.get('fraud_rate', 0.05)  # 5% de fraude por padrão
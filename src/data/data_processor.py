@@ -19,7 +19,6 @@ import pandas as pd
 
 from src.data.data_loader import DataLoader, DataLoaderError  
 from src.data.data_validator import DataValidator, DataValidationError
-from src.agent.csv_analysis_agent import EmbeddingsAnalysisAgent
 from src.utils.logging_config import get_logger
 
 
@@ -52,6 +51,9 @@ class DataProcessor:
         # Componentes principais (com caller_agent)
         self.loader = DataLoader(caller_agent=self.caller_agent)
         self.validator = DataValidator()
+        # Import tardio: o agente puxa cliente Supabase/LLM e só é necessário
+        # ao instanciar o processador (não ao importar o módulo)
+        from src.agent.csv_analysis_agent import EmbeddingsAnalysisAgent
         self.analyzer = EmbeddingsAnalysisAgent()
         
         # Configurações
@@ -8,7 +8,10 @@ Este módulo fornece funcionalidades avançadas para:
 - Relatórios detalhados de qualidade dos dados
 """
 from __future__ import annotations
+import copy
+import hashlib
 import re
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from typing import Any, Dict, List, Optional, Tuple, Set
@@ -30,6 +33,10 @@ class DataValidator:
         self.logger = get_logger(__name__)
         self._validation_results: Optional[Dict[str, Any]] = None
         
+        # Memo LRU de validate_dataframe: impressão digital do DataFrame -> resultado
+        self._validation_cache: "OrderedDict[Tuple[str, bool], Dict[str, Any]]" = OrderedDict()
+        self.validation_cache_size = 32
+        
         # Configurações de validação
         self.max_missing_percentage = 90  # % máximo de valores faltantes por coluna
         self.min_unique_values = 2  # Mínimo de valores únicos por coluna
@@ -56,6 +63,16 @@ class DataValidator:
         if df is None or df.empty:
             raise DataValidationError("DataFrame está vazio ou é None")
         
+        fingerprint = self._dataframe_fingerprint(df)
+        cache_key = (fingerprint, strict) if fingerprint else None
+        if cache_key in self._validation_cache:
+            self._validation_cache.move_to_end(cache_key)
+            validation_results = copy.deepcopy(self._validation_cache[cache_key])
+            validation_results['timestamp'] = datetime.now().isoformat()
+            self._validation_results = validation_results
+            self.logger.info(f"Validação reaproveitada (DataFrame idêntico). Score: {validation_results['overall_score']:.1f}/100")
+            return validation_results
+        
         self.logger.info(f"Iniciando validação de DataFrame: {len(df)} linhas, {len(df.columns)} colunas")
         
         validation_results = {
@@ -74,6 +91,10 @@ class DataValidator:
         validation_results = self._compile_recommendations(validation_results)
         
         self._validation_results = validation_results
+        if cache_key is not None:
+            self._validation_cache[cache_key] = copy.deepcopy(validation_results)
+            if len(self._validation_cache) > self.validation_cache_size:
+                self._validation_cache.popitem(last=False)
         self.logger.info(f"Validação concluída. Score: {validation_results['overall_score']:.1f}/100")
         
         return validation_results
@@ -198,6 +219,25 @@ class DataValidator:
             'timestamp': self._validation_results['timestamp']
         }
     
+    @staticmethod
+    def _dataframe_fingerprint(df: pd.DataFrame) -> Optional[str]:
+        """Calcula impressão digital de conteúdo, colunas e tipos do DataFrame.
+        
+        Em colunas object o tipo de cada valor também entra no hash (1 e '1'
+        geram o mesmo hash de valor, mas validam de forma diferente).
+        Retorna None quando o conteúdo não é hasheável (ex.: listas em células).
+        """
+        try:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr((list(map(str, df.columns)), list(map(str, df.dtypes)))).encode())
+            digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+            for position in np.flatnonzero((df.dtypes == object).to_numpy()):
+                value_types = df.iloc[:, position].map(lambda v: type(v).__name__)
+                digest.update(pd.util.hash_array(value_types.to_numpy(dtype=object)).tobytes())
+            return digest.hexdigest()
+        except (TypeError, ValueError):
+            return None
+    
     def _get_basic_info(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Extrai informações básicas do DataFrame."""
         return {
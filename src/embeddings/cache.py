@@ -0,0 +1,149 @@
+"""Cache persistente de embeddings em SQLite.
+
+Guarda os vetores já calculados entre execuções do processo: reiniciar a
+aplicação (ou rodar a suíte de testes de novo) troca a chamada ao provedor
+por um SELECT local.
+
+Os vetores são gravados como BLOB float32, indexados pela mesma chave SHA-256
+de (provider, modelo, variante, texto) usada pelo cache em memória do
+EmbeddingGenerator. Cada lote é gravado com um executemany e um único commit;
+acima de max_entries, as entradas mais antigas são descartadas.
+
+Uso:
+    cache = get_embedding_cache()
+    vector = cache.get(key)
+    if vector is None:
+        cache.put_many([(key, embedding)], provider="sentence_transformer", model="all-MiniLM-L6-v2")
+
+Ative com EMBEDDING_CACHE_ENABLED=true (desativado por padrão).
+"""
+
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.settings import EMBEDDING_CACHE_MAX_VECTORS, EMBEDDING_CACHE_PATH
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vec BLOB NOT NULL,
+    created_at INTEGER NOT NULL
+)
+"""
+
+_CREATED_AT_INDEX = "CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)"
+
+
+class SQLiteEmbeddingCache:
+    """Cache de embeddings em um arquivo SQLite, seguro para uso entre threads."""
+
+    def __init__(self, path: Union[str, Path] = EMBEDDING_CACHE_PATH,
+                 max_entries: Optional[int] = EMBEDDING_CACHE_MAX_VECTORS):
+        """
+        Args:
+            path: Arquivo SQLite (diretórios são criados se necessário)
+            max_entries: Limite de vetores armazenados; None ou 0 = sem limite
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL permite leituras de outros processos durante a escrita
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_CREATED_AT_INDEX)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Retorna o vetor float32 armazenado para a chave ou None."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vec FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Falha ao ler cache de embeddings: {e}")
+            return None
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def put(self, key: str, vector: Sequence[float], provider: str, model: str) -> None:
+        """Armazena (ou substitui) o vetor da chave."""
+        self.put_many([(key, vector)], provider, model)
+    
+    def put_many(self, items: Iterable[Tuple[str, Sequence[float]]], provider: str, model: str) -> None:
+        """Armazena (ou substitui) vários vetores em uma única transação."""
+        created_at = int(time.time())
+        rows = [
+            (key, provider, model, len(vector), np.asarray(vector, dtype=np.float32).tobytes(), created_at)
+            for key, vector in items
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, provider, model, dim, vec, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._evict()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Falha ao gravar cache de embeddings: {e}")
+    
+    def _evict(self) -> None:
+        """Descarta as entradas mais antigas acima de max_entries (chamado com o lock)."""
+        if not self.max_entries:
+            return
+        excess = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY created_at LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove todos os vetores armazenados."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo."""
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[Path, SQLiteEmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: Union[str, Path] = EMBEDDING_CACHE_PATH) -> SQLiteEmbeddingCache:
+    """Retorna o cache compartilhado do arquivo informado (uma conexão por caminho)."""
+    resolved = Path(path).resolve()
+    with _caches_lock:
+        cache = _caches.get(resolved)
+        if cache is None:
+            cache = SQLiteEmbeddingCache(resolved)
+            _caches[resolved] = cache
+        return cache
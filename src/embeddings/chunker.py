@@ -13,6 +13,9 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Fim de sentença: pontuação seguida de espaço em branco
+_SENTENCE_ENDINGS = re.compile(r'[.!?]+\s+')
+
 
 class ChunkStrategy(Enum):
     """Estratégias de chunking disponíveis."""
@@ -164,12 +167,12 @@ class TextChunker:
     
     def _chunk_by_sentence(self, text: str, source_id: str) -> List[TextChunk]:
         """Chunking por sentença."""
-        # Regex para detectar fim de sentença
-        sentence_endings = re.compile(r'[.!?]+\s+')
-        sentences = sentence_endings.split(text)
+        sentences = _SENTENCE_ENDINGS.split(text)
         
         chunks = []
-        current_chunk = ""
+        # Partes do chunk atual e seu tamanho após o join (evita concatenar strings a cada sentença)
+        current_parts: List[str] = []
+        current_len = 0
         chunk_index = 0
         start_pos = 0
         
@@ -179,29 +182,34 @@ class TextChunker:
                 continue
             
             # Verificar se adicionar esta sentença ultrapassaria o limite
-            potential_chunk = current_chunk + " " + sentence if current_chunk else sentence
+            potential_len = current_len + 1 + len(sentence) if current_parts else len(sentence)
             
-            if len(potential_chunk) > self.chunk_size and current_chunk:
+            if potential_len > self.chunk_size and current_parts:
                 # Salvar chunk atual
-                if len(current_chunk) >= self.min_chunk_size:
+                if current_len >= self.min_chunk_size:
+                    current_chunk = " ".join(current_parts)
                     metadata = ChunkMetadata(
                         source=source_id,
                         chunk_index=chunk_index,
                         strategy=ChunkStrategy.SENTENCE,
-                        char_count=len(current_chunk),
+                        char_count=current_len,
                         word_count=len(current_chunk.split()),
                         start_position=start_pos,
-                        end_position=start_pos + len(current_chunk)
+                        end_position=start_pos + current_len
                     )
                     
                     chunks.append(TextChunk(content=current_chunk.strip(), metadata=metadata))
                     chunk_index += 1
                 
                 # Iniciar novo chunk
-                current_chunk = sentence
-                start_pos += len(current_chunk) + 1
+                current_parts = [sentence]
+                current_len = len(sentence)
+                start_pos += current_len + 1
             else:
-                current_chunk = potential_chunk
+                current_parts.append(sentence)
+                current_len = potential_len
+        
+        current_chunk = " ".join(current_parts)
         
         # Adicionar último chunk se existir
         if current_chunk and len(current_chunk) >= self.min_chunk_size:
@@ -224,33 +232,40 @@ class TextChunker:
         paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
         
         chunks = []
-        current_chunk = ""
+        # Partes do chunk atual e seu tamanho após o join (evita concatenar strings a cada parágrafo)
+        current_parts: List[str] = []
+        current_len = 0
         chunk_index = 0
         char_position = 0
         
         for paragraph in paragraphs:
-            potential_chunk = current_chunk + "\n\n" + paragraph if current_chunk else paragraph
+            potential_len = current_len + 2 + len(paragraph) if current_parts else len(paragraph)
             
-            if len(potential_chunk) > self.chunk_size and current_chunk:
+            if potential_len > self.chunk_size and current_parts:
                 # Salvar chunk atual
-                if len(current_chunk) >= self.min_chunk_size:
+                if current_len >= self.min_chunk_size:
+                    current_chunk = "\n\n".join(current_parts)
                     metadata = ChunkMetadata(
                         source=source_id,
                         chunk_index=chunk_index,
                         strategy=ChunkStrategy.PARAGRAPH,
-                        char_count=len(current_chunk),
+                        char_count=current_len,
                         word_count=len(current_chunk.split()),
                         start_position=char_position,
-                        end_position=char_position + len(current_chunk)
+                        end_position=char_position + current_len
                     )
                     
                     chunks.append(TextChunk(content=current_chunk.strip(), metadata=metadata))
                     chunk_index += 1
-                    char_position += len(current_chunk) + 2  # +2 para \n\n
+                    char_position += current_len + 2  # +2 para \n\n
                 
-                current_chunk = paragraph
+                current_parts = [paragraph]
+                current_len = len(paragraph)
             else:
-                current_chunk = potential_chunk
+                current_parts.append(paragraph)
+                current_len = potential_len
+        
+        current_chunk = "\n\n".join(current_parts)
         
         # Último chunk
         if current_chunk and len(current_chunk) >= self.min_chunk_size:
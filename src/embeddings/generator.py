@@ -9,8 +9,10 @@ from __future__ import annotations
 import asyncio
 import time
 import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Union, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 import numpy as np
 
@@ -36,11 +38,16 @@ except ImportError:
 from src.embeddings.chunker import TextChunk
 from src.utils.logging_config import get_logger
 from src.llm.manager import LLMManager
+from src.embeddings.cache import SQLiteEmbeddingCache, get_embedding_cache
+from src.settings import EMBEDDING_CACHE_ENABLED, EMBEDDING_ONNX_FILE, EMBEDDING_QUANTIZED
 
 
 TARGET_EMBEDDING_DIMENSION = 384
 MOCK_EMBEDDING_DIMENSION = TARGET_EMBEDDING_DIMENSION
 
+# Entradas do cache LRU de embeddings por gerador
+EMBEDDING_CACHE_MAX_ENTRIES = 1000
+
 logger = get_logger(__name__)
 
 
@@ -72,18 +79,38 @@ class EmbeddingGenerator:
     
     def __init__(self, 
                  provider: EmbeddingProvider = EmbeddingProvider.LLM_MANAGER,
-                 model: str = None):
+                 model: str = None,
+                 quantized: Optional[bool] = None,
+                 persistent_cache: Optional[bool] = None):
         """Inicializa o gerador de embeddings.
         
         Args:
             provider: Provedor de embeddings a utilizar
             model: Nome específico do modelo (opcional)
+            quantized: Usa o Sentence Transformer em ONNX int8 (padrão: EMBEDDING_QUANTIZED)
+            persistent_cache: Reaproveita embeddings entre execuções via SQLite
+                (padrão: EMBEDDING_CACHE_ENABLED; nunca usado pelo provider MOCK)
         """
         self.provider = provider
+        self.quantized = EMBEDDING_QUANTIZED if quantized is None else quantized
         self.logger = logger
         self._client = None
         self._llm_manager = None
         
+        # Cache LRU de embeddings por hash de (provider, modelo, variante, texto)
+        self._embedding_cache: "OrderedDict[str, EmbeddingResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._disk_cache: Optional[SQLiteEmbeddingCache] = None
+        if persistent_cache is None:
+            persistent_cache = EMBEDDING_CACHE_ENABLED
+        if persistent_cache and provider != EmbeddingProvider.MOCK:
+            try:
+                self._disk_cache = get_embedding_cache()
+            except Exception as e:
+                self.logger.warning(f"Cache persistente de embeddings indisponível: {e}")
+        
         # Configurar modelo padrão baseado no provider
         if model:
             self.model = model
@@ -152,6 +179,21 @@ class EmbeddingGenerator:
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError("sentence-transformers não disponível. Install: pip install sentence-transformers")
         
+        if self.quantized:
+            # Inferência int8 via ONNX Runtime; mantém o modelo FP32 se o backend não estiver instalado
+            try:
+                self.logger.info(f"Carregando modelo Sentence Transformer quantizado: {self.model} ({EMBEDDING_ONNX_FILE})")
+                self._client = SentenceTransformer(
+                    self.model,
+                    backend="onnx",
+                    model_kwargs={"file_name": EMBEDDING_ONNX_FILE}
+                )
+                self.logger.info("Sentence Transformer int8 carregado com sucesso")
+                return
+            except Exception as e:
+                self.logger.warning(f"Modelo quantizado indisponível ({e}), usando FP32")
+                self.quantized = False
+        
         self.logger.info(f"Carregando modelo Sentence Transformer: {self.model}")
         self._client = SentenceTransformer(self.model)
         self.logger.info("Sentence Transformer carregado com sucesso")
@@ -174,13 +216,113 @@ class EmbeddingGenerator:
         self._client = "mock_client"
         self.logger.info("Mock provider inicializado (para desenvolvimento)")
     
+    def _cache_key(self, text: str) -> str:
+        """Chave do cache de embeddings: SHA-256 de provider, modelo, variante e texto.
+        
+        A variante separa os vetores do modelo FP32 dos do ONNX int8 (e de
+        cada arquivo ONNX), que não são intercambiáveis.
+        """
+        variant = f"onnx:{EMBEDDING_ONNX_FILE}" if self.quantized else "fp32"
+        return hashlib.sha256(f"{self.provider.value}|{self.model}|{variant}|{text}".encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, key: str, text: str) -> Optional[EmbeddingResult]:
+        """Retorna uma cópia do resultado em cache (processing_time=0) ou None.
+        
+        Consulta primeiro o LRU em memória e depois o cache persistente.
+        """
+        with self._cache_lock:
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                self._cache_hits += 1
+        if cached is not None:
+            return replace(cached, embedding=list(cached.embedding), processing_time=0.0, chunk_metadata=None)
+        
+        vector = self._disk_cache.get(key) if self._disk_cache is not None else None
+        if vector is None:
+            with self._cache_lock:
+                self._cache_misses += 1
+            return None
+        
+        embedding = vector.tolist()
+        result = EmbeddingResult(
+            chunk_content=text,
+            embedding=embedding,
+            provider=self.provider,
+            model=self.model,
+            dimensions=len(embedding),
+            processing_time=0.0,
+            raw_dimensions=len(embedding)
+        )
+        with self._cache_lock:
+            self._cache_hits += 1
+        self._cache_set(key, result)
+        return result
+    
+    def _cache_set(self, key: str, result: EmbeddingResult) -> None:
+        """Armazena o resultado no cache LRU, descartando a entrada menos usada."""
+        with self._cache_lock:
+            self._embedding_cache[key] = replace(result, embedding=list(result.embedding), chunk_metadata=None)
+            self._embedding_cache.move_to_end(key)
+            if len(self._embedding_cache) > EMBEDDING_CACHE_MAX_ENTRIES:
+                self._embedding_cache.popitem(last=False)
+    
+    def _persist(self, entries: List[Tuple[str, EmbeddingResult]]) -> None:
+        """Grava os resultados novos no cache persistente em uma única transação."""
+        if entries and self._disk_cache is not None:
+            self._disk_cache.put_many(
+                [(key, result.embedding) for key, result in entries], self.provider.value, self.model
+            )
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache de embeddings."""
+        with self._cache_lock:
+            total = self._cache_hits + self._cache_misses
+            return {
+                "entries": len(self._embedding_cache),
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": self._cache_hits / total if total else 0.0
+            }
+    
+    def clear_cache(self) -> None:
+        """Descarta os embeddings memorizados."""
+        with self._cache_lock:
+            self._embedding_cache.clear()
+    
     def generate_embedding(self, text: str) -> EmbeddingResult:
-        """Gera embedding para um texto."""
+        """Gera embedding para um texto.
+        
+        Textos repetidos são respondidos pelo cache LRU (processing_time=0).
+        """
+        pending: List[Tuple[str, EmbeddingResult]] = []
+        result = self._generate_embedding(text, pending)
+        self._persist(pending)
+        return result
+
+    def _generate_embedding(self, text: str, pending: List[Tuple[str, EmbeddingResult]]) -> EmbeddingResult:
+        """Embedding do cache ou gerado no provedor.
+
+        Resultados novos entram no LRU e são acrescentados a pending; quem
+        chama os grava no cache persistente de uma vez com _persist().
+        """
         if not text.strip():
             raise ValueError("Texto vazio não pode gerar embedding")
-        
+
+        cache_key = self._cache_key(text)
+        cached = self._cache_get(cache_key, text)
+        if cached is not None:
+            return cached
+
+        result = self._compute_embedding(text)
+        self._cache_set(cache_key, result)
+        pending.append((cache_key, result))
+        return result
+
+    def _compute_embedding(self, text: str) -> EmbeddingResult:
+        """Gera o embedding de um texto no provedor, sem consultar o cache."""
         start_time = time.perf_counter()
-        
+
         try:
             if self.provider in [EmbeddingProvider.LLM_MANAGER, EmbeddingProvider.OPENAI, EmbeddingProvider.GROQ]:
                 embedding = self._generate_llm_manager_embedding(text)
@@ -299,7 +441,61 @@ class EmbeddingGenerator:
         resized = np.interp(target_indexes, np.arange(current_dim, dtype=np.float32), vector)
         return resized.astype(np.float32).tolist()
     
-    def generate_embeddings_batch(self, 
+    def generate_embeddings_for_texts(self, texts: List[str]) -> List[EmbeddingResult]:
+        """Gera embeddings para vários textos curtos (ex.: consultas) de uma vez.
+
+        Com Sentence Transformers todos os textos são codificados em uma única
+        chamada a encode(); nos demais provedores cada texto é processado em sequência.
+        Os vetores novos são gravados no cache persistente em uma única transação.
+
+        Args:
+            texts: Textos a codificar (não vazios)
+
+        Returns:
+            Lista de resultados na mesma ordem de texts
+        """
+        if not texts:
+            return []
+        if any(not text.strip() for text in texts):
+            raise ValueError("Texto vazio não pode gerar embedding")
+
+        if self.provider != EmbeddingProvider.SENTENCE_TRANSFORMER:
+            pending: List[Tuple[str, EmbeddingResult]] = []
+            results = [self._generate_embedding(text, pending) for text in texts]
+            self._persist(pending)
+            return results
+
+        # Apenas os textos ausentes do cache são codificados
+        cache_keys = [self._cache_key(text) for text in texts]
+        results: List[Optional[EmbeddingResult]] = [self._cache_get(key, text) for key, text in zip(cache_keys, texts)]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        start_time = time.perf_counter()
+        vectors = self._client.encode([texts[i] for i in missing], normalize_embeddings=True)
+        processing_time = (time.perf_counter() - start_time) / len(missing)
+
+        for i, vector in zip(missing, vectors):
+            raw_embedding = vector.tolist()
+            embedding = self._ensure_target_dimensions(raw_embedding)
+            results[i] = EmbeddingResult(
+                chunk_content=texts[i],
+                embedding=embedding,
+                provider=self.provider,
+                model=self.model,
+                dimensions=len(embedding),
+                processing_time=processing_time,
+                raw_dimensions=len(raw_embedding)
+            )
+            self._cache_set(cache_keys[i], results[i])
+        # Todos os vetores novos do lote em uma única transação do cache persistente
+        self._persist([(cache_keys[i], results[i]) for i in missing])
+
+        self.logger.debug(f"Embeddings gerados para {len(missing)}/{len(texts)} textos em uma chamada ({processing_time * len(missing):.3f}s)")
+        return results
+
+    def generate_embeddings_batch(self,
                                   chunks: List[TextChunk], 
                                   batch_size: int = 30) -> List[EmbeddingResult]:
         """Gera embeddings para múltiplos chunks em batches.
@@ -325,9 +521,10 @@ class EmbeddingGenerator:
             batch = chunks[i:i + batch_size]
             batch_start_time = time.perf_counter()
             batch_results = []
+            pending: List[Tuple[str, EmbeddingResult]] = []
             for chunk in batch:
                 try:
-                    result = self.generate_embedding(chunk.content)
+                    result = self._generate_embedding(chunk.content, pending)
                     result.chunk_metadata = {
                         "source": chunk.metadata.source,
                         "chunk_index": chunk.metadata.chunk_index,
@@ -339,6 +536,8 @@ class EmbeddingGenerator:
                 except Exception as e:
                     self.logger.error(f"Erro no chunk {chunk.metadata.chunk_index}: {str(e)}")
                     continue
+            # Uma transação do cache persistente por batch
+            self._persist(pending)
             results.extend(batch_results)
             batch_time = time.perf_counter() - batch_start_time
             now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
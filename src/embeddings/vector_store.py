@@ -20,6 +20,11 @@ logger = get_logger(__name__)
 VECTOR_DIMENSIONS = 384
 
 
+def _as_json_vector(embedding: Any) -> List[float]:
+    """Converte o embedding (lista ou ndarray) em lista apenas na fronteira com o Supabase."""
+    return embedding.tolist() if hasattr(embedding, "tolist") else embedding
+
+
 @dataclass
 class VectorSearchResult:
     """Resultado de uma busca vetorial."""
@@ -112,7 +117,7 @@ class VectorStore:
             
             insert_data.append({
                 "chunk_text": result.chunk_content,
-                "embedding": result.embedding,
+                "embedding": _as_json_vector(result.embedding),
                 "metadata": metadata
             })
         
@@ -196,7 +201,7 @@ class VectorStore:
             
             insert_data = {
                 "chunk_text": query,  # Usar query como chunk_text para busca
-                "embedding": embedding,
+                "embedding": _as_json_vector(embedding),
                 "metadata": metadata
             }
             
@@ -222,7 +227,7 @@ class VectorStore:
         """Busca embeddings similares usando busca vetorial.
         
         Args:
-            query_embedding: Embedding da consulta
+            query_embedding: Embedding da consulta (lista ou ndarray float32)
             similarity_threshold: Threshold mínimo de similaridade
             limit: Número máximo de resultados
             filters: Filtros adicionais para metadados
@@ -235,7 +240,7 @@ class VectorStore:
         try:
             # Construir a query RPC para busca vetorial
             rpc_params = {
-                'query_embedding': query_embedding,
+                'query_embedding': _as_json_vector(query_embedding),
                 'similarity_threshold': similarity_threshold,
                 'match_count': limit
             }
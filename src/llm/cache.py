@@ -0,0 +1,306 @@
+"""Cache de respostas para o LLM Manager
+=====================================
+
+Evita pagar latência e tokens de API por prompts repetidos:
+- Chave exata (SHA256 de modelo, mensagens e parâmetros) para chamadas
+  determinísticas (temperature == 0) ou prompts idênticos
+- Busca semântica opcional por similaridade de cosseno dos embeddings do
+  prompt (sentence-transformers all-MiniLM-L6-v2) para chamadas com
+  temperature > 0; no get_llm_manager só é ativada com LLM_CACHE_SEMANTIC=true
+- Backends plugáveis: memória (LRU + TTL) e Redis
+
+Uso:
+    cache = LLMCache()
+    cached = cache.get(prompt, config)
+    if cached is None:
+        response = manager.chat(prompt, config)
+        cache.set(prompt, config, response)
+"""
+
+from __future__ import annotations
+import hashlib
+import importlib.util
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from typing import Any, Dict, List, Optional, Protocol, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# sentence-transformers (torch) só é importado no primeiro uso da busca semântica
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+from src.utils.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from src.llm.manager import LLMConfig, LLMProvider, LLMResponse
+
+logger = get_logger(__name__)
+
+DEFAULT_SEMANTIC_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+
+def _dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Serializa para JSON (bytes UTF-8), com orjson quando disponível."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(value, sort_keys=sort_keys, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+class CacheBackend(Protocol):
+    """Interface mínima de armazenamento usada pelo LLMCache."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class MemoryBackend:
+    """Backend em memória com despejo LRU e expiração por TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Backend Redis, compartilhado entre processos (ex.: workers do pytest-xdist)."""
+
+    def __init__(self, url: str, ttl_seconds: Optional[float] = 3600.0, prefix: str = "llm_cache:"):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("Biblioteca redis não instalada (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(self.prefix + key)
+        return _loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        ttl = int(self.ttl_seconds) if self.ttl_seconds else None
+        self.client.set(self.prefix + key, _dumps(value), ex=ttl)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class LLMCache:
+    """Cache de respostas do LLMManager com chave exata e busca semântica."""
+
+    def __init__(self,
+                 backend: Optional[CacheBackend] = None,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 semantic_model: Optional[str] = DEFAULT_SEMANTIC_MODEL,
+                 max_semantic_entries: int = 1024):
+        """Inicializa o cache.
+
+        Args:
+            backend: Armazenamento das respostas (padrão: MemoryBackend)
+            similarity_threshold: Similaridade de cosseno mínima para um acerto semântico
+            semantic_model: Modelo sentence-transformers; None desativa a busca semântica
+            max_semantic_entries: Limite de embeddings mantidos por escopo
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.similarity_threshold = similarity_threshold
+        self.semantic_model = semantic_model if SENTENCE_TRANSFORMERS_AVAILABLE else None
+        self.max_semantic_entries = max_semantic_entries
+        self._encoder = None
+        # escopo -> (matriz de embeddings normalizados, chaves correspondentes)
+        self._semantic_index: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _scope(config: "LLMConfig",
+               system_prompt: Optional[str],
+               provider: Optional["LLMProvider"]) -> Dict[str, Any]:
+        """Tudo o que define a resposta além do texto do prompt."""
+        return {
+            "model": config.model,
+            "provider": provider.value if provider else None,
+            "system": system_prompt,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "top_p": config.top_p,
+        }
+
+    @staticmethod
+    def _digest(payload: Dict[str, Any]) -> str:
+        return hashlib.sha256(_dumps(payload, sort_keys=True)).hexdigest()
+
+    def make_key(self,
+                 prompt: str,
+                 config: "LLMConfig",
+                 system_prompt: Optional[str] = None,
+                 provider: Optional["LLMProvider"] = None) -> str:
+        """Gera a chave SHA256 de {modelo, mensagens, parâmetros}."""
+        payload = self._scope(config, system_prompt, provider)
+        payload["prompt"] = prompt
+        return self._digest(payload)
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if not self.semantic_model:
+            return None
+        try:
+            if self._encoder is None:
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self.semantic_model)
+            return np.asarray(self._encoder.encode(text, normalize_embeddings=True), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"⚠️ Busca semântica desativada: {e}")
+            self.semantic_model = None
+            return None
+
+    def get(self,
+            prompt: str,
+            config: "LLMConfig",
+            system_prompt: Optional[str] = None,
+            provider: Optional["LLMProvider"] = None) -> Optional["LLMResponse"]:
+        """Retorna a resposta em cache para o prompt, ou None."""
+        value = self.backend.get(self.make_key(prompt, config, system_prompt, provider))
+
+        if value is None and config.temperature > 0:
+            value = self._semantic_get(prompt, config, system_prompt, provider)
+
+        # chat_batch consulta o cache a partir de várias threads
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._to_response(value)
+
+    def _semantic_get(self,
+                      prompt: str,
+                      config: "LLMConfig",
+                      system_prompt: Optional[str],
+                      provider: Optional["LLMProvider"]) -> Optional[Dict[str, Any]]:
+        scope = self._digest(self._scope(config, system_prompt, provider))
+        with self._lock:
+            indexed = self._semantic_index.get(scope)
+        if indexed is None:
+            return None
+
+        embedding = self._embed(prompt)
+        if embedding is None:
+            return None
+
+        matrix, keys = indexed
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return self.backend.get(keys[best])
+
+    def set(self,
+            prompt: str,
+            config: "LLMConfig",
+            response: "LLMResponse",
+            system_prompt: Optional[str] = None,
+            provider: Optional["LLMProvider"] = None) -> None:
+        """Armazena uma resposta bem-sucedida."""
+        if not response.success:
+            return
+
+        key = self.make_key(prompt, config, system_prompt, provider)
+        value = asdict(response)
+        value["provider"] = response.provider.value
+        self.backend.set(key, value)
+
+        if config.temperature > 0:
+            embedding = self._embed(prompt)
+            if embedding is not None:
+                self._index(self._digest(self._scope(config, system_prompt, provider)), embedding, key)
+
+    def _index(self, scope: str, embedding: np.ndarray, key: str) -> None:
+        with self._lock:
+            matrix, keys = self._semantic_index.get(scope, (np.empty((0, embedding.shape[0]), dtype=np.float32), []))
+            if key in keys:
+                return
+            matrix = np.vstack([matrix, embedding])[-self.max_semantic_entries:]
+            keys = (keys + [key])[-self.max_semantic_entries:]
+            self._semantic_index[scope] = (matrix, keys)
+
+    @staticmethod
+    def _to_response(value: Dict[str, Any]) -> "LLMResponse":
+        from src.llm.manager import LLMProvider, LLMResponse
+
+        response = LLMResponse(**{**value, "provider": LLMProvider(value["provider"])})
+        return replace(response, processing_time=0.0, cached=True)
+
+    def clear(self) -> None:
+        """Remove todas as respostas e embeddings armazenados."""
+        self.backend.clear()
+        with self._lock:
+            self._semantic_index.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores de acerto do cache."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "semantic_enabled": self.semantic_model is not None,
+        }
@@ -10,14 +10,21 @@ Este módulo fornece uma camada de abstração para diferentes provedores LLM:
 Uso:
     manager = LLMManager()
     response = manager.chat("Analise estes dados...")
+    responses = manager.chat_batch(["Pergunta 1", "Pergunta 2"])
+    for piece in manager.stream_chat("Explique..."):
+        print(piece, end="")
 """
 
 from __future__ import annotations
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import threading
 import time
 
 # Adiciona o diretório raiz do projeto ao PYTHONPATH
@@ -25,7 +32,11 @@ root_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(root_dir))
 
 from src.utils.logging_config import get_logger
-from src.settings import GROQ_API_KEY, OPENAI_API_KEY, GOOGLE_API_KEY
+from src.settings import (
+    GROQ_API_KEY, OPENAI_API_KEY, GOOGLE_API_KEY,
+    LLM_CACHE_ENABLED, LLM_CACHE_SEMANTIC, LLM_CACHE_TTL_SECONDS, REDIS_URL
+)
+from src.llm.cache import DEFAULT_SEMANTIC_MODEL, LLMCache, MemoryBackend, RedisBackend
 
 logger = get_logger(__name__)
 
@@ -47,6 +58,7 @@ class LLMResponse:
     processing_time: float = 0.0
     error: Optional[str] = None
     success: bool = True
+    cached: bool = False
 
 
 @dataclass
@@ -56,6 +68,80 @@ class LLMConfig:
     max_tokens: int = 1024
     top_p: float = 0.9
     model: Optional[str] = None  # Se None, usa modelo padrão do provedor
+    first_token_timeout_ms: int = 20_000  # Streaming: espera máxima pelo primeiro pedaço antes do fallback
+    timeout_ms: int = 60_000  # Limite total da chamada (e de leitura sem streaming)
+
+
+# Códigos HTTP que indicam falha transitória do provedor (contam para o circuit breaker)
+_TRANSIENT_STATUS_CODES = {408, 429}
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Indica se o erro é do provedor (timeout, rede, 429, 5xx) e não da requisição."""
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500 or status_code in _TRANSIENT_STATUS_CODES
+    # Sem código HTTP: timeouts e falhas de conexão, ou erro desconhecido
+    return True
+
+
+@dataclass
+class ProviderCircuit:
+    """Circuit breaker de um provedor.
+    
+    Após ``failure_threshold`` falhas transitórias consecutivas o circuito
+    abre e o provedor é pulado por ``cooldown_s`` segundos; depois disso uma
+    chamada de teste é permitida (meio-aberto) e o sucesso fecha o circuito.
+    """
+    failure_threshold: int = 3
+    cooldown_s: float = 30.0
+    failures: int = 0
+    opened_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown_s:
+            return "open"
+        return "half_open"
+    
+    def allows_request(self) -> bool:
+        return self.state != "open"
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                # Reabre (ou renova) a janela de cooldown
+                self.opened_at = time.monotonic()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "cooldown_s": self.cooldown_s,
+        }
+
+
+# Parâmetros do timeout adaptativo de leitura
+_CONNECT_TIMEOUT_S = 5.0
+_MIN_READ_TIMEOUT_S = 10.0
+_MIN_LATENCY_SAMPLES = 20
+
+# Validade (s) do resultado de um healthcheck de provedor
+_HEALTH_TTL_S = 60.0
+
+# Pool HTTP compartilhado pelos clientes Groq/OpenAI
+_HTTP_MAX_CONNECTIONS = 16
+_HTTP_MAX_KEEPALIVE = 8
+_HTTP_KEEPALIVE_EXPIRY_S = 30.0
 
 
 class LLMManager:
@@ -76,7 +162,17 @@ class LLMManager:
         
         # Cache de clientes inicializados
         self._clients = {}
+        self._http_client = None
         self._provider_status = {}
+        self._circuits: Dict[LLMProvider, ProviderCircuit] = {p: ProviderCircuit() for p in LLMProvider}
+        # Latências recentes (s) por provedor para o timeout adaptativo
+        self._latencies: Dict[LLMProvider, deque] = {p: deque(maxlen=128) for p in LLMProvider}
+        self._latencies_lock = threading.Lock()
+        # Último healthcheck por provedor: (ok, instante monotônico)
+        self._health: Dict[LLMProvider, Tuple[bool, float]] = {}
+        
+        # Cache de respostas (opcional, configurado em get_llm_manager)
+        self.cache: Optional[LLMCache] = None
         
         # Verificar disponibilidade dos provedores
         self._check_provider_availability()
@@ -154,6 +250,35 @@ class LLMManager:
                 return provider
         return None
     
+    def _get_http_client(self):
+        """Cliente httpx único (keep-alive e HTTP/2 se disponível) reutilizado pelos SDKs.
+        
+        Retorna None se httpx não estiver instalado; os SDKs usam então o próprio cliente.
+        """
+        if self._http_client is None:
+            try:
+                import httpx
+            except ImportError:
+                return None
+            http2 = importlib.util.find_spec("h2") is not None
+            self._http_client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY_S
+                )
+            )
+            self.logger.debug(f"Pool HTTP criado (http2={http2})")
+        return self._http_client
+    
+    def close(self) -> None:
+        """Fecha as conexões HTTP abertas pelos clientes dos provedores."""
+        self._clients.clear()
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+    
     def _get_client(self, provider: LLMProvider):
         """Obtém ou cria cliente para o provedor especificado."""
         if provider in self._clients:
@@ -162,7 +287,9 @@ class LLMManager:
         client = None
         if provider == LLMProvider.GROQ:
             from groq import Groq
-            client = Groq(api_key=GROQ_API_KEY)
+            # Sem retries internos do SDK: o fallback entre provedores e o
+            # circuit breaker cuidam das falhas dentro do timeout configurado
+            client = Groq(api_key=GROQ_API_KEY, max_retries=0, http_client=self._get_http_client())
         
         elif provider == LLMProvider.GOOGLE:
             import google.generativeai as genai
@@ -171,7 +298,7 @@ class LLMManager:
         
         elif provider == LLMProvider.OPENAI:
             import openai
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
+            client = openai.OpenAI(api_key=OPENAI_API_KEY, max_retries=0, http_client=self._get_http_client())
         
         if client:
             self._clients[provider] = client
@@ -187,6 +314,34 @@ class LLMManager:
         }
         return defaults.get(provider, "unknown")
     
+    def _read_timeout(self, provider: LLMProvider, config: LLMConfig, streaming: bool = False) -> float:
+        """Calcula o timeout de leitura (s) para o provedor.
+        
+        Sem streaming o provedor só envia bytes ao fim da geração, então o
+        limite é ``timeout_ms``. Em streaming, com histórico suficiente usa
+        max(2 * p99, 10s) das latências recentes, limitado a
+        ``first_token_timeout_ms``; sem histórico usa o próprio
+        ``first_token_timeout_ms``. Nunca excede ``timeout_ms``.
+        """
+        if not streaming:
+            return config.timeout_ms / 1000
+        read_s = config.first_token_timeout_ms / 1000
+        with self._latencies_lock:
+            ordered = sorted(self._latencies[provider])
+        if len(ordered) >= _MIN_LATENCY_SAMPLES:
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            read_s = min(read_s, max(2 * p99, _MIN_READ_TIMEOUT_S))
+        return min(read_s, config.timeout_ms / 1000)
+    
+    def _request_timeout(self, provider: LLMProvider, config: LLMConfig, streaming: bool = False):
+        """Timeout por chamada para os clientes OpenAI/Groq (baseados em httpx)."""
+        read_s = self._read_timeout(provider, config, streaming)
+        try:
+            import httpx
+            return httpx.Timeout(config.timeout_ms / 1000, connect=_CONNECT_TIMEOUT_S, read=read_s)
+        except ImportError:
+            return read_s
+    
     def _call_groq(self, prompt: str, config: LLMConfig, system_prompt: Optional[str] = None) -> LLMResponse:
         """Chama a API do Groq."""
         start_time = time.time()
@@ -204,7 +359,8 @@ class LLMManager:
             messages=messages,
             temperature=config.temperature,
             max_tokens=config.max_tokens,
-            top_p=config.top_p
+            top_p=config.top_p,
+            timeout=self._request_timeout(LLMProvider.GROQ, config)
         )
         
         processing_time = time.time() - start_time
@@ -240,7 +396,8 @@ class LLMManager:
                 'temperature': config.temperature,
                 'max_output_tokens': config.max_tokens,
                 'top_p': config.top_p,
-            }
+            },
+            request_options={'timeout': self._read_timeout(LLMProvider.GOOGLE, config)}
         )
         
         processing_time = time.time() - start_time
@@ -270,7 +427,8 @@ class LLMManager:
             messages=messages,
             temperature=config.temperature,
             max_tokens=config.max_tokens,
-            top_p=config.top_p
+            top_p=config.top_p,
+            timeout=self._request_timeout(LLMProvider.OPENAI, config)
         )
         
         processing_time = time.time() - start_time
@@ -289,7 +447,8 @@ class LLMManager:
              prompt: str, 
              config: Optional[LLMConfig] = None,
              force_provider: Optional[LLMProvider] = None,
-             system_prompt: Optional[str] = None) -> LLMResponse:
+             system_prompt: Optional[str] = None,
+             use_cache: bool = True) -> LLMResponse:
         """Envia prompt para LLM com fallback automático.
         
         Args:
@@ -297,30 +456,54 @@ class LLMManager:
             config: Configurações para a chamada
             force_provider: Forçar uso de provedor específico
             system_prompt: Prompt de sistema para definir comportamento/personalidade
+            use_cache: Consultar/alimentar o cache de respostas, se configurado
         
         Returns:
             LLMResponse com resultado ou erro
         """
         config = config or LLMConfig()
         
-        # Determinar ordem de tentativa dos provedores
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(prompt, config, system_prompt, force_provider)
+            if cached is not None:
+                self.logger.debug(f"✅ Resposta obtida do cache ({cached.provider.value})")
+                return cached
+        
+        response = self._chat_uncached(prompt, config, force_provider, system_prompt)
+        if cache is not None:
+            cache.set(prompt, config, response, system_prompt, force_provider)
+        return response
+    
+    def _providers_to_try(self, force_provider: Optional[LLMProvider]) -> List[LLMProvider]:
+        """Ordem de tentativa dos provedores para uma chamada."""
         if force_provider:
-            providers_to_try = [force_provider]
-        else:
-            # Começar com o provedor ativo, depois tentar outros disponíveis
-            available_providers = [
-                p for p in self.preferred_providers 
-                if self._provider_status.get(p, {}).get("available", False)
-            ]
-            
-            if self.active_provider in available_providers:
-                # Mover provedor ativo para o início
-                available_providers.remove(self.active_provider)
-                providers_to_try = [self.active_provider] + available_providers
-            else:
-                providers_to_try = available_providers
+            # Provedor forçado ignora o circuit breaker (útil para testes)
+            return [force_provider]
+        
+        # Começar com o provedor ativo, depois tentar outros disponíveis,
+        # pulando os que estão com o circuito aberto
+        available_providers = [
+            p for p in self.preferred_providers 
+            if self._provider_status.get(p, {}).get("available", False)
+            and self._circuits[p].allows_request()
+        ]
+        
+        if self.active_provider in available_providers:
+            # Mover provedor ativo para o início
+            available_providers.remove(self.active_provider)
+            return [self.active_provider] + available_providers
+        return available_providers
+    
+    def _chat_uncached(self,
+                       prompt: str,
+                       config: LLMConfig,
+                       force_provider: Optional[LLMProvider],
+                       system_prompt: Optional[str]) -> LLMResponse:
+        """Executa a chamada com fallback entre provedores, sem cache."""
+        providers_to_try = self._providers_to_try(force_provider)
         
-        last_error = None
+        last_error = None if providers_to_try else "todos os provedores com circuito aberto"
         
         # Tentar cada provedor na ordem de preferência
         for provider in providers_to_try:
@@ -336,6 +519,11 @@ class LLMManager:
                 else:
                     continue
                 
+                self._circuits[provider].record_success()
+                self._health[provider] = (True, time.monotonic())
+                with self._latencies_lock:
+                    self._latencies[provider].append(response.processing_time)
+                
                 # Sucesso! Atualizar provedor ativo se necessário
                 if provider != self.active_provider:
                     self.logger.info(f"Mudando provedor ativo para: {provider.value}")
@@ -348,9 +536,16 @@ class LLMManager:
                 last_error = str(e)
                 self.logger.warning(f"❌ Falha no provedor {provider.value}: {last_error}")
                 
-                # Marcar provedor como indisponível temporariamente
+                # Falhas transitórias contam para o circuit breaker; erros da
+                # própria requisição (4xx) não tornam o provedor indisponível
+                if _is_transient_error(e):
+                    circuit = self._circuits[provider]
+                    circuit.record_failure()
+                    if circuit.state == "open":
+                        self.logger.warning(
+                            f"⚡ Circuito aberto para {provider.value} por {circuit.cooldown_s:.0f}s"
+                        )
                 if provider in self._provider_status:
-                    self._provider_status[provider]["available"] = False
                     self._provider_status[provider]["message"] = f"Erro: {last_error}"
                 
                 continue
@@ -367,13 +562,207 @@ class LLMManager:
             success=False
         )
     
+    def _open_stream(self,
+                     provider: LLMProvider,
+                     prompt: str,
+                     config: LLMConfig,
+                     system_prompt: Optional[str]) -> Tuple[Any, Iterator[str]]:
+        """Abre uma resposta em streaming; retorna (objeto da conexão, iterador de texto)."""
+        client = self._get_client(provider)
+        
+        if provider == LLMProvider.GOOGLE:
+            combined_prompt = f"{system_prompt}\n\nUsuário: {prompt}" if system_prompt else prompt
+            response = client.generate_content(
+                combined_prompt,
+                generation_config={
+                    'temperature': config.temperature,
+                    'max_output_tokens': config.max_tokens,
+                    'top_p': config.top_p,
+                },
+                stream=True,
+                request_options={'timeout': self._read_timeout(provider, config, streaming=True)}
+            )
+            return response, (chunk.text for chunk in response if chunk.parts)
+        
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        stream = client.chat.completions.create(
+            model=config.model or self._get_default_model(provider),
+            messages=messages,
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
+            top_p=config.top_p,
+            stream=True,
+            timeout=self._request_timeout(provider, config, streaming=True)
+        )
+        pieces = (
+            chunk.choices[0].delta.content
+            for chunk in stream
+            if chunk.choices and chunk.choices[0].delta.content
+        )
+        return stream, pieces
+    
+    def stream_chat(self,
+                    prompt: str,
+                    config: Optional[LLMConfig] = None,
+                    force_provider: Optional[LLMProvider] = None,
+                    system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Envia prompt e produz o texto da resposta em pedaços, à medida que chega.
+        
+        O fallback entre provedores só acontece antes do primeiro pedaço.
+        Interromper a iteração (``break``) fecha a conexão, encerrando a
+        geração no provedor. O cache de respostas não é usado.
+        
+        Raises:
+            RuntimeError: Se nenhum provedor conseguir iniciar a resposta
+        """
+        config = config or LLMConfig()
+        providers_to_try = self._providers_to_try(force_provider)
+        last_error = None if providers_to_try else "todos os provedores com circuito aberto"
+        
+        for provider in providers_to_try:
+            start_time = time.perf_counter()
+            connection = None
+            try:
+                connection, pieces = self._open_stream(provider, prompt, config, system_prompt)
+                first_piece = next(pieces, "")
+            except Exception as e:
+                last_error = str(e)
+                self.logger.warning(f"❌ Falha no streaming via {provider.value}: {last_error}")
+                if _is_transient_error(e):
+                    self._circuits[provider].record_failure()
+                close = getattr(connection, "close", None)
+                if close:
+                    close()
+                continue
+            
+            time_to_first_token = time.perf_counter() - start_time
+            self._circuits[provider].record_success()
+            self._health[provider] = (True, time.monotonic())
+            self.logger.info(f"⏱️ Primeiro token via {provider.value} em {time_to_first_token:.2f}s")
+            
+            try:
+                if first_piece:
+                    yield first_piece
+                yield from pieces
+            finally:
+                close = getattr(connection, "close", None)
+                if close:
+                    close()
+            return
+        
+        error_msg = f"Todos os provedores LLM falharam. Último erro: {last_error}"
+        self.logger.error(error_msg)
+        raise RuntimeError(error_msg)
+    
+    def chat_batch(self,
+                   prompts: List[str],
+                   config: Optional[LLMConfig] = None,
+                   force_provider: Optional[LLMProvider] = None,
+                   system_prompt: Optional[str] = None,
+                   max_workers: Optional[int] = None,
+                   use_cache: bool = True) -> List[LLMResponse]:
+        """Envia vários prompts independentes em paralelo.
+        
+        Os clientes dos provedores são síncronos e não expõem um endpoint de
+        lote com resposta imediata, então cada prompt é despachado para
+        ``chat()`` em um pool de threads: o tempo total fica próximo ao da
+        chamada mais lenta, e não à soma de todas. O pool é limitado ao
+        tamanho do pool de conexões HTTP, para que lotes grandes não criem
+        centenas de threads nem disparem todas as requisições ao provedor de
+        uma vez. Fallback e tratamento de erro são os mesmos de ``chat()``.
+        
+        Args:
+            prompts: Lista de prompts
+            config: Configurações aplicadas a todas as chamadas
+            force_provider: Forçar uso de provedor específico
+            system_prompt: Prompt de sistema compartilhado
+            max_workers: Limite de chamadas simultâneas (padrão: _HTTP_MAX_CONNECTIONS)
+            use_cache: Consultar/alimentar o cache de respostas, se configurado
+        
+        Returns:
+            Lista de LLMResponse na mesma ordem dos prompts
+        """
+        if not prompts:
+            return []
+        
+        config = config or LLMConfig()
+        if len(prompts) == 1:
+            return [self.chat(prompts[0], config, force_provider, system_prompt, use_cache)]
+        
+        with ThreadPoolExecutor(max_workers=min(len(prompts), max_workers or _HTTP_MAX_CONNECTIONS)) as executor:
+            return list(executor.map(
+                lambda prompt: self.chat(prompt, config, force_provider, system_prompt, use_cache),
+                prompts
+            ))
+    
+    def _probe_provider(self, provider: LLMProvider) -> None:
+        """Consulta barata ao provedor (listagem/leitura de modelos); levanta exceção em falha."""
+        client = self._get_client(provider)
+        if provider in (LLMProvider.GROQ, LLMProvider.OPENAI):
+            client.models.list(timeout=_CONNECT_TIMEOUT_S * 2)
+        elif provider == LLMProvider.GOOGLE:
+            import google.generativeai as genai
+            genai.get_model(self._get_default_model(provider), request_options={'timeout': _CONNECT_TIMEOUT_S * 2})
+    
+    def healthcheck(self, provider: LLMProvider, force: bool = False) -> bool:
+        """Verifica se o provedor responde, reutilizando o resultado por até 60s.
+        
+        Chamadas de chat bem-sucedidas também renovam o resultado, de modo que
+        com o cache quente nenhuma requisição é feita. Provedores não
+        configurados ou com o circuito aberto são reportados sem sondagem.
+        
+        Args:
+            provider: Provedor a verificar
+            force: Ignora o resultado em cache e sonda o provedor
+        
+        Returns:
+            True se o provedor está saudável
+        """
+        if not self._provider_status.get(provider, {}).get("available", False):
+            return False
+        if not self._circuits[provider].allows_request():
+            return False
+        
+        cached = self._health.get(provider)
+        if not force and cached is not None and time.monotonic() - cached[1] < _HEALTH_TTL_S:
+            return cached[0]
+        
+        try:
+            self._probe_provider(provider)
+            ok = True
+            self._circuits[provider].record_success()
+        except Exception as e:
+            ok = False
+            self.logger.warning(f"⚠️ Healthcheck falhou para {provider.value}: {e}")
+            if _is_transient_error(e):
+                self._circuits[provider].record_failure()
+        
+        self._health[provider] = (ok, time.monotonic())
+        return ok
+    
+    def provider_health(self, provider: LLMProvider) -> Dict[str, Any]:
+        """Retorna a saúde do provedor conhecida em memória (sem chamadas de rede)."""
+        cached = self._health.get(provider)
+        return {
+            "configured": self._provider_status.get(provider, {}).get("available", False),
+            "ok": cached[0] if cached else None,
+            "age_s": time.monotonic() - cached[1] if cached else None,
+            "fresh": cached is not None and time.monotonic() - cached[1] < _HEALTH_TTL_S,
+            "circuit": self._circuits[provider].state,
+        }
+    
     def get_status(self) -> Dict[str, Any]:
         """Retorna status de todos os provedores."""
         return {
             "active_provider": self.active_provider.value if self.active_provider else None,
             "preferred_order": [p.value for p in self.preferred_providers],
             "provider_status": {
-                p.value: status for p, status in self._provider_status.items()
+                p.value: {**status, "circuit": self._circuits[p].to_dict()}
+                for p, status in self._provider_status.items()
             }
         }
     
@@ -381,6 +770,9 @@ class LLMManager:
         """Revalida a disponibilidade de todos os provedores."""
         self.logger.info("🔄 Revalidando disponibilidade dos provedores...")
         self._check_provider_availability()
+        for circuit in self._circuits.values():
+            circuit.record_success()
+        self._health.clear()
         
         # Atualizar provedor ativo se necessário
         new_active = self._get_first_available_provider()
@@ -395,15 +787,32 @@ class LLMManager:
 # Instância global singleton para uso em todo o sistema
 _llm_manager_instance = None
 
-def get_llm_manager() -> LLMManager:
-    """Retorna instância singleton do LLM Manager."""
+def get_llm_manager(use_cache: bool = LLM_CACHE_ENABLED) -> LLMManager:
+    """Retorna instância singleton do LLM Manager.
+    
+    Args:
+        use_cache: Anexa um LLMCache à instância na primeira criação
+            (Redis se REDIS_URL estiver configurada, senão memória). O cache
+            é de chave exata; a busca semântica só é ativada com
+            LLM_CACHE_SEMANTIC=true, pois perguntas analíticas diferentes
+            sobre o mesmo dataset podem passar do limiar de similaridade
+    """
     global _llm_manager_instance
     if _llm_manager_instance is None:
         _llm_manager_instance = LLMManager()
+        if use_cache:
+            if REDIS_URL:
+                backend = RedisBackend(REDIS_URL, ttl_seconds=LLM_CACHE_TTL_SECONDS)
+            else:
+                backend = MemoryBackend(ttl_seconds=LLM_CACHE_TTL_SECONDS)
+            semantic_model = DEFAULT_SEMANTIC_MODEL if LLM_CACHE_SEMANTIC else None
+            _llm_manager_instance.cache = LLMCache(backend, semantic_model=semantic_model)
     return _llm_manager_instance
 
 
 def reset_llm_manager() -> None:
     """Reseta a instância global (útil para testes)."""
     global _llm_manager_instance
+    if _llm_manager_instance is not None:
+        _llm_manager_instance.close()
     _llm_manager_instance = None
\ No newline at end of file
@@ -17,6 +17,7 @@ from .memory_types import (
     ContentFormat,
     ContextType,
     EmbeddingType,
+    EmbeddingPrecision,
     
     # Dataclasses
     SessionInfo,
@@ -27,6 +28,7 @@ from .memory_types import (
     
     # Config e Exceções
     MemoryConfig,
+    UuidPool,
     MemoryError,
     SessionNotFoundError,
     SessionExpiredError,
@@ -56,6 +58,7 @@ from .memory_utils import (
     # Tamanho/Compressão
     calculate_data_size,
     truncate_content,
+    truncate_content_bulk,
     compress_old_conversations,
     
     # Validação/Sanitização
@@ -73,6 +76,9 @@ from .memory_utils import (
     # Embeddings
     normalize_embedding,
     calculate_cosine_similarity,
+    calculate_embedding_ranges,
+    quantize_embedding,
+    dequantize_embedding,
     
     # Performance/Monitoramento
     calculate_memory_usage_stats,
@@ -104,6 +110,7 @@ __all__ = [
     "ContentFormat",
     "ContextType",
     "EmbeddingType",
+    "EmbeddingPrecision",
     
     # Configuração
     # "MemoryConfig",
@@ -129,6 +129,13 @@ class BaseMemoryManager(ABC):
         """Limpa dados expirados."""
         pass
     
+    async def flush(self) -> None:
+        """Persiste escritas pendentes (backends com escrita em lote sobrescrevem)."""
+    
+    async def close(self) -> None:
+        """Encerra o gerenciador, persistindo escritas pendentes."""
+        await self.flush()
+    
     # ========================================================================
     # MÉTODOS PÚBLICOS - INTERFACE COMUM
     # ========================================================================
@@ -593,4 +600,14 @@ class MemoryMixin:
             return [msg.to_dict() for msg in messages]
         except Exception as e:
             self._memory_manager.logger.error(f"Erro ao recuperar conversação: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    async def close_memory(self) -> None:
+        """Persiste as mensagens pendentes e encerra o gerenciador de memória."""
+        if not self.has_memory:
+            return
+        
+        try:
+            await self._memory_manager.close()
+        except Exception as e:
+            self._memory_manager.logger.error(f"Erro ao encerrar memória: {e}")
@@ -51,6 +51,13 @@ class LangChainSupabaseMemory(ConversationBufferMemory):
             except Exception as e:
                 print(f"⚠️ Erro ao carregar histórico do Supabase: {e}")
 
+    async def close(self):
+        """
+        Persiste as mensagens ainda no buffer do SupabaseMemoryManager.
+        """
+        if self.supabase_manager:
+            await self.supabase_manager.close()
+
     def clear(self):
         """
         Limpa buffer e histórico no Supabase.
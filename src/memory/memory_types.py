@@ -5,6 +5,9 @@ Este módulo define as estruturas de dados, tipos e schemas utilizados
 pelo sistema de memória persistente dos agentes multiagente.
 """
 
+import os
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -70,6 +73,50 @@ class EmbeddingType(str, Enum):
     LEARNING = "learning"
 
 
+class EmbeddingPrecision(str, Enum):
+    """Precisões de armazenamento de embeddings em memória."""
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+
+
+# ============================================================================
+# GERAÇÃO DE UUIDS
+# ============================================================================
+
+class UuidPool:
+    """
+    Pool de UUIDs v4 por thread.
+    
+    Lê `os.urandom` em blocos (uma syscall a cada `batch_size` UUIDs) e
+    fatia o buffer em 16 bytes por UUID. O pool é descartado no processo
+    filho após `fork` para que processos não repitam UUIDs.
+    """
+    
+    batch_size = 1024
+    _local = threading.local()
+    
+    @classmethod
+    def get(cls) -> UUID:
+        """Retorna um novo UUID v4."""
+        local = cls._local
+        offset = getattr(local, 'offset', None)
+        if offset is None or offset >= len(local.buffer):
+            local.buffer = os.urandom(16 * cls.batch_size)
+            offset = 0
+        local.offset = offset + 16
+        return UUID(bytes=local.buffer[offset:offset + 16], version=4)
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Descarta o buffer da thread atual."""
+        cls._local = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=UuidPool.reset)
+
+
 # ============================================================================
 # DATACLASSES PARA ESTRUTURAS DE DADOS
 # ============================================================================
@@ -77,7 +124,7 @@ class EmbeddingType(str, Enum):
 @dataclass
 class SessionInfo:
     """Informações de uma sessão de agente."""
-    id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=UuidPool.get)
     session_id: str = ""
     user_id: Optional[str] = None
     agent_name: Optional[str] = None
@@ -87,10 +134,26 @@ class SessionInfo:
     updated_at: datetime = field(default_factory=datetime.now)
     expires_at: datetime = field(default_factory=lambda: datetime.now() + timedelta(hours=24))
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Prazo no relógio monotônico, derivado de `expires_at` e recalculado
+    # quando outro timestamp é atribuído a ele
+    expires_at_ns: int = field(init=False, repr=False, compare=False)
+    _expires_at_source: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._sync_expiry()
+    
+    def _sync_expiry(self) -> None:
+        """Converte `expires_at` para o relógio monotônico."""
+        value = self.expires_at
+        remaining_us = (value - datetime.now(value.tzinfo)) // timedelta(microseconds=1)
+        self.expires_at_ns = time.monotonic_ns() + remaining_us * 1000
+        self._expires_at_source = value
     
     def is_expired(self) -> bool:
-        """Verifica se a sessão está expirada."""
-        return datetime.now() > self.expires_at
+        """Verifica se a sessão está expirada (comparação de inteiros)."""
+        if self.expires_at is not self._expires_at_source:
+            self._sync_expiry()
+        return time.monotonic_ns() > self.expires_at_ns
     
     def extend_expiry(self, hours: int = 24) -> None:
         """Estende o tempo de expiração da sessão."""
@@ -98,11 +161,11 @@ class SessionInfo:
         self.updated_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationMessage:
     """Estrutura de uma mensagem de conversação."""
-    id: UUID = field(default_factory=uuid4)
-    session_id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=UuidPool.get)
+    session_id: UUID = field(default_factory=UuidPool.get)
     agent_name: str = ""
     conversation_turn: int = 1
     message_type: MessageType = MessageType.QUERY
@@ -114,6 +177,7 @@ class ConversationMessage:
     confidence_score: Optional[float] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.now)
+    is_summary: bool = False  # True para a mensagem gerada por compress_old_conversations
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário para serialização."""
@@ -134,11 +198,11 @@ class ConversationMessage:
         }
 
 
-@dataclass
-class AgentContext:
-    """Estrutura de contexto de um agente."""
-    id: UUID = field(default_factory=uuid4)
-    session_id: UUID = field(default_factory=uuid4)
+@dataclass(slots=True)
+class _AgentContextFields:
+    """Campos de AgentContext (ver a classe pública abaixo)."""
+    id: UUID = field(default_factory=UuidPool.get)
+    session_id: UUID = field(default_factory=UuidPool.get)
     agent_name: str = ""
     context_type: ContextType = ContextType.DATA
     context_key: str = ""
@@ -149,8 +213,41 @@ class AgentContext:
     expires_at: Optional[datetime] = None
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    # O slot guarda o timestamp atribuído por último (âncora); a leitura passa
+    # pela property de AgentContext, que soma os acessos registrados depois
     last_accessed_at: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Relógio monotônico do último acesso e da última atribuição de `last_accessed_at`
+    last_accessed_ns: int = field(init=False, repr=False, compare=False)
+    _last_accessed_anchor_ns: int = field(init=False, repr=False, compare=False)
+
+
+# Slot com a âncora datetime de `last_accessed_at`
+_LAST_ACCESSED_SLOT = _AgentContextFields.__dict__['last_accessed_at']
+
+
+class AgentContext(_AgentContextFields):
+    """
+    Estrutura de contexto de um agente.
+    
+    `access()` grava apenas `last_accessed_ns`; `last_accessed_at` continua
+    sendo argumento do construtor e atributo gravável, convertido do
+    relógio monotônico para datetime na leitura.
+    """
+    __slots__ = ()
+    
+    @property
+    def last_accessed_at(self) -> datetime:
+        """Timestamp do último acesso, convertido do relógio monotônico sob demanda."""
+        elapsed_ns = self.last_accessed_ns - self._last_accessed_anchor_ns
+        anchor = _LAST_ACCESSED_SLOT.__get__(self, type(self))
+        return anchor + timedelta(microseconds=elapsed_ns // 1000)
+    
+    @last_accessed_at.setter
+    def last_accessed_at(self, value: datetime) -> None:
+        """Ancora o relógio monotônico ao timestamp informado."""
+        _LAST_ACCESSED_SLOT.__set__(self, value)
+        self._last_accessed_anchor_ns = self.last_accessed_ns = time.monotonic_ns()
     
     def is_expired(self) -> bool:
         """Verifica se o contexto está expirado."""
@@ -159,9 +256,9 @@ class AgentContext:
         return datetime.now() > self.expires_at
     
     def access(self) -> None:
-        """Registra um acesso ao contexto."""
+        """Registra um acesso ao contexto (sem alocar datetime)."""
         self.access_count += 1
-        self.last_accessed_at = datetime.now()
+        self.last_accessed_ns = time.monotonic_ns()
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário para serialização."""
@@ -186,7 +283,7 @@ class AgentContext:
 @dataclass
 class MemoryEmbedding:
     """Estrutura de embedding para memória semântica."""
-    id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=UuidPool.get)
     session_id: Optional[UUID] = None
     agent_name: str = ""
     conversation_id: Optional[UUID] = None
@@ -197,6 +294,37 @@ class MemoryEmbedding:
     similarity_threshold: float = 0.800
     created_at: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    embedding_precision: EmbeddingPrecision = EmbeddingPrecision.FLOAT32
+    quantized_embedding: Optional[bytes] = None
+    quantization_ranges: Optional[Any] = None  # faixas (mín, máx) usadas no int8
+    
+    def quantize(self, precision: EmbeddingPrecision = EmbeddingPrecision.INT8,
+                 ranges: Optional[Any] = None) -> None:
+        """
+        Quantiza o embedding para float16/int8, liberando a lista float32.
+        
+        Args:
+            precision: Precisão de destino
+            ranges: Faixas por dimensão calibradas (ver calculate_embedding_ranges)
+        """
+        from .memory_utils import quantize_embedding
+        
+        self.quantized_embedding, self.quantization_ranges = quantize_embedding(
+            self.get_embedding(), precision.value, ranges
+        )
+        self.embedding_precision = precision
+        self.embedding = []
+    
+    def get_embedding(self) -> List[float]:
+        """Retorna o embedding em float, dequantizando se necessário."""
+        if self.quantized_embedding is None:
+            return self.embedding
+        
+        from .memory_utils import dequantize_embedding
+        
+        return dequantize_embedding(
+            self.quantized_embedding, self.embedding_precision.value, self.quantization_ranges
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário para serialização."""
@@ -208,7 +336,7 @@ class MemoryEmbedding:
             'context_id': str(self.context_id) if self.context_id else None,
             'embedding_type': self.embedding_type.value,
             'source_text': self.source_text,
-            'embedding': self.embedding,
+            'embedding': self.get_embedding(),
             'similarity_threshold': self.similarity_threshold,
             'created_at': self.created_at.isoformat(),
             'metadata': self.metadata
@@ -250,6 +378,8 @@ class MemoryConfig:
     DEFAULT_SESSION_DURATION_HOURS = 24
     MAX_SESSION_DURATION_HOURS = 24 * 7  # 1 semana
     SESSION_CLEANUP_INTERVAL_HOURS = 6
+    SESSION_UUID_CACHE_TTL_SECONDS = DEFAULT_SESSION_DURATION_HOURS * 3600
+    SESSION_UUID_CACHE_MAX_SIZE = 4096
     
     # Configurações de contexto
     MAX_CONTEXT_SIZE_BYTES = 1024 * 1024  # 1MB
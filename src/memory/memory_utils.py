@@ -8,10 +8,14 @@ para o sistema de memória persistente dos agentes multiagente.
 import hashlib
 import json
 import sys
+from json.encoder import ESCAPE_ASCII as _JSON_ESCAPE_ASCII
+from json.encoder import encode_basestring_ascii as _json_encode_basestring_ascii
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
+import numpy as np
+
 from .memory_types import (
     AgentContext,
     ContextType,
@@ -21,7 +25,8 @@ from .memory_types import (
     MessageType,
     SessionInfo,
     SessionStatus,
-    SessionType
+    SessionType,
+    UuidPool
 )
 
 
@@ -40,7 +45,7 @@ def generate_session_id(prefix: str = "session", include_timestamp: bool = True)
     Returns:
         String com ID único da sessão
     """
-    unique_part = str(uuid4())[:8]
+    unique_part = str(UuidPool.get())[:8]
     
     if include_timestamp:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -153,22 +158,123 @@ def format_duration(start_time: datetime, end_time: Optional[datetime] = None) -
 # UTILITÁRIOS DE TAMANHO E COMPRESSÃO
 # ============================================================================
 
-def calculate_data_size(data: Any) -> int:
+def _json_str_size(text: str) -> int:
+    """Tamanho da string codificada por json.dumps (aspas, escapes e \\uXXXX)."""
+    # Caso comum: ASCII imprimível sem aspas nem barras, copiado literalmente
+    if _JSON_ESCAPE_ASCII.search(text) is None:
+        return len(text) + 2
+    return len(_json_encode_basestring_ascii(text))
+
+
+def _json_float_size(value: float) -> int:
+    """Tamanho de um float em json.dumps (NaN/Infinity como no módulo json)."""
+    if value != value:
+        return 3
+    if value in (float('inf'), float('-inf')):
+        return 8 if value > 0 else 9
+    return len(float.__repr__(value))
+
+
+def _json_key_size(key: Any) -> int:
+    """Tamanho de uma chave de dict em json.dumps (sempre convertida em string)."""
+    if isinstance(key, str):
+        return _json_str_size(key)
+    if key is True or key is None:
+        return 6
+    if key is False:
+        return 7
+    if isinstance(key, int):
+        return len(int.__repr__(key)) + 2
+    if isinstance(key, float):
+        return _json_float_size(key) + 2
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def calculate_data_size(data: Any, limit: Optional[int] = None) -> int:
     """
     Calcula tamanho aproximado de dados em bytes.
     
+    Estruturas (dict/list) são medidas pelo tamanho exato de
+    ``json.dumps(data)`` (separadores padrão, ensure_ascii), percorrendo os
+    objetos sem gerar o JSON completo: escapes e ``\\uXXXX`` são contados
+    como o módulo json os emite. Sub-objetos repetidos são medidos uma única
+    vez por chamada.
+    
     Args:
         data: Dados para calcular tamanho
+        limit: Se informado, interrompe a contagem assim que o total
+            ultrapassar este valor (o retorno será > limit)
         
     Returns:
         Tamanho em bytes
+        
+    Raises:
+        TypeError: Valor ou chave não serializável em JSON
+        ValueError: Referência circular
     """
     if isinstance(data, str):
-        return len(data.encode('utf-8'))
-    elif isinstance(data, dict) or isinstance(data, list):
-        return len(json.dumps(data).encode('utf-8'))
-    else:
+        return len(data) if data.isascii() else len(data.encode('utf-8'))
+    elif not isinstance(data, (dict, list)):
         return sys.getsizeof(data)
+    
+    sizes: Dict[int, int] = {}
+    in_progress: set = set()
+    total = 0
+    
+    def visit(obj: Any) -> int:
+        nonlocal total
+        
+        # Mesma ordem de verificação de tipos do encoder do módulo json
+        if isinstance(obj, str):
+            size = _json_str_size(obj)
+        elif obj is None or obj is True:
+            size = 4
+        elif obj is False:
+            size = 5
+        elif isinstance(obj, int):
+            size = len(int.__repr__(obj))
+        elif isinstance(obj, float):
+            size = _json_float_size(obj)
+        elif not isinstance(obj, (dict, list, tuple)):
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        else:
+            size = None
+        if size is not None:
+            total += size
+            return size
+        
+        obj_id = id(obj)
+        if obj_id in sizes:
+            total += sizes[obj_id]
+            return sizes[obj_id]
+        if obj_id in in_progress:
+            raise ValueError("Circular reference detected")
+        
+        in_progress.add(obj_id)
+        # Delimitadores + separadores ", " entre itens
+        size = 2 + 2 * max(len(obj) - 1, 0)
+        total += size
+        
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                # Chave entre aspas + ": "
+                key_size = _json_key_size(key) + 2
+                total += key_size
+                size += key_size + visit(value)
+                if limit is not None and total > limit:
+                    break
+        else:
+            for item in obj:
+                size += visit(item)
+                if limit is not None and total > limit:
+                    break
+        
+        in_progress.discard(obj_id)
+        sizes[obj_id] = size
+        return size
+    
+    visit(data)
+    return total
 
 
 def truncate_content(content: str, max_length: int = MemoryConfig.MAX_MESSAGE_LENGTH) -> str:
@@ -189,6 +295,25 @@ def truncate_content(content: str, max_length: int = MemoryConfig.MAX_MESSAGE_LE
     return f"{truncated}... [TRUNCADO - {len(content)} caracteres originais]"
 
 
+def truncate_content_bulk(contents: List[str], max_length: int = MemoryConfig.MAX_MESSAGE_LENGTH) -> List[str]:
+    """
+    Trunca um lote de conteúdos, devolvendo sem cópia os que cabem no limite.
+    
+    Args:
+        contents: Conteúdos para truncar
+        max_length: Tamanho máximo permitido
+        
+    Returns:
+        Lista com os conteúdos truncados quando necessário
+    """
+    keep = max_length - 50  # Reserva espaço para indicador
+    return [
+        content if len(content) <= max_length
+        else f"{content[:keep]}... [TRUNCADO - {len(content)} caracteres originais]"
+        for content in contents
+    ]
+
+
 def compress_old_conversations(messages: List[ConversationMessage], max_turns: int = 50) -> List[ConversationMessage]:
     """
     Comprime conversações antigas mantendo apenas mensagens mais relevantes.
@@ -203,9 +328,10 @@ def compress_old_conversations(messages: List[ConversationMessage], max_turns: i
     if len(messages) <= max_turns:
         return messages
     
-    # Manter sempre as primeiras e últimas mensagens
+    # Manter sempre as primeiras e últimas mensagens (seleção posicional por
+    # fatiamento, sem laço Python por mensagem)
     first_msgs = messages[:5]
-    last_msgs = messages[-(max_turns - 10):]
+    last_msgs = messages[len(messages) - max(max_turns - 10, 0):]
     
     # Criar mensagem de sumário
     compressed_count = len(messages) - len(first_msgs) - len(last_msgs)
@@ -213,7 +339,8 @@ def compress_old_conversations(messages: List[ConversationMessage], max_turns: i
         agent_name="system",
         message_type=MessageType.SYSTEM,
         content=f"[SUMÁRIO: {compressed_count} mensagens comprimidas]",
-        metadata={"compressed": True, "original_count": compressed_count}
+        metadata={"compressed": True, "original_count": compressed_count},
+        is_summary=True
     )
     
     return first_msgs + [summary_msg] + last_msgs
@@ -223,6 +350,15 @@ def compress_old_conversations(messages: List[ConversationMessage], max_turns: i
 # UTILITÁRIOS DE VALIDAÇÃO E SANITIZAÇÃO
 # ============================================================================
 
+# Tabelas de tradução (ASCII) que removem caracteres não permitidos
+_AGENT_NAME_DELETE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c) in '_-')
+))
+_SESSION_ID_DELETE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c) in '_-.')
+))
+
+
 def sanitize_agent_name(agent_name: str) -> str:
     """
     Sanitiza nome do agente para uso seguro.
@@ -234,7 +370,10 @@ def sanitize_agent_name(agent_name: str) -> str:
         Nome sanitizado
     """
     # Remove caracteres especiais e limita tamanho
-    sanitized = ''.join(c for c in agent_name if c.isalnum() or c in ['_', '-'])
+    if agent_name.isascii():
+        sanitized = agent_name.translate(_AGENT_NAME_DELETE)
+    else:
+        sanitized = ''.join(c for c in agent_name if c.isalnum() or c in ['_', '-'])
     return sanitized[:100].lower()
 
 
@@ -249,7 +388,10 @@ def sanitize_session_id(session_id: str) -> str:
         Session ID sanitizado
     """
     # Remove caracteres especiais exceto alguns permitidos
-    sanitized = ''.join(c for c in session_id if c.isalnum() or c in ['_', '-', '.'])
+    if session_id.isascii():
+        sanitized = session_id.translate(_SESSION_ID_DELETE)
+    else:
+        sanitized = ''.join(c for c in session_id if c.isalnum() or c in ['_', '-', '.'])
     return sanitized[:255]
 
 
@@ -266,16 +408,14 @@ def validate_context_data(context_data: Dict[str, Any]) -> Tuple[bool, Optional[
     if not isinstance(context_data, dict):
         return False, "Context data deve ser um dicionário"
     
-    # Verifica tamanho
-    size = calculate_data_size(context_data)
-    if size > MemoryConfig.MAX_CONTEXT_SIZE_BYTES:
-        return False, f"Context data muito grande: {size} bytes (máximo: {MemoryConfig.MAX_CONTEXT_SIZE_BYTES})"
-    
-    # Verifica se é serializável
+    # Verifica tamanho (interrompe a contagem ao passar do limite); a
+    # contagem aplica as regras de tipo do json, então também valida a serialização
     try:
-        json.dumps(context_data)
+        size = calculate_data_size(context_data, limit=MemoryConfig.MAX_CONTEXT_SIZE_BYTES)
     except (TypeError, ValueError) as e:
         return False, f"Context data não é serializável: {str(e)}"
+    if size > MemoryConfig.MAX_CONTEXT_SIZE_BYTES:
+        return False, f"Context data muito grande: {size} bytes (máximo: {MemoryConfig.MAX_CONTEXT_SIZE_BYTES})"
     
     return True, None
 
@@ -419,6 +559,77 @@ def calculate_cosine_similarity(embedding1: List[float], embedding2: List[float]
     return max(0.0, min(1.0, dot_product / (magnitude1 * magnitude2)))
 
 
+def calculate_embedding_ranges(calibration_embeddings: List[List[float]]) -> np.ndarray:
+    """
+    Calcula faixas (mín, máx) por dimensão para quantização int8.
+    
+    Args:
+        calibration_embeddings: Embeddings representativos para calibração
+        
+    Returns:
+        Array (2, dimensão) com mínimos e máximos por dimensão
+    """
+    calibration = np.asarray(calibration_embeddings, dtype=np.float32)
+    return np.stack([calibration.min(axis=0), calibration.max(axis=0)])
+
+
+def quantize_embedding(embedding: List[float], precision: str = "int8",
+                       ranges: Optional[np.ndarray] = None) -> Tuple[bytes, Optional[np.ndarray]]:
+    """
+    Quantiza embedding float32 para float16 ou int8 (escalar, 256 níveis).
+    
+    Args:
+        embedding: Valores do embedding
+        precision: "float16" ou "int8"
+        ranges: Faixas (mín, máx) calibradas; se None usa mín/máx do próprio vetor
+        
+    Returns:
+        Tuple (bytes quantizados, faixas usadas na quantização int8)
+    """
+    values = np.asarray(embedding, dtype=np.float32)
+    
+    if precision == "float16":
+        return values.astype(np.float16).tobytes(), None
+    if precision != "int8":
+        raise ValueError(f"Precisão de quantização não suportada: {precision}")
+    
+    if ranges is None:
+        ranges = np.array([values.min(), values.max()], dtype=np.float32)
+    
+    starts = np.asarray(ranges[0], dtype=np.float32)
+    steps = (np.asarray(ranges[1], dtype=np.float32) - starts) / 255
+    steps = np.where(steps == 0, 1.0, steps)
+    
+    codes = np.clip(np.round((values - starts) / steps) - 128, -128, 127).astype(np.int8)
+    return codes.tobytes(), ranges
+
+
+def dequantize_embedding(data: bytes, precision: str,
+                         ranges: Optional[np.ndarray] = None) -> List[float]:
+    """
+    Reconstrói embedding float a partir dos bytes quantizados.
+    
+    Args:
+        data: Bytes gerados por quantize_embedding
+        precision: "float16" ou "int8"
+        ranges: Faixas (mín, máx) usadas na quantização int8
+        
+    Returns:
+        Embedding aproximado em float
+    """
+    if precision == "float16":
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+    if precision != "int8":
+        raise ValueError(f"Precisão de quantização não suportada: {precision}")
+    
+    starts = np.asarray(ranges[0], dtype=np.float32)
+    steps = (np.asarray(ranges[1], dtype=np.float32) - starts) / 255
+    steps = np.where(steps == 0, 1.0, steps)
+    
+    codes = np.frombuffer(data, dtype=np.int8).astype(np.float32)
+    return ((codes + 128) * steps + starts).tolist()
+
+
 # ============================================================================
 # UTILITÁRIOS DE PERFORMANCE E MONITORAMENTO
 # ============================================================================
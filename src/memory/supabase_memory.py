@@ -6,7 +6,12 @@ Supabase (PostgreSQL + pgvector) como backend para armazenamento
 persistente da memória dos agentes multiagente.
 """
 
+import asyncio
+import atexit
+import contextlib
 import json
+import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
@@ -37,6 +42,161 @@ from .memory_utils import (
 )
 
 
+# Buffers com linhas possivelmente pendentes, persistidos na saída do processo
+_open_buffers: "weakref.WeakSet[AsyncInsertBuffer]" = weakref.WeakSet()
+
+
+def _flush_open_buffers() -> None:
+    """Grava, na saída do interpretador, as linhas que nenhum flush enviou."""
+    for buffer in list(_open_buffers):
+        if not len(buffer):
+            continue
+        try:
+            asyncio.run(buffer.flush())
+        except Exception as e:
+            buffer.logger.error(f"Linhas de {buffer.table} perdidas na saída do processo: {e}")
+
+
+atexit.register(_flush_open_buffers)
+
+
+class AsyncInsertBuffer:
+    """
+    Buffer de inserções para uma tabela Supabase.
+    
+    Acumula linhas e as envia em um único INSERT multi-linha quando atinge
+    o tamanho máximo do lote, o limite de bytes estimado ou o intervalo de
+    flush (tarefa em background no event loop do append mais recente).
+    O que ainda estiver pendente quando o loop termina (ex.: fim de
+    ``asyncio.run``) é enviado no próximo append, em flush()/close() ou na
+    saída do processo.
+    
+    Um INSERT que falha é repetido até max_retries vezes; se todas as
+    tentativas falharem, as linhas voltam para o início do buffer (nada é
+    descartado) e o erro é propagado ao chamador de flush().
+    """
+    
+    def __init__(self, table: str, max_batch_size: int = 500,
+                 max_batch_bytes: int = 10_000_000, flush_interval: float = 1.0,
+                 max_retries: int = 3, retry_delay: float = 0.5,
+                 logger=None):
+        """
+        Inicializa o buffer.
+        
+        Args:
+            table: Nome da tabela de destino
+            max_batch_size: Máximo de linhas por INSERT
+            max_batch_bytes: Tamanho estimado máximo do payload por INSERT
+            flush_interval: Intervalo (s) do flush periódico
+            max_retries: Tentativas do INSERT por flush
+            retry_delay: Espera base (s) entre tentativas, multiplicada pela tentativa
+            logger: Logger para erros de flush
+        """
+        self.table = table
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval = flush_interval
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.logger = logger or get_logger(f"memory.buffer.{table}")
+        self._rows: List[Dict[str, Any]] = []
+        self._pending_bytes = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        # Incrementado por clear(): flushes em andamento não devolvem linhas descartadas
+        self._generation = 0
+        _open_buffers.add(self)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    async def append(self, row: Dict[str, Any]) -> None:
+        """Adiciona uma linha, disparando flush se algum limite for atingido."""
+        self._rows.append(row)
+        # Estimativa barata: conteúdo textual + overhead fixo das demais colunas
+        self._pending_bytes += len(row.get('content') or '') + 512
+        
+        # Recria a tarefa se ela terminou ou pertence a um loop já encerrado
+        loop = asyncio.get_running_loop()
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_periodically())
+        
+        if len(self._rows) >= self.max_batch_size or self._pending_bytes >= self.max_batch_bytes:
+            await self.flush()
+    
+    async def flush(self) -> List[Dict[str, Any]]:
+        """
+        Envia as linhas pendentes em um único INSERT.
+        
+        Returns:
+            Linhas retornadas pelo Supabase
+            
+        Raises:
+            Exception: Erro da última tentativa, com as linhas devolvidas ao buffer
+        """
+        if not self._rows:
+            return []
+        
+        rows, self._rows = self._rows, []
+        pending_bytes, self._pending_bytes = self._pending_bytes, 0
+        generation = self._generation
+        enviado = False
+        
+        try:
+            for tentativa in range(1, self.max_retries + 1):
+                try:
+                    result = supabase.table(self.table).insert(rows).execute()
+                    enviado = True
+                    self.logger.debug(f"Flush de {len(rows)} linhas em {self.table}")
+                    return result.data or []
+                except Exception as e:
+                    erro = e
+                    if tentativa < self.max_retries:
+                        self.logger.warning(f"Falha no flush de {len(rows)} linhas em {self.table} "
+                                            f"(tentativa {tentativa}/{self.max_retries}): {e}")
+                        await asyncio.sleep(self.retry_delay * tentativa)
+            
+            self.logger.error(f"Erro no flush de {len(rows)} linhas em {self.table} após "
+                              f"{self.max_retries} tentativas (mantidas no buffer): {erro}")
+            raise erro
+        finally:
+            # Falha ou cancelamento: devolve as linhas à frente das que chegaram
+            # durante as tentativas, exceto se o buffer foi descartado com clear()
+            if not enviado and generation == self._generation:
+                self._rows[:0] = rows
+                self._pending_bytes += pending_bytes
+    
+    async def close(self) -> None:
+        """Cancela o flush periódico e envia o que restar."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            # Aguarda o cancelamento para que um flush interrompido devolva suas linhas
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+    
+    def clear(self) -> None:
+        """Descarta linhas pendentes e o flush periódico, sem gravar."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        self._generation += 1
+        self._rows = []
+        self._pending_bytes = 0
+    
+    async def _flush_periodically(self) -> None:
+        """Flush periódico enquanto houver linhas pendentes."""
+        while self._rows:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # Erro já registrado em flush() e linhas de volta no buffer:
+                # encerra o ciclo; o próximo append, flush() ou close() tenta de novo
+                return
+
+
 class SupabaseMemoryManager(BaseMemoryManager):
     """
     Gerenciador de memória usando Supabase como backend.
@@ -60,6 +220,14 @@ class SupabaseMemoryManager(BaseMemoryManager):
             self.logger.warning("Credenciais Supabase não configuradas")
             raise ValueError("SUPABASE_URL e SUPABASE_KEY devem estar configurados")
         
+        # Escritas de conversação em lote e turnos calculados localmente
+        # (um único escritor por sessão; ver save_conversation)
+        self._conversation_buffer = AsyncInsertBuffer('agent_conversations', logger=self.logger)
+        self._conversation_turns: Dict[UUID, int] = {}
+        
+        # Cache session_id -> (UUID, expiração monotônica); UUIDs são imutáveis
+        self._session_uuid_cache: Dict[str, Tuple[UUID, float]] = {}
+        
         self.logger.info(f"SupabaseMemoryManager inicializado para agente: {self.agent_name}")
     
     # ========================================================================
@@ -98,6 +266,7 @@ class SupabaseMemoryManager(BaseMemoryManager):
             
             if result.data:
                 session_info = self._parse_session_data(result.data[0])
+                self._cache_session_uuid(session_id, session_info.id)
                 self.logger.info(f"Sessão criada: {session_id}")
                 return session_info
             else:
@@ -160,10 +329,16 @@ class SupabaseMemoryManager(BaseMemoryManager):
                     update_data[field_mapping[key]] = value
         
         try:
+            # Encerramento da sessão: grava antes as mensagens ainda no buffer
+            if update_data.get('status', SessionStatus.ACTIVE.value) != SessionStatus.ACTIVE.value:
+                await self.flush()
+            
             result = supabase.table('agent_sessions').update(update_data).eq('session_id', session_id).execute()
             
             success = bool(result.data)
             if success:
+                if update_data.get('status', SessionStatus.ACTIVE.value) != SessionStatus.ACTIVE.value:
+                    self._session_uuid_cache.pop(session_id, None)
                 self.logger.debug(f"Sessão atualizada: {session_id}")
             else:
                 self.logger.warning(f"Sessão não encontrada para atualização: {session_id}")
@@ -179,6 +354,16 @@ class SupabaseMemoryManager(BaseMemoryManager):
         """
         Salva uma mensagem de conversação.
         
+        A mensagem entra no buffer de inserções e é persistida no próximo
+        flush em lote (periódico, ao encerrar a sessão via update_session,
+        em flush()/close() ou na saída do processo); falhas de gravação
+        aparecem em flush()/close().
+        
+        O turno é numerado localmente: o banco é consultado apenas na primeira
+        mensagem da sessão neste gerenciador. Assume-se um único escritor por
+        sessão; para passar a sessão a outro gerenciador, faça flush() aqui e
+        o outro retomará a numeração a partir do maior turno gravado.
+        
         Args:
             session_id: ID da sessão
             message_type: Tipo da mensagem
@@ -193,39 +378,73 @@ class SupabaseMemoryManager(BaseMemoryManager):
         if not session_uuid:
             raise ValueError(f"Sessão não encontrada: {session_id}")
         
-        # Busca próximo turn number
-        conversation_turn = await self._get_next_conversation_turn(session_uuid)
+        # Próximo turno: consulta o banco apenas na primeira mensagem da sessão
+        if session_uuid not in self._conversation_turns:
+            self._conversation_turns[session_uuid] = await self._get_next_conversation_turn(session_uuid)
+        conversation_turn = self._conversation_turns[session_uuid]
+        self._conversation_turns[session_uuid] += 1
+        
+        message = ConversationMessage(
+            session_id=session_uuid,
+            agent_name=self.agent_name,
+            conversation_turn=conversation_turn,
+            message_type=message_type,
+            content=content,
+            content_format=ContentFormat(kwargs.get('content_format', ContentFormat.TEXT.value)),
+            processing_time_ms=kwargs.get('processing_time_ms'),
+            token_count=kwargs.get('token_count'),
+            model_used=kwargs.get('model_used'),
+            confidence_score=kwargs.get('confidence_score'),
+            metadata=kwargs.get('metadata', {})
+        )
         
         # Prepara dados da mensagem
         message_data = {
+            'id': str(message.id),
             'session_id': str(session_uuid),
             'agent_name': self.agent_name,
             'conversation_turn': conversation_turn,
             'message_type': message_type.value,
             'content': content,
-            'content_format': kwargs.get('content_format', ContentFormat.TEXT.value),
-            'processing_time_ms': kwargs.get('processing_time_ms'),
-            'token_count': kwargs.get('token_count'),
-            'model_used': kwargs.get('model_used'),
-            'confidence_score': kwargs.get('confidence_score'),
-            'metadata': kwargs.get('metadata', {}),
-            'timestamp': datetime.now().isoformat()
+            'content_format': message.content_format.value,
+            'processing_time_ms': message.processing_time_ms,
+            'token_count': message.token_count,
+            'model_used': message.model_used,
+            'confidence_score': message.confidence_score,
+            'metadata': message.metadata,
+            'timestamp': message.timestamp.isoformat()
         }
         
         try:
-            result = supabase.table('agent_conversations').insert(message_data).execute()
-            
-            if result.data:
-                message = self._parse_conversation_data(result.data[0])
-                self.logger.debug(f"Mensagem salva: {message_type.value} - turn {conversation_turn}")
-                return message
-            else:
-                raise Exception("Falha ao salvar mensagem - sem dados retornados")
+            await self._conversation_buffer.append(message_data)
+            self.logger.debug(f"Mensagem enfileirada: {message_type.value} - turn {conversation_turn}")
+            return message
                 
         except Exception as e:
             self.logger.error(f"Erro ao salvar mensagem: {e}")
             raise
     
+    async def flush(self) -> None:
+        """Persiste as mensagens de conversação pendentes no buffer."""
+        await self._conversation_buffer.flush()
+    
+    async def close(self) -> None:
+        """Encerra o flush periódico e persiste o que estiver pendente."""
+        await self._conversation_buffer.close()
+    
+    def reset_state(self) -> None:
+        """
+        Limpa o estado em memória do gerenciador para reutilizá-lo.
+        
+        Descarta mensagens ainda não persistidas, contadores de turno e o
+        cache de UUIDs de sessão, preservando a instância (e o cliente
+        Supabase compartilhado) em vez de reconstruí-la.
+        """
+        self._conversation_buffer.clear()
+        self._conversation_turns.clear()
+        self._session_uuid_cache.clear()
+        self._current_session_id = None
+    
     async def get_conversation_history(self, session_id: str,
                                      limit: Optional[int] = None,
                                      since: Optional[datetime] = None) -> List[ConversationMessage]:
@@ -245,6 +464,9 @@ class SupabaseMemoryManager(BaseMemoryManager):
             return []
         
         try:
+            # Garante leitura das mensagens ainda no buffer
+            await self.flush()
+            
             query = supabase.table('agent_conversations').select('*').eq('session_id', str(session_uuid)).order('conversation_turn')
             
             if since:
@@ -292,7 +514,8 @@ class SupabaseMemoryManager(BaseMemoryManager):
         # Calcula tamanho dos dados
         data_size = calculate_data_size(context_data)
         
-        # Prepara dados do contexto
+        # Prepara dados do contexto (timestamps com precisão de microssegundos)
+        now = datetime.now().isoformat()
         context_record = {
             'session_id': str(session_uuid),
             'agent_name': self.agent_name,
@@ -303,9 +526,9 @@ class SupabaseMemoryManager(BaseMemoryManager):
             'priority': kwargs.get('priority', MemoryConfig.DEFAULT_CONTEXT_PRIORITY),
             'expires_at': kwargs.get('expires_at').isoformat() if kwargs.get('expires_at') else None,
             'metadata': kwargs.get('metadata', {}),
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
-            'last_accessed_at': datetime.now().isoformat()
+            'created_at': now,
+            'updated_at': now,
+            'last_accessed_at': now
         }
         
         try:
@@ -456,7 +679,9 @@ class SupabaseMemoryManager(BaseMemoryManager):
         Returns:
             True se salvo com sucesso
         """
-        if len(embedding.embedding) != MemoryConfig.EMBEDDING_DIMENSION:
+        # Coluna vector(1536) do pgvector exige float: dequantiza na fronteira
+        vector = embedding.get_embedding()
+        if len(vector) != MemoryConfig.EMBEDDING_DIMENSION:
             raise ValueError(f"Embedding deve ter {MemoryConfig.EMBEDDING_DIMENSION} dimensões")
         
         # Prepara dados do embedding
@@ -467,7 +692,7 @@ class SupabaseMemoryManager(BaseMemoryManager):
             'context_id': str(embedding.context_id) if embedding.context_id else None,
             'embedding_type': embedding.embedding_type.value,
             'source_text': embedding.source_text,
-            'embedding': embedding.embedding,
+            'embedding': vector,
             'similarity_threshold': embedding.similarity_threshold,
             'created_at': embedding.created_at.isoformat(),
             'metadata': embedding.metadata
@@ -580,12 +805,18 @@ class SupabaseMemoryManager(BaseMemoryManager):
     # ========================================================================
     
     async def _get_session_uuid(self, session_id: str) -> Optional[UUID]:
-        """Recupera UUID da sessão pelo session_id."""
+        """Recupera UUID da sessão pelo session_id (com cache TTL em memória)."""
+        cached = self._session_uuid_cache.get(session_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
         try:
             result = supabase.table('agent_sessions').select('id').eq('session_id', session_id).execute()
             
             if result.data:
-                return UUID(result.data[0]['id'])
+                session_uuid = UUID(result.data[0]['id'])
+                self._cache_session_uuid(session_id, session_uuid)
+                return session_uuid
             else:
                 return None
                 
@@ -593,6 +824,15 @@ class SupabaseMemoryManager(BaseMemoryManager):
             self.logger.error(f"Erro ao buscar UUID da sessão {session_id}: {e}")
             return None
     
+    def _cache_session_uuid(self, session_id: str, session_uuid: UUID) -> None:
+        """Armazena UUID da sessão no cache, descartando a entrada mais antiga se cheio."""
+        self._session_uuid_cache.pop(session_id, None)
+        if len(self._session_uuid_cache) >= MemoryConfig.SESSION_UUID_CACHE_MAX_SIZE:
+            self._session_uuid_cache.pop(next(iter(self._session_uuid_cache)))
+        
+        expires = time.monotonic() + MemoryConfig.SESSION_UUID_CACHE_TTL_SECONDS
+        self._session_uuid_cache[session_id] = (session_uuid, expires)
+    
     async def _get_next_conversation_turn(self, session_uuid: UUID) -> int:
         """Calcula próximo número de turno na conversação."""
         try:
@@ -23,6 +23,18 @@ LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 SONAR_API_KEY: str | None = os.getenv("SONAR_API_KEY")
 SONAR_API_BASE: str = os.getenv("SONAR_API_BASE", "https://api.perplexity.ai")
 SONAR_DEFAULT_MODEL: str = os.getenv("SONAR_DEFAULT_MODEL", "sonar-pro")
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+LLM_CACHE_SEMANTIC: bool = os.getenv("LLM_CACHE_SEMANTIC", "false").lower() in ("1", "true", "yes")
+REDIS_URL: str | None = os.getenv("REDIS_URL")
+EMBEDDING_QUANTIZED: bool = os.getenv("EMBEDDING_QUANTIZED", "false").lower() in ("1", "true", "yes")
+EMBEDDING_ONNX_FILE: str = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+# Caminhos relativos são resolvidos a partir da raiz do projeto, não do diretório de execução
+EMBEDDING_CACHE_PATH: str = str(Path(__file__).resolve().parents[1] / os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite"))
+EMBEDDING_CACHE_MAX_VECTORS: int = int(os.getenv("EMBEDDING_CACHE_MAX_VECTORS", "100000"))
+RAG_SEARCH_CACHE_TTL_SECONDS: float = float(os.getenv("RAG_SEARCH_CACHE_TTL_SECONDS", "300"))
+CSV_PYARROW_ENGINE: bool = os.getenv("CSV_PYARROW_ENGINE", "false").lower() in ("1", "true", "yes")
 
 # Validações leves (opcionalmente tornar estritas em produção)
 REQUIRED_ON_RUNTIME = [
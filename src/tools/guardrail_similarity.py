@@ -0,0 +1,63 @@
+"""Índice de similaridade semântica para os guardrails.
+
+Compara a resposta do LLM com um conjunto de respostas canônicas por
+similaridade cosseno. Os embeddings canônicos são calculados uma vez,
+normalizados e empilhados em uma matriz float32 (N, d): cada consulta é um
+único produto matriz-vetor, como uma busca exata por produto interno
+(IndexFlatIP), sem laços em Python.
+
+Uso:
+    from src.embeddings.generator import EmbeddingGenerator
+
+    index = FastGuardrailIndex(["Todas as 31 colunas são numéricas"], EmbeddingGenerator())
+    canonical, score = index.best_match(response_content)
+"""
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.embeddings.generator import EmbeddingGenerator
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Normaliza cada linha para norma 1 (linhas nulas permanecem nulas)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class FastGuardrailIndex:
+    """Respostas canônicas pré-codificadas para validação semântica."""
+
+    def __init__(self, canonicals: Sequence[str], embedder: EmbeddingGenerator):
+        """
+        Args:
+            canonicals: Respostas de referência (não vazias)
+            embedder: Gerador usado para os textos canônicos e as consultas
+        """
+        if not canonicals:
+            raise ValueError("É necessário ao menos uma resposta canônica")
+        self.canonicals: List[str] = list(canonicals)
+        self.embedder = embedder
+        results = embedder.generate_embeddings_for_texts(self.canonicals)
+        vectors = np.asarray([result.embedding for result in results], dtype=np.float32)
+        self.vecs = _normalize_rows(vectors)
+
+    def score(self, query_vec: Sequence[float]) -> np.ndarray:
+        """Similaridade cosseno entre o vetor da consulta e cada resposta canônica."""
+        query = np.asarray(query_vec, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return np.zeros(len(self.canonicals), dtype=np.float32)
+        return self.vecs @ (query / norm)
+
+    def score_text(self, text: str) -> np.ndarray:
+        """Codifica o texto e retorna sua similaridade com cada resposta canônica."""
+        return self.score(self.embedder.generate_embedding(text).embedding)
+
+    def best_match(self, text: str) -> Tuple[str, float]:
+        """Retorna a resposta canônica mais próxima do texto e sua similaridade."""
+        similarities = self.score_text(text)
+        best = int(np.argmax(similarities))
+        return self.canonicals[best], float(similarities[best])
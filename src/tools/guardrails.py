@@ -11,8 +11,8 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(root_dir))
 
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass, field
 import re
 import math
 
@@ -26,6 +26,45 @@ class ValidationResult:
     issues: List[str]
     corrected_values: Optional[Dict[str, Any]] = None
 
+@dataclass(frozen=True, slots=True)
+class TiposDados:
+    """Contagem de colunas por tipo nos dados reais"""
+    total_numericos: Optional[int] = None
+    total_categoricos: Optional[int] = 0
+
+@dataclass(frozen=True, slots=True)
+class CsvAnalysis:
+    """Dados reais usados pelos guardrails, com acesso por atributo.
+    
+    Construído uma vez por validação a partir do dicionário
+    ``context['csv_analysis']``; campos ausentes ficam como None (ou vazios)
+    e a validação correspondente é ignorada.
+    """
+    total_records: Optional[int] = None
+    total_columns: Optional[int] = None
+    tipos_dados: Optional[TiposDados] = None
+    estatisticas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    distribuicao: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> "CsvAnalysis":
+        """Converte o dicionário csv_analysis (ou texto descritivo, sem números) em CsvAnalysis"""
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, Mapping):
+            return cls()
+        tipos = data.get('tipos_dados')
+        return cls(
+            total_records=data.get('total_records'),
+            total_columns=data.get('total_columns'),
+            tipos_dados=TiposDados(
+                total_numericos=tipos.get('total_numericos'),
+                total_categoricos=tipos.get('total_categoricos', 0),
+            ) if tipos is not None else None,
+            estatisticas=data.get('estatisticas') or {},
+            distribuicao=data.get('distribuicao') or {},
+        )
+
 class StatisticsGuardrails:
     """Sistema de guardrails para validação de estatísticas.
     
@@ -57,12 +96,14 @@ class StatisticsGuardrails:
             }
         }
     
-    def validate_response(self, response_content: str, context: Dict[str, Any] = None) -> ValidationResult:
+    def validate_response(self, response_content: str,
+                          context: Union[CsvAnalysis, Dict[str, Any], None] = None) -> ValidationResult:
         """Valida resposta do LLM para detectar alucinações GENÉRICAS.
         
         Args:
             response_content: Conteúdo da resposta do LLM
-            context: Contexto adicional com dados conhecidos (ESSENCIAL)
+            context: Dados reais (CsvAnalysis) ou contexto com a chave
+                'csv_analysis' (ESSENCIAL)
             
         Returns:
             Resultado da validação com issues detectados
@@ -73,8 +114,11 @@ class StatisticsGuardrails:
         
         try:
             # VALIDAÇÃO GENÉRICA baseada no CONTEXTO real fornecido
-            if context and 'csv_analysis' in context:
+            if isinstance(context, CsvAnalysis):
                 return self._validate_against_real_data(response_content, context)
+            elif context and 'csv_analysis' in context:
+                real_data = CsvAnalysis.from_dict(context['csv_analysis'])
+                return self._validate_against_real_data(response_content, real_data)
             else:
                 # Se não tem contexto, fazer validação básica de consistência
                 return self._validate_basic_consistency(response_content)
@@ -87,25 +131,22 @@ class StatisticsGuardrails:
                 issues=[f"Erro na validação: {str(e)}"]
             )
     
-    def _validate_against_real_data(self, content: str, context: Dict[str, Any]) -> ValidationResult:
+    def _validate_against_real_data(self, content: str, real_data: CsvAnalysis) -> ValidationResult:
         """Valida resposta comparando com dados REAIS do contexto.
         
         Args:
             content: Conteúdo da resposta do LLM
-            context: Contexto com dados reais calculados
+            real_data: Dados reais calculados
         """
         issues = []
         confidence_score = 1.0
         corrected_values = {}
         
         # 🛡️ GUARDRAIL: Validar que a resposta utiliza informações dos chunks
-        if not self._validates_semantic_interpretation(content, context):
+        if not self._validates_semantic_interpretation(content, real_data):
             issues.append("⚠️ Resposta não demonstra interpretação semântica adequada dos chunks fornecidos")
             confidence_score -= 0.3
         
-        # Extrair dados reais do contexto
-        real_data = context.get('csv_analysis', {})
-        
         # 1. Validar contagens básicas
         self._validate_basic_counts(content, real_data, issues, corrected_values)
         
@@ -129,13 +170,13 @@ class StatisticsGuardrails:
             corrected_values=corrected_values
         )
     
-    def _validate_basic_counts(self, content: str, real_data: Dict, issues: list, corrected_values: Dict):
+    def _validate_basic_counts(self, content: str, real_data: CsvAnalysis, issues: list, corrected_values: Dict):
         """Valida contagens básicas (registros, colunas) com dados reais"""
         import re
         
         # Validar total de registros
-        if 'total_records' in real_data:
-            real_records = real_data['total_records']
+        if real_data.total_records is not None:
+            real_records = real_data.total_records
             
             # Buscar números de registros na resposta
             record_patterns = [
@@ -153,8 +194,8 @@ class StatisticsGuardrails:
                         corrected_values['total_records'] = real_records
         
         # Validar total de colunas
-        if 'total_columns' in real_data:
-            real_columns = real_data['total_columns']
+        if real_data.total_columns is not None:
+            real_columns = real_data.total_columns
             
             column_patterns = [
                 r'(\d+)\s*colunas',
@@ -170,13 +211,13 @@ class StatisticsGuardrails:
                         issues.append(f"Colunas incorretas: {claimed_columns} (real: {real_columns})")
                         corrected_values['total_columns'] = real_columns
     
-    def _validate_data_types(self, content: str, real_data: Dict, issues: list, corrected_values: Dict):
+    def _validate_data_types(self, content: str, real_data: CsvAnalysis, issues: list, corrected_values: Dict):
         """Valida tipos de dados com dados reais"""
-        if 'tipos_dados' in real_data:
-            tipos_reais = real_data['tipos_dados']
+        if real_data.tipos_dados is not None:
+            tipos_reais = real_data.tipos_dados
             
             # Se todos são numéricos, não deveria mencionar categóricas
-            if tipos_reais.get('total_categoricos', 0) == 0:
+            if tipos_reais.total_categoricos == 0:
                 categorical_mentions = [
                     'categóric', 'categoric', 'texto', 'string', 'object'
                 ]
@@ -187,8 +228,8 @@ class StatisticsGuardrails:
                         corrected_values['categorical_error'] = "Todas as colunas são numéricas"
             
             # Verificar contagem de tipos
-            if tipos_reais.get('total_numericos'):
-                real_numeric = tipos_reais['total_numericos']
+            if tipos_reais.total_numericos:
+                real_numeric = tipos_reais.total_numericos
                 import re
                 numeric_pattern = r'(\d+)\s*(?:colunas?\s*)?(?:numéricas?|numéricos?)'
                 matches = re.findall(numeric_pattern, content, re.IGNORECASE)
@@ -199,10 +240,10 @@ class StatisticsGuardrails:
                         issues.append(f"Tipos incorretos: {claimed_numeric} numéricas (real: {real_numeric})")
                         corrected_values['numeric_count'] = real_numeric
     
-    def _validate_statistics(self, content: str, real_data: Dict, issues: list, corrected_values: Dict):
+    def _validate_statistics(self, content: str, real_data: CsvAnalysis, issues: list, corrected_values: Dict):
         """Valida estatísticas numéricas com dados reais"""
-        if 'estatisticas' in real_data:
-            stats_reais = real_data['estatisticas']
+        if real_data.estatisticas:
+            stats_reais = real_data.estatisticas
             
             import re
             
@@ -231,10 +272,10 @@ class StatisticsGuardrails:
                             except ValueError:
                                 continue
     
-    def _validate_distributions(self, content: str, real_data: Dict, issues: list, corrected_values: Dict):
+    def _validate_distributions(self, content: str, real_data: CsvAnalysis, issues: list, corrected_values: Dict):
         """Valida distribuições com dados reais"""
-        if 'distribuicao' in real_data:
-            dist_reais = real_data['distribuicao']
+        if real_data.distribuicao:
+            dist_reais = real_data.distribuicao
             
             import re
             
@@ -242,7 +283,7 @@ class StatisticsGuardrails:
             for col, dist in dist_reais.items():
                 if isinstance(dist, dict):
                     for value, count in dist.items():
-                        total = real_data.get('total_records', 1)
+                        total = real_data.total_records if real_data.total_records is not None else 1
                         real_percentage = (count / total) * 100
                         
                         # Buscar menções de percentuais
@@ -483,12 +524,12 @@ class StatisticsGuardrails:
                 else:
                     prompt += f"- {key}: {value:,}\n"
     
-    def _validates_semantic_interpretation(self, content: str, context: Dict[str, Any]) -> bool:
+    def _validates_semantic_interpretation(self, content: str, real_data: CsvAnalysis) -> bool:
         """Valida se a resposta demonstra interpretação semântica dos chunks.
         
         Args:
             content: Conteúdo da resposta do LLM
-            context: Contexto com dados dos chunks
+            real_data: Dados reais do contexto
             
         Returns:
             True se a resposta demonstra interpretação semântica adequada
@@ -9,7 +9,9 @@ calcular estatísticas precisas dos dados armazenados no Supabase.
 from __future__ import annotations
 import sys
 import os
+import copy
 import inspect
+from collections import OrderedDict
 from pathlib import Path
 
 # Adiciona o diretório raiz do projeto ao PYTHONPATH
@@ -18,7 +20,7 @@ sys.path.insert(0, str(root_dir))
 
 import pandas as pd
 import numpy as np
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import io
 import traceback
@@ -33,10 +35,13 @@ from src.utils.logging_config import get_logger
 try:
     from src.vectorstore.supabase_client import supabase
     SUPABASE_CLIENT_AVAILABLE = True
-except ImportError as e:
+except (ImportError, RuntimeError) as e:
     SUPABASE_CLIENT_AVAILABLE = False
     supabase = None
 
+# Sentinela de _load_embeddings_dataframe: versão ainda não consultada
+_VERSION_NOT_LOADED = object()
+
 
 class UnauthorizedCSVAccessError(Exception):
     """Exceção lançada quando acesso não autorizado a CSV é detectado."""
@@ -69,6 +74,12 @@ class PythonDataAnalyzer:
         self.caller_agent = caller_agent or self._detect_caller_agent()
         
         self._setup_secure_environment()
+        
+        # Cache de estatísticas por (versão da tabela embeddings, query_type)
+        self._stats_cache: "OrderedDict[Tuple[Tuple[Any, ...], str], Dict[str, Any]]" = OrderedDict()
+        self.stats_cache_size = 16
+        # Último DataFrame reconstruído da tabela embeddings e sua versão
+        self._embeddings_df_cache: Optional[Tuple[Tuple[Any, ...], pd.DataFrame]] = None
         self.logger.info(f"PythonDataAnalyzer inicializado por: {self.caller_agent}")
     
     def _detect_caller_agent(self) -> str:
@@ -369,6 +380,32 @@ class PythonDataAnalyzer:
             self.logger.error(f"Erro ao recuperar dados do Supabase: {str(e)}")
             return None
     
+    def _load_embeddings_dataframe(self, version: Any = _VERSION_NOT_LOADED) -> Optional[pd.DataFrame]:
+        """Recupera os dados da tabela embeddings, reaproveitando a última leitura.
+        
+        O DataFrame parseado é memorizado junto com ``_embeddings_version()``
+        (o equivalente ao mtime de um arquivo): enquanto não houver nova
+        ingestão, chamadas seguintes não transferem nem reparseiam os chunks.
+        
+        Args:
+            version: Versão já obtida de ``_embeddings_version()`` pelo chamador
+                (evita consultar a tabela de novo); omitida, é consultada aqui
+        
+        Returns:
+            Cópia do DataFrame reconstruído ou None se falhar
+        """
+        if version is _VERSION_NOT_LOADED:
+            version = self._embeddings_version()
+        cached = self._embeddings_df_cache
+        if version is not None and cached is not None and cached[0] == version:
+            self.logger.info("✅ Dados da tabela embeddings reaproveitados do cache")
+            return cached[1].copy()
+        
+        df = self.get_data_from_embeddings()
+        if df is not None and version is not None:
+            self._embeddings_df_cache = (version, df.copy())
+        return df
+    
     def reconstruct_original_data(self) -> Optional[pd.DataFrame]:
         """Reconstrói dados originais APENAS da tabela embeddings do Supabase.
         
@@ -382,7 +419,7 @@ class PythonDataAnalyzer:
             
             # ÚNICA FONTE DE DADOS: Tabela embeddings do Supabase
             # O método get_data_from_embeddings() já parseia chunk_text automaticamente
-            df = self.get_data_from_embeddings(limit=None, parse_chunk_text=True)
+            df = self._load_embeddings_dataframe()
             
             if df is not None:
                 self.logger.info(f"✅ Dados reconstruídos: {len(df)} registros, {len(df.columns)} colunas (CONFORMIDADE TOTAL)")
@@ -406,7 +443,7 @@ class PythonDataAnalyzer:
         ⚠️ NENHUM FALLBACK PARA CSV - APENAS SUPABASE EMBEDDINGS.
         """
         # APENAS dados da tabela embeddings - SEM EXCEÇÕES
-        embeddings_data = self.get_data_from_embeddings()
+        embeddings_data = self._load_embeddings_dataframe()
         if embeddings_data is not None:
             self.logger.info("✅ Dados recuperados da tabela embeddings (CONFORMIDADE TOTAL)")
             return embeddings_data
@@ -431,7 +468,7 @@ class PythonDataAnalyzer:
         ⚠️ NENHUM FALLBACK PARA CSV - APENAS SUPABASE EMBEDDINGS.
         """
         # APENAS dados da tabela embeddings - SEM EXCEÇÕES - SEM FALLBACK
-        embeddings_data = self.get_data_from_embeddings()
+        embeddings_data = self._load_embeddings_dataframe()
         if embeddings_data is not None:
             self.logger.info(f"✅ Dados de {csv_filename} recuperados via embeddings (CONFORMIDADE TOTAL)")
             return embeddings_data
@@ -444,21 +481,87 @@ class PythonDataAnalyzer:
         )
         return None
     
+    def _embeddings_version(self) -> Optional[Tuple[Any, ...]]:
+        """Retorna uma assinatura barata do conteúdo da tabela embeddings.
+        
+        Equivale a (tamanho, mtime) de um arquivo: número de linhas e
+        ``created_at`` mais recente, obtidos sem transferir os chunks.
+        Inserções e remoções alteram a assinatura e invalidam o cache.
+        
+        Returns:
+            Tupla (count, created_at mais recente) ou None se indisponível
+        """
+        if not SUPABASE_CLIENT_AVAILABLE or not supabase:
+            return None
+        try:
+            result = (
+                supabase.table('embeddings')
+                .select('created_at', count='exact')
+                .order('created_at', desc=True)
+                .limit(1)
+                .execute()
+            )
+            latest = result.data[0].get('created_at') if result.data else None
+            return (result.count, latest)
+        except Exception as e:
+            self.logger.debug(f"Versão da tabela embeddings indisponível: {str(e)}")
+            return None
+    
+    def clear_statistics_cache(self) -> None:
+        """Descarta as estatísticas e os dados memorizados."""
+        self._stats_cache.clear()
+        self._embeddings_df_cache = None
+    
     def calculate_real_statistics(self, query_type: str = "tipos_dados") -> Dict[str, Any]:
         """Calcula estatísticas reais dos dados usando Python.
         
+        O resultado é memorizado pela versão da tabela embeddings: chamadas
+        repetidas sem nova ingestão não recarregam nem reprocessam os chunks.
+        
         Args:
             query_type: Tipo de análise ('tipos_dados', 'estatisticas', 'distribuicao')
             
         Returns:
             Dicionário com estatísticas calculadas
         """
-        try:
-            # Obter dados reais
-            df = self.reconstruct_original_data()
-            if df is None:
-                return {"error": "Não foi possível acessar dados reais"}
+        version = self._embeddings_version()
+        cache_key = (version, query_type) if version is not None else None
+        
+        if cache_key is not None and cache_key in self._stats_cache:
+            self._stats_cache.move_to_end(cache_key)
+            self.logger.info(f"Estatísticas reaproveitadas do cache para: {query_type}")
+            return copy.deepcopy(self._stats_cache[cache_key])
+        
+        result = self._compute_real_statistics(query_type, version)
+        
+        if cache_key is not None and "error" not in result:
+            self._stats_cache[cache_key] = copy.deepcopy(result)
+            if len(self._stats_cache) > self.stats_cache_size:
+                self._stats_cache.popitem(last=False)
+        
+        return result
+    
+    def _compute_real_statistics(self, query_type: str, version: Optional[Tuple[Any, ...]]) -> Dict[str, Any]:
+        """Recupera os dados da tabela embeddings (na ``version`` já consultada) e calcula as estatísticas."""
+        df = self._load_embeddings_dataframe(version)
+        if df is None:
+            return {"error": "Não foi possível acessar dados reais"}
+        return self.calculate_real_statistics_from_df(df, query_type)
+    
+    def calculate_real_statistics_from_df(self, df: pd.DataFrame, query_type: str = "all") -> Dict[str, Any]:
+        """Calcula estatísticas reais de um DataFrame já carregado.
+        
+        Mesma análise de ``calculate_real_statistics``, sem recuperar os dados
+        da tabela embeddings. Colunas ``category`` são tratadas como categóricas.
+        
+        Args:
+            df: DataFrame a analisar
+            query_type: Tipo de análise ('tipos_dados', 'estatisticas', 'distribuicao', 'all')
             
+        Returns:
+            Dicionário com estatísticas calculadas
+        """
+        try:
             self.logger.info(f"Calculando estatísticas reais para: {query_type}")
             
             # SISTEMA GENÉRICO: Analisar qualquer dataset
@@ -535,7 +638,7 @@ class PythonDataAnalyzer:
                     }
                 
                 # Estatísticas para colunas categóricas
-                for col in df.select_dtypes(include=['object']).columns:
+                for col in df.select_dtypes(include=['object', 'category']).columns:
                     try:
                         value_counts = df[col].value_counts()
                         if len(value_counts) <= 20:  # Só mostrar se não há muitas categorias
@@ -556,7 +659,7 @@ class PythonDataAnalyzer:
                 distribuicao = {}
                 
                 # Para cada coluna categórica, calcular distribuição
-                for col in df.select_dtypes(include=['object']).columns:
+                for col in df.select_dtypes(include=['object', 'category']).columns:
                     value_counts = df[col].value_counts()
                     if len(value_counts) <= 10:  # Só para colunas com poucas categorias
                         dist_dict = {}
@@ -589,6 +692,54 @@ class PythonDataAnalyzer:
             self.logger.error(error_msg)
             return {"error": error_msg}
     
+    def calculate_real_statistics_from_csv(self,
+                                           source: Union[str, Path, io.IOBase],
+                                           query_type: str = "all") -> Dict[str, Any]:
+        """Calcula estatísticas reais de um CSV (caminho ou arquivo aberto, ex.: io.BytesIO).
+        
+        ⚠️ CONFORMIDADE: leitura direta de CSV, restrita a agentes autorizados.
+        
+        Para caminhos, o resultado é memorizado por (caminho, mtime, tamanho):
+        chamadas repetidas com o arquivo inalterado não releem o CSV.
+        
+        Args:
+            source: Caminho do CSV ou objeto de arquivo com o conteúdo
+            query_type: Tipo de análise ('tipos_dados', 'estatisticas', 'distribuicao', 'all')
+            
+        Returns:
+            Dicionário com estatísticas calculadas
+        """
+        self._validate_csv_access_authorization()
+        
+        cache_key = None
+        if isinstance(source, (str, Path)):
+            try:
+                stat = os.stat(source)
+                cache_key = (("csv", os.path.abspath(source), stat.st_mtime_ns, stat.st_size), query_type)
+            except OSError:
+                cache_key = None
+        
+        if cache_key is not None and cache_key in self._stats_cache:
+            self._stats_cache.move_to_end(cache_key)
+            self.logger.info(f"Estatísticas do CSV reaproveitadas do cache para: {query_type}")
+            return copy.deepcopy(self._stats_cache[cache_key])
+        
+        try:
+            df = pd.read_csv(source)
+        except Exception as e:
+            error_msg = f"Erro ao ler CSV: {str(e)}"
+            self.logger.error(error_msg)
+            return {"error": error_msg}
+        
+        result = self.calculate_real_statistics_from_df(df, query_type)
+        
+        if cache_key is not None and "error" not in result:
+            self._stats_cache[cache_key] = copy.deepcopy(result)
+            if len(self._stats_cache) > self.stats_cache_size:
+                self._stats_cache.popitem(last=False)
+        
+        return result
+    
     def execute_safe_python(self, code: str, context: Dict[str, Any] = None) -> PythonAnalysisResult:
         """Executa código Python de forma segura.
         
@@ -0,0 +1,166 @@
+"""Textos de exemplo compartilhados pelos testes do sistema RAG.
+
+Os textos são construídos uma única vez por processo (``functools.cache``).
+"""
+import functools
+
+
+@functools.cache
+def sample_text() -> str:
+    """Texto curto sobre fraudes em cartões usado nos testes de chunking."""
+    return """
+        As fraudes em cartões de crédito são um problema crescente. 
+        
+        Os principais indicadores incluem:
+        - Transações em horários incomuns
+        - Mudanças súbitas de localização
+        - Valores muito acima do perfil histórico
+        
+        Para prevenção, recomenda-se:
+        1. Machine Learning para detecção em tempo real
+        2. Análise comportamental contínua
+        3. Autenticação biométrica
+        """
+
+
+@functools.cache
+def sample_documents() -> dict[str, str]:
+    """Documentos de exemplo (fraudes, análise de dados, pandas) para ingestão."""
+    return {
+        "fraudes_cartao": """
+        ## Análise de Fraudes em Cartão de Crédito
+
+        As fraudes em cartões de crédito são um problema crescente no setor financeiro. Os principais indicadores de transações fraudulentas incluem:
+
+        ### Padrões Temporais
+        - Transações realizadas entre 2h e 6h da manhã têm maior probabilidade de fraude
+        - Múltiplas transações em horários incomuns para o cliente
+        - Transações em dias da semana atípicos para o perfil do usuário
+
+        ### Padrões Geográficos  
+        - Transações em localizações distantes da residência habitual
+        - Mudanças súbitas de localização (ex: compra em São Paulo seguida de compra em Miami em poucas horas)
+        - Transações em países com alto índice de fraude
+
+        ### Padrões Comportamentais
+        - Valores muito acima ou muito abaixo do perfil histórico do cliente
+        - Múltiplas tentativas de transação com valores decrescentes
+        - Compras em categorias incomuns para o cliente (ex: cliente que só compra combustível fazendo compras em joalherias)
+
+        ### Indicadores Técnicos
+        - Falha na verificação do código CVV
+        - Tentativas múltiplas com diferentes códigos de segurança
+        - Transações online sem autenticação de dois fatores
+
+        ### Métodos de Prevenção
+        1. Machine Learning para detecção em tempo real
+        2. Análise comportamental contínua
+        3. Autenticação biométrica
+        4. Limite dinâmico baseado em padrões históricos
+        5. Alertas instantâneos para transações suspeitas
+        """,
+        
+        "analise_dados": """
+        ## Metodologias de Análise de Dados
+
+        ### Análise Exploratória de Dados (EDA)
+        A Análise Exploratória de Dados é fundamental para compreender a estrutura e padrões dos dados antes da modelagem.
+
+        #### Técnicas Estatísticas Descritivas
+        - Medidas de tendência central: média, mediana, moda
+        - Medidas de dispersão: desvio padrão, variância, amplitude
+        - Quartis e percentis para identificar outliers
+        - Correlações entre variáveis numéricas
+
+        #### Visualizações Essenciais
+        - Histogramas para distribuições univariadas
+        - Scatter plots para relações bivariadas  
+        - Box plots para identificar outliers
+        - Heat maps para matrizes de correlação
+
+        ### Técnicas de Modelagem
+        #### Modelos Supervisionados
+        - Regressão Linear para previsões numéricas
+        - Logística para classificação binária
+        - Random Forest para problemas complexos
+        - XGBoost para alta performance
+
+        #### Modelos Não-supervisionados
+        - K-means para clustering
+        - PCA para redução de dimensionalidade
+        - DBSCAN para detecção de anomalias
+
+        ### Validação de Modelos
+        - Cross-validation k-fold
+        - Separação treino/validação/teste
+        - Métricas: Accuracy, Precision, Recall, F1-Score
+        - Curvas ROC e AUC para classificação
+        """,
+        
+        "pandas_guia": """
+        ## Guia Prático do Pandas
+
+        ### Carregamento de Dados
+        ```python
+        import pandas as pd
+        
+        # CSV
+        df = pd.read_csv('dados.csv')
+        
+        # Com parâmetros específicos
+        df = pd.read_csv('dados.csv', encoding='utf-8', sep=';', decimal=',')
+        
+        # Excel
+        df = pd.read_excel('planilha.xlsx', sheet_name='Dados')
+        ```
+
+        ### Exploração Inicial
+        ```python
+        # Informações gerais
+        df.info()
+        df.describe()
+        df.head(10)
+        df.tail(5)
+        
+        # Verificar valores faltantes
+        df.isnull().sum()
+        df.isna().any()
+        ```
+
+        ### Limpeza de Dados
+        ```python
+        # Remover valores faltantes
+        df.dropna()  # Remove linhas com qualquer NaN
+        df.dropna(subset=['coluna_importante'])  # Remove apenas se coluna específica for NaN
+        
+        # Preencher valores faltantes
+        df.fillna(0)  # Preenche com zero
+        df.fillna(df.mean())  # Preenche com média
+        df.fillna(method='ffill')  # Forward fill
+        ```
+
+        ### Manipulação de Dados
+        ```python
+        # Filtros
+        df[df['idade'] > 25]
+        df[df['categoria'].isin(['A', 'B'])]
+        df[(df['valor'] > 100) & (df['status'] == 'ativo')]
+        
+        # Agrupamentos
+        df.groupby('categoria').sum()
+        df.groupby(['categoria', 'regiao']).agg({'valor': 'mean', 'quantidade': 'sum'})
+        ```
+
+        ### Transformações
+        ```python
+        # Criar novas colunas
+        df['valor_log'] = np.log(df['valor'])
+        df['eh_alto'] = df['valor'] > df['valor'].quantile(0.8)
+        
+        # Aplicar funções
+        df['categoria_upper'] = df['categoria'].str.upper()
+        df['data_parsed'] = pd.to_datetime(df['data_texto'])
+        ```
+        """
+    }
+
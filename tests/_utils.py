@@ -0,0 +1,13 @@
+"""Utilitários de saída compartilhados pelos scripts de teste."""
+import os
+
+
+def banner(title: str, width: int = 60, char: str = "=", file=None) -> None:
+    """Imprime o título de uma seção seguido de uma linha de separação.
+
+    Não imprime nada se a variável de ambiente PYTEST_QUIET estiver definida.
+    """
+    if os.environ.get("PYTEST_QUIET"):
+        return
+    print(title, file=file)
+    print(char * width, file=file)
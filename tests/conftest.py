@@ -0,0 +1,88 @@
+"""Fixtures compartilhadas pelos testes do projeto."""
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adicionar o diretório raiz ao PYTHONPATH (antes da coleta dos módulos de teste)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-llm-cache",
+        action="store_true",
+        default=False,
+        help="Desativa o cache de respostas do LLM Manager (sempre chama os provedores)",
+    )
+
+
+@pytest.fixture(scope="session")
+def orchestrator():
+    """OrchestratorAgent único por sessão.
+
+    A inicialização (agentes, LLM Manager, clientes) é cara; os testes que
+    precisam de estado limpo chamam ``orchestrator.reset_session()``.
+    """
+    orchestrator_module = pytest.importorskip("src.agent.orchestrator_agent")
+    return orchestrator_module.OrchestratorAgent()
+
+
+@pytest.fixture(scope="session")
+def orchestrator_without_rag():
+    """OrchestratorAgent único por sessão, sem o RAG Agent (não exige Supabase)."""
+    orchestrator_module = pytest.importorskip("src.agent.orchestrator_agent")
+    return orchestrator_module.OrchestratorAgent(enable_rag_agent=False)
+
+
+@pytest.fixture(scope="session")
+def llm_manager(request):
+    """Instância singleton do LLM Manager; pulado se nenhum provedor estiver configurado.
+
+    Os testes usam o cache de respostas mesmo com LLM_CACHE_ENABLED=false
+    (padrão de produção); --no-llm-cache o desativa.
+    """
+    manager_module = pytest.importorskip("src.llm.manager")
+    use_cache = not request.config.getoption("--no-llm-cache")
+    try:
+        manager = manager_module.get_llm_manager(use_cache=use_cache)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+    if not use_cache:
+        manager.cache = None
+    yield manager
+    # Fecha o pool HTTP compartilhado ao fim da sessão
+    manager.close()
+
+
+@pytest.fixture
+def buffered_stdout():
+    """Acumula os prints do teste em memória e os escreve de uma vez ao final.
+
+    Testes de demonstração fazem dezenas de prints; com o buffer a saída
+    capturada recebe uma única escrita (mesmo se o teste falhar).
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            yield buffer
+    finally:
+        sys.stdout.write(buffer.getvalue())
+
+
+@pytest.fixture(scope="session")
+def sample_text():
+    """Texto de exemplo dos testes de chunking (construído uma vez por sessão)."""
+    from tests._fixtures import sample_text as build_sample_text
+    return build_sample_text()
+
+
+@pytest.fixture(scope="session")
+def chunker():
+    """TextChunker compartilhado pelos testes de chunking."""
+    chunker_module = pytest.importorskip("src.embeddings.chunker")
+    return chunker_module.TextChunker(chunk_size=150, overlap_size=30)
@@ -0,0 +1,29 @@
+"""Configuração dos testes do sistema de memória."""
+import asyncio
+import sys
+
+
+def _uvloop_factory():
+    """Loop uvloop (libuv) quando disponível; senão o loop padrão do asyncio."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            return uvloop.new_event_loop()
+        except ImportError:
+            pass
+    return asyncio.new_event_loop()
+
+
+def pytest_asyncio_loop_factories(config, item):
+    """
+    Loops disponíveis para os testes assíncronos deste diretório.
+    
+    Por padrão os testes usam o loop do asyncio; os que selecionam
+    ``@pytest.mark.asyncio(loop_factories=["uvloop"])`` (testes de stress)
+    rodam sobre uvloop, com fallback para o loop padrão no Windows ou sem
+    uvloop instalado.
+    """
+    marker = item.get_closest_marker("asyncio")
+    if marker is not None and "uvloop" in marker.kwargs.get("loop_factories", ()):
+        return {"uvloop": _uvloop_factory}
+    return {"asyncio": asyncio.new_event_loop}
@@ -10,7 +10,8 @@ Este módulo contém testes automatizados para validar:
 
 import pytest
 import asyncio
-from datetime import datetime, timedelta
+import dataclasses
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 from unittest.mock import Mock, patch, AsyncMock
 from typing import Dict, Any, List
@@ -72,6 +73,18 @@ class TestMemoryTypes:
         )
         
         assert not valid_session.is_expired()
+        
+        # Timestamp com fuso horário (formato retornado pelo Supabase)
+        aware_session = SessionInfo(
+            session_id="aware_session",
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+        )
+        
+        assert aware_session.is_expired()
+        
+        # Extensão atualiza o prazo monotônico
+        aware_session.extend_expiry(hours=1)
+        assert not aware_session.is_expired()
     
     def test_conversation_message_creation(self):
         """Testa criação de ConversationMessage."""
@@ -117,6 +130,41 @@ class TestMemoryTypes:
         # Testa acesso
         context.access()
         assert context.access_count == 1
+        assert context.last_accessed_at >= context.created_at
+    
+    def test_monotonic_fields_are_dataclass_fields(self):
+        """Testa que os prazos monotônicos são campos reais (fields/asdict)."""
+        session = SessionInfo(expires_at=datetime.now() + timedelta(hours=1))
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        context = AgentContext(agent_name="test_agent", last_accessed_at=base)
+        
+        session_fields = {f.name for f in dataclasses.fields(SessionInfo)}
+        context_fields = {f.name for f in dataclasses.fields(AgentContext)}
+        assert {"expires_at", "expires_at_ns"} <= session_fields
+        assert {"last_accessed_at", "last_accessed_ns"} <= context_fields
+        assert isinstance(dataclasses.asdict(session)["expires_at"], datetime)
+        assert dataclasses.asdict(context)["last_accessed_at"] == base
+        
+        assert context.last_accessed_at == base
+        context.access()
+        assert context.last_accessed_at >= base
+        assert context.to_dict()["last_accessed_at"] == context.last_accessed_at.isoformat()
+        
+        # Atribuições diretas reancoram os relógios monotônicos
+        context.last_accessed_at = base
+        assert context.last_accessed_at == base
+        session.expires_at = datetime.now() - timedelta(minutes=1)
+        assert session.is_expired()
+    
+    def test_slotted_dataclasses(self):
+        """Testa que mensagens e contextos não alocam __dict__ por instância."""
+        message = ConversationMessage(content="teste")
+        context = AgentContext(agent_name="test_agent")
+        
+        assert not hasattr(message, "__dict__")
+        assert not hasattr(context, "__dict__")
+        with pytest.raises(AttributeError):
+            message.unknown_field = 1
     
     def test_memory_embedding_creation(self):
         """Testa criação de MemoryEmbedding."""
@@ -135,11 +183,48 @@ class TestMemoryTypes:
         assert embedding.source_text == "Como analisar fraudes?"
         assert len(embedding.embedding) == 1536
         assert embedding.similarity_threshold == 0.800
+    
+    def test_memory_embedding_quantization(self):
+        """Testa quantização int8/float16 de MemoryEmbedding."""
+        from src.memory import EmbeddingPrecision
+        
+        values = [0.1, 0.2, 0.3] * 512
+        embedding = MemoryEmbedding(
+            agent_name="test_agent",
+            source_text="Como analisar fraudes?",
+            embedding=list(values)
+        )
+        
+        embedding.quantize(EmbeddingPrecision.INT8)
+        
+        assert embedding.embedding_precision == EmbeddingPrecision.INT8
+        assert embedding.embedding == []
+        assert len(embedding.quantized_embedding) == 1536  # 1 byte por dimensão
+        
+        restored = embedding.get_embedding()
+        assert len(restored) == 1536
+        assert max(abs(a - b) for a, b in zip(restored, values)) < 0.001
+        
+        # float16 preserva os valores com 2 bytes por dimensão
+        half = MemoryEmbedding(embedding=list(values))
+        half.quantize(EmbeddingPrecision.FLOAT16)
+        assert len(half.quantized_embedding) == 1536 * 2
+        assert abs(half.get_embedding()[1] - 0.2) < 0.001
 
 
 class TestMemoryUtils:
     """Testes para utilitários de memória."""
     
+    def test_uuid_pool(self):
+        """Testa geração de UUIDs v4 pelo pool."""
+        from src.memory import UuidPool
+        
+        ids = [UuidPool.get() for _ in range(UuidPool.batch_size * 2 + 1)]
+        
+        assert len(set(ids)) == len(ids)
+        assert all(uid.version == 4 for uid in ids)
+        assert ConversationMessage().id.version == 4
+    
     def test_session_id_generation(self):
         """Testa geração de IDs de sessão."""
         from src.memory.memory_utils import generate_session_id
@@ -175,7 +260,19 @@ class TestMemoryUtils:
         list_data = [1, 2, 3, "test"]
         list_size = calculate_data_size(list_data)
         assert list_size > 0
-    
+
+        # Estruturas medem exatamente o que json.dumps produziria
+        import json
+        escaped = {
+            'aspas': 'ele disse "olá"',
+            'quebra': "linha 1\nlinha 2\t\\fim",
+            'acentos': "ação, coração, 中文 😀",
+            'controle': "\x01\x7f",
+            1: [1.5, float('nan'), None, True, False],
+            None: {'aninhado': ("tupla", -0.0)}
+        }
+        assert calculate_data_size(escaped) == len(json.dumps(escaped))
+
     def test_content_truncation(self):
         """Testa truncamento de conteúdo."""
         from src.memory.memory_utils import truncate_content
@@ -191,6 +288,18 @@ class TestMemoryUtils:
         assert len(truncated) <= 100
         assert "TRUNCADO" in truncated
     
+    def test_content_truncation_bulk(self):
+        """Testa truncamento de conteúdo em lote."""
+        from src.memory.memory_utils import truncate_content, truncate_content_bulk
+        
+        contents = ["Este é um conteúdo curto", "A" * 1000, "B" * 100]
+        truncated = truncate_content_bulk(contents, max_length=100)
+        
+        assert truncated == [truncate_content(c, max_length=100) for c in contents]
+        assert truncated[0] is contents[0]
+        assert "TRUNCADO" in truncated[1]
+        assert len(truncated[1]) <= 100
+    
     def test_validation_functions(self):
         """Testa funções de validação."""
         from src.memory.memory_utils import (
@@ -220,6 +329,14 @@ class TestMemoryUtils:
         assert error is not None
 
 
+@pytest.fixture(scope="session")
+def pooled_memory_manager():
+    """Instância única de SupabaseMemoryManager compartilhada pela sessão de testes."""
+    with patch('src.memory.supabase_memory.SUPABASE_URL', 'test_url'), \
+         patch('src.memory.supabase_memory.SUPABASE_KEY', 'test_key'):
+        return SupabaseMemoryManager("test_agent")
+
+
 @pytest.mark.asyncio
 class TestSupabaseMemoryManager:
     """Testes para SupabaseMemoryManager."""
@@ -231,11 +348,10 @@ class TestSupabaseMemoryManager:
             yield mock
     
     @pytest.fixture
-    def memory_manager(self, mock_supabase):
-        """Instância de SupabaseMemoryManager para testes."""
-        with patch('src.memory.supabase_memory.SUPABASE_URL', 'test_url'), \
-             patch('src.memory.supabase_memory.SUPABASE_KEY', 'test_key'):
-            return SupabaseMemoryManager("test_agent")
+    def memory_manager(self, pooled_memory_manager, mock_supabase):
+        """SupabaseMemoryManager compartilhado, com estado limpo a cada teste."""
+        pooled_memory_manager.reset_state()
+        return pooled_memory_manager
     
     async def test_create_session(self, memory_manager, mock_supabase):
         """Testa criação de sessão."""
@@ -321,24 +437,10 @@ class TestSupabaseMemoryManager:
         mock_turn_response = Mock()
         mock_turn_response.data = [{'conversation_turn': 1}]
         
-        # Mock para inserção da conversação
-        mock_insert_response = Mock()
-        mock_insert_response.data = [{
-            'id': str(uuid4()),
-            'session_id': str(session_uuid),
-            'agent_name': 'test_agent',
-            'conversation_turn': 2,
-            'message_type': 'query',
-            'content': 'Teste de mensagem',
-            'content_format': 'text',
-            'metadata': {},
-            'timestamp': datetime.now().isoformat()
-        }]
-        
         # Configurar mocks
         mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_session_response
         mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value.execute.return_value = mock_turn_response
-        mock_supabase.table.return_value.insert.return_value.execute.return_value = mock_insert_response
+        mock_supabase.table.return_value.insert.return_value.execute.return_value = Mock(data=[])
         
         # Salvar conversação
         message = await memory_manager.save_conversation(
@@ -346,10 +448,98 @@ class TestSupabaseMemoryManager:
             message_type=MessageType.QUERY,
             content="Teste de mensagem"
         )
+        second = await memory_manager.save_conversation(
+            session_id="test_session",
+            message_type=MessageType.RESPONSE,
+            content="Resposta de teste"
+        )
         
         assert message.agent_name == "test_agent"
         assert message.content == "Teste de mensagem"
         assert message.conversation_turn == 2
+        assert second.conversation_turn == 3
+        
+        # Nada é inserido até o flush, que envia um único INSERT multi-linha
+        mock_supabase.table.return_value.insert.assert_not_called()
+        await memory_manager.flush()
+        
+        mock_supabase.table.return_value.insert.assert_called_once()
+        rows = mock_supabase.table.return_value.insert.call_args[0][0]
+        assert [row['conversation_turn'] for row in rows] == [2, 3]
+        assert rows[0]['id'] == str(message.id)
+        
+        # Turno consultado no banco apenas uma vez por sessão
+        assert mock_supabase.table.return_value.select.return_value.eq.return_value.order.call_count == 1
+        
+        await memory_manager.close()
+    
+    async def test_conversation_buffer_keeps_rows_on_failure(self, mock_supabase):
+        """Um INSERT que falha em todas as tentativas devolve as linhas ao buffer."""
+        from src.memory.supabase_memory import AsyncInsertBuffer
+        
+        buffer = AsyncInsertBuffer('agent_conversations', max_retries=2, retry_delay=0)
+        insert = mock_supabase.table.return_value.insert.return_value
+        insert.execute.side_effect = RuntimeError("timeout")
+        
+        await buffer.append({'id': '1', 'content': 'a'})
+        await buffer.append({'id': '2', 'content': 'b'})
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+        
+        assert mock_supabase.table.return_value.insert.call_count == 2
+        assert len(buffer) == 2
+        
+        # Linhas antigas continuam à frente das novas e são enviadas no próximo flush
+        insert.execute.side_effect = None
+        insert.execute.return_value = Mock(data=[])
+        await buffer.append({'id': '3', 'content': 'c'})
+        await buffer.close()
+        
+        rows = mock_supabase.table.return_value.insert.call_args[0][0]
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert len(buffer) == 0
+    
+    async def test_conversation_turn_single_writer_handoff(self, mock_supabase):
+        """Outro gerenciador da mesma sessão continua a numeração após o flush."""
+        session_uuid = uuid4()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = Mock(
+            data=[{'id': str(session_uuid)}]
+        )
+        latest_turn = mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value.execute
+        latest_turn.return_value = Mock(data=[])
+        mock_supabase.table.return_value.insert.return_value.execute.return_value = Mock(data=[])
+        
+        with patch('src.memory.supabase_memory.SUPABASE_URL', 'test_url'), \
+             patch('src.memory.supabase_memory.SUPABASE_KEY', 'test_key'):
+            writer_a = SupabaseMemoryManager("agent_a")
+            writer_b = SupabaseMemoryManager("agent_b")
+        
+        first = await writer_a.save_conversation("shared", MessageType.QUERY, "pergunta")
+        second = await writer_a.save_conversation("shared", MessageType.RESPONSE, "resposta")
+        await writer_a.close()
+        
+        # O servidor passa a conhecer o maior turno gravado por A
+        latest_turn.return_value = Mock(data=[{'conversation_turn': second.conversation_turn}])
+        third = await writer_b.save_conversation("shared", MessageType.QUERY, "outra pergunta")
+        await writer_b.close()
+        
+        assert [first.conversation_turn, second.conversation_turn, third.conversation_turn] == [1, 2, 3]
+    
+    async def test_session_end_flushes_conversation(self, memory_manager, mock_supabase):
+        """Encerrar a sessão grava as mensagens ainda no buffer antes do update."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = Mock(
+            data=[{'id': str(uuid4())}]
+        )
+        mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value.execute.return_value = Mock(data=[])
+        mock_supabase.table.return_value.insert.return_value.execute.return_value = Mock(data=[])
+        mock_supabase.table.return_value.update.return_value.eq.return_value.execute.return_value = Mock(data=[{'id': '1'}])
+        
+        await memory_manager.save_conversation("ending", MessageType.QUERY, "pergunta")
+        assert mock_supabase.table.return_value.insert.call_count == 0
+        
+        assert await memory_manager.update_session("ending", status=SessionStatus.TERMINATED)
+        assert mock_supabase.table.return_value.insert.call_count == 1
+        assert len(memory_manager._conversation_buffer) == 0
     
     async def test_save_context(self, memory_manager, mock_supabase):
         """Testa salvamento de contexto."""
@@ -377,10 +567,8 @@ class TestSupabaseMemoryManager:
         }]
         
         # Configurar mocks
-        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-            mock_session_response,  # Para _get_session_uuid
-            Mock(data=[])           # Para verificar contexto existente
-        ]
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_session_response
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(data=[])
         mock_supabase.table.return_value.insert.return_value.execute.return_value = mock_insert_response
         
         # Salvar contexto
@@ -395,6 +583,9 @@ class TestSupabaseMemoryManager:
         assert context.context_type == ContextType.DATA
         assert context.context_key == "test_data"
         assert context.context_data == {"key": "value"}
+        
+        # UUID da sessão resolvido uma única vez (get_context usa o cache)
+        assert mock_supabase.table.return_value.select.return_value.eq.return_value.execute.call_count == 1
 
 
 @pytest.mark.asyncio 
@@ -516,9 +707,32 @@ class TestMemoryPerformance:
         compressed = compress_old_conversations(messages, max_turns=20)
         
         assert len(compressed) <= 20
-        assert any("SUMÁRIO" in msg.content for msg in compressed)
+        assert any(msg.is_summary for msg in compressed)
+        
+        # Limite pequeno não pode devolver o histórico inteiro
+        compressed_small = compress_old_conversations(messages, max_turns=10)
+        assert len(compressed_small) <= 10
 
 
 if __name__ == "__main__":
     # Executar testes
-    pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
+    pytest.main([__file__, "-v", "--tb=short"])
+
+
+def test_conversation_buffer_outlives_event_loop():
+    """Linhas de um loop já encerrado (fim do asyncio.run) são gravadas depois, inclusive na saída."""
+    from src.memory.supabase_memory import AsyncInsertBuffer, _flush_open_buffers
+    
+    with patch('src.memory.supabase_memory.supabase') as mock_supabase:
+        mock_supabase.table.return_value.insert.return_value.execute.return_value = Mock(data=[])
+        buffer = AsyncInsertBuffer('agent_conversations', flush_interval=60)
+        
+        asyncio.run(buffer.append({'id': '1', 'content': 'a'}))
+        asyncio.run(buffer.append({'id': '2', 'content': 'b'}))
+        assert len(buffer) == 2
+        
+        _flush_open_buffers()
+        
+        rows = mock_supabase.table.return_value.insert.call_args[0][0]
+        assert [row['id'] for row in rows] == ['1', '2']
+        assert len(buffer) == 0
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Script de teste para validar correção do parsing de chunk_text e análise correta de tipos de dados"""
 
+import re
 import sys
 from pathlib import Path
 
@@ -11,7 +12,33 @@ sys.path.insert(0, str(root_dir))
 from src.agent.orchestrator_agent import OrchestratorAgent
 import traceback
 
-def test_data_types_query():
+# Colunas esperadas do CSV de fraudes e palavras que indicam análise da
+# tabela de embeddings (ou de palavras soltas do chunk_text)
+CORRECT_COLUMNS = frozenset(
+    ['time', 'amount', 'class'] + [f'v{i}' for i in range(1, 29)]
+)
+WRONG_MENTIONS = frozenset([
+    'chunk_text', 'created_at', 'embedding', 'originais', 'normais',
+    'sequenciais', 'exemplo', 'temporais',
+])
+_ALL_WORDS = CORRECT_COLUMNS | WRONG_MENTIONS
+
+# Uma única varredura: em cada posição o lookahead captura a palavra mais
+# longa que começa ali; as demais palavras contidas nela (ex.: 'v1' em
+# 'v10') vêm de _SUBWORDS, preservando a semântica de "substring presente"
+_MENTIONS_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(w) for w in sorted(_ALL_WORDS, key=len, reverse=True)) + '))'
+)
+_SUBWORDS = {w: frozenset(v for v in _ALL_WORDS if v in w) for w in _ALL_WORDS}
+
+
+def find_mentions(response: str) -> frozenset:
+    """Retorna as palavras monitoradas presentes (como substring) na resposta"""
+    found = set(_MENTIONS_PATTERN.findall(response.lower()))
+    return frozenset().union(*(_SUBWORDS[w] for w in found))
+
+
+def test_data_types_query(orchestrator):
     """Testa consulta sobre tipos de dados"""
     print("=" * 80)
     print("TESTE: Analise de Tipos de Dados (pos-correcao)")
@@ -19,10 +46,7 @@ def test_data_types_query():
     print()
     
     try:
-        # Inicializar orchestrator
-        print("Inicializando sistema...")
-        orchestrator = OrchestratorAgent("orchestrator")
-        print("Sistema inicializado\n")
+        orchestrator.reset_session()
         
         # Fazer consulta sobre tipos de dados
         query = "Quais são os tipos de dados (numéricos, categóricos)?"
@@ -42,22 +66,15 @@ def test_data_types_query():
             
             # Validar se a resposta está correta
             print("\nVALIDACAO:")
-            correct_columns = ['Time', 'V1', 'V2', 'V3', 'V4', 'V5', 'V6', 'V7', 'V8', 'V9', 
-                             'V10', 'V11', 'V12', 'V13', 'V14', 'V15', 'V16', 'V17', 'V18', 
-                             'V19', 'V20', 'V21', 'V22', 'V23', 'V24', 'V25', 'V26', 'V27', 
-                             'V28', 'Amount', 'Class']
-            
-            response_lower = response.lower()
+            hits = find_mentions(response)
             
             # Verificar se mencionou colunas corretas
-            correct_mentions = sum(1 for col in correct_columns if col.lower() in response_lower)
+            correct_mentions = len(hits & CORRECT_COLUMNS)
             
             # Verificar se NÃO mencionou colunas erradas da tabela embeddings
-            wrong_mentions = ['chunk_text', 'created_at', 'embedding', 'originais', 'normais', 
-                            'sequenciais', 'exemplo', 'temporais']
-            wrong_count = sum(1 for word in wrong_mentions if word in response_lower)
+            wrong_count = len(hits & WRONG_MENTIONS)
             
-            print(f"- Mencoes corretas as colunas do CSV: {correct_mentions}/{len(correct_columns)}")
+            print(f"- Mencoes corretas as colunas do CSV: {correct_mentions}/{len(CORRECT_COLUMNS)}")
             print(f"- Mencoes incorretas (tabela embeddings/palavras soltas): {wrong_count}")
             
             if correct_mentions >= 5 and wrong_count == 0:
@@ -86,7 +103,7 @@ def test_data_types_query():
 
 if __name__ == "__main__":
     print("\nIniciando teste de validacao da correcao\n")
-    success = test_data_types_query()
+    success = test_data_types_query(OrchestratorAgent())
     
     if success:
         print("\n" + "=" * 80)
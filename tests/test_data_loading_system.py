@@ -6,6 +6,8 @@ Este módulo executa testes completos de:
 - Limpeza automática
 - Integração com análise
 - Exportação
+
+Execução: pytest tests/test_data_loading_system.py (em paralelo: -n auto)
 """
 import sys
 import os
@@ -13,6 +15,7 @@ from pathlib import Path
 import tempfile
 import pandas as pd
 import numpy as np
+import pytest
 
 # Adicionar o diretório raiz ao PYTHONPATH
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -21,55 +24,77 @@ from src.data.data_processor import DataProcessor, create_demo_data
 from src.data.data_loader import DataLoader, DataLoaderError
 from src.data.data_validator import DataValidator
 
+# Colunas aleatórias geradas uma vez (semente fixa) e fatiadas pelos testes;
+# somente leitura porque os DataFrames são montados sem cópia
+_rng = np.random.default_rng(42)
+_VALUES = _rng.random(10_000, dtype=np.float32)
+_CATEGORIES = _rng.choice(np.array(['A', 'B', 'C'], dtype=object), 10_000)
+_VALUES.setflags(write=False)
+_CATEGORIES.setflags(write=False)
+
+
+def make_test_frame(num_rows: int) -> pd.DataFrame:
+    """Monta DataFrame id/value/category a partir das colunas pré-geradas."""
+    return pd.DataFrame({
+        'id': np.arange(1, num_rows + 1, dtype=np.int32),
+        'value': _VALUES[:num_rows],
+        'category': _CATEGORIES[:num_rows]
+    }, copy=False)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def write_test_csv(df: pd.DataFrame, path) -> None:
+    """Grava CSV de teste (caminho ou arquivo binário) com o writer C++ do
+    Arrow (fallback: pandas.to_csv)."""
+    if PYARROW_AVAILABLE:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False),
+                        path if hasattr(path, 'write') else str(path))
+    else:
+        df.to_csv(path, index=False, encoding='utf-8')
+
+
+# Diretório em RAM para arquivos temporários (Linux); demais sistemas usam tmp_path
+RAM_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+@pytest.fixture
+def ram_tmp_path(request):
+    """Diretório temporário em tmpfs, removido ao final do teste."""
+    if RAM_TMP_DIR is None:
+        yield request.getfixturevalue("tmp_path")
+        return
+    with tempfile.TemporaryDirectory(dir=RAM_TMP_DIR, prefix="pytest-") as tmp_dir:
+        yield Path(tmp_dir)
+
+
+@pytest.fixture(scope="session")
+def validator():
+    """DataValidator compartilhado (inclui o memo de validate_dataframe)."""
+    return DataValidator()
+
+
+@pytest.fixture(scope="session")
+def fraud_df():
+    """Dataset canônico de fraude (5000 linhas) gerado uma única vez por sessão."""
+    processor = create_demo_data("fraud_detection", 5000, caller_agent='test_system')
+    return processor.current_df
 
-class TestRunner:
-    """Executor de testes para o sistema de carregamento."""
-    
-    def __init__(self):
-        self.tests_passed = 0
-        self.tests_failed = 0
-        self.test_results = []
-        
-    def run_test(self, test_name, test_func):
-        """Executa um teste individual."""
-        try:
-            print(f"\n🧪 Executando: {test_name}")
-            result = test_func()
-            
-            if result:
-                print(f"✅ {test_name} - PASSOU")
-                self.tests_passed += 1
-                self.test_results.append({"name": test_name, "status": "PASSOU", "error": None})
-            else:
-                print(f"❌ {test_name} - FALHOU")
-                self.tests_failed += 1
-                self.test_results.append({"name": test_name, "status": "FALHOU", "error": "Teste retornou False"})
-                
-        except Exception as e:
-            print(f"❌ {test_name} - ERRO: {str(e)}")
-            self.tests_failed += 1
-            self.test_results.append({"name": test_name, "status": "ERRO", "error": str(e)})
-    
-    def print_summary(self):
-        """Imprime resumo dos testes."""
-        total = self.tests_passed + self.tests_failed
-        success_rate = (self.tests_passed / total * 100) if total > 0 else 0
-        
-        print(f"\n{'='*80}")
-        print(f"📊 RESUMO DOS TESTES")
-        print(f"{'='*80}")
-        print(f"Total de testes: {total}")
-        print(f"✅ Passou: {self.tests_passed}")
-        print(f"❌ Falhou: {self.tests_failed}")
-        print(f"🎯 Taxa de sucesso: {success_rate:.1f}%")
-        
-        if self.tests_failed > 0:
-            print(f"\n❌ Testes que falharam:")
-            for result in self.test_results:
-                if result["status"] != "PASSOU":
-                    print(f"  • {result['name']}: {result['error']}")
-        
-        return self.tests_failed == 0
+
+@pytest.fixture
+def make_processor(fraud_df):
+    """Cria DataProcessor carregado com as primeiras `num_rows` linhas de fraud_df."""
+    def _make(num_rows: int) -> DataProcessor:
+        processor = DataProcessor(caller_agent='test_system')
+        result = processor.load_from_dataframe(fraud_df.head(num_rows).copy(), "fraud_detection")
+        assert result['success'], f"Carregamento falhou: {result.get('error')}"
+        return processor
+    return _make
 
 
 def test_data_loader_basic():
@@ -84,8 +109,6 @@ def test_data_loader_basic():
     assert len(df.columns) > 0, "DataFrame não deve estar vazio"
     assert load_info['source_type'] == 'synthetic', "Tipo de fonte incorreto"
     assert load_info['rows'] == 100, "Número de linhas incorreto nos metadados"
-    
-    return True
 
 
 def test_data_loader_from_dataframe():
@@ -106,46 +129,66 @@ def test_data_loader_from_dataframe():
     assert len(df.columns) == 3, f"Esperado 3 colunas, obtido {len(df.columns)}"
     assert load_info['source_type'] == 'dataframe', "Tipo de fonte incorreto"
     assert not df.equals(test_df) or df is not test_df, "Deve ser uma cópia, não referência"
-    
-    return True
 
 
 def test_data_loader_file_operations():
     """Testa operações com arquivos temporários."""
     loader = DataLoader()
     
-    # Criar arquivo CSV temporário
-    test_data = pd.DataFrame({
-        'id': range(1, 101),
-        'value': np.random.rand(100),
-        'category': np.random.choice(['A', 'B', 'C'], 100)
-    })
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as f:
-        test_data.to_csv(f, index=False)
-        temp_file = f.name
+    # Criar arquivo CSV temporário (em memória até 1MB; não toca o disco)
+    test_data = make_test_frame(100)
     
-    try:
+    with tempfile.SpooledTemporaryFile(max_size=1 << 20, mode='w+b') as temp_file:
+        write_test_csv(test_data, temp_file)
+        temp_file.seek(0)
+        
         # Carregar arquivo
         df, load_info = loader.load_from_file(temp_file)
-        
-        # Verificações
-        assert len(df) == 100, f"Esperado 100 linhas, obtido {len(df)}"
-        assert len(df.columns) == 3, f"Esperado 3 colunas, obtido {len(df.columns)}"
-        assert load_info['source_type'] == 'file', "Tipo de fonte incorreto"
-        assert load_info['encoding'] in ['utf-8', 'ascii'], "Encoding não detectado corretamente"
-        
-        return True
-        
-    finally:
-        # Limpar arquivo temporário
-        os.unlink(temp_file)
+    
+    # Verificações
+    assert len(df) == 100, f"Esperado 100 linhas, obtido {len(df)}"
+    assert len(df.columns) == 3, f"Esperado 3 colunas, obtido {len(df.columns)}"
+    assert load_info['source_type'] == 'file', "Tipo de fonte incorreto"
+    assert load_info['encoding'] in ['utf-8', 'ascii'], "Encoding não detectado corretamente"
 
 
-def test_data_validator_basic():
-    """Testa validação básica de dados."""
-    validator = DataValidator()
+def test_data_loader_detects_non_utf8_file(ram_tmp_path):
+    """Testa que arquivos fora de UTF-8 continuam passando pela detecção de encoding."""
+    loader = DataLoader()
+    
+    temp_file = ram_tmp_path / "latin1.csv"
+    temp_file.write_bytes("cidade,valor\nSão Paulo,1\nBrasília,2\n".encode('latin-1'))
+    
+    df, load_info = loader.load_from_file(str(temp_file))
+    
+    assert load_info['encoding'].lower() != 'utf-8', "Arquivo latin-1 não deve ser lido como UTF-8"
+    assert df['cidade'].tolist() == ['São Paulo', 'Brasília']
+
+
+def test_data_loader_csv_dtypes_match_c_engine(ram_tmp_path):
+    """Com a configuração padrão, os dtypes lidos são os da engine C do pandas.
     
+    A engine pyarrow converteria a coluna de datas ISO (texto na engine C);
+    por isso ela só é usada com CSV_PYARROW_ENGINE=true.
+    """
+    loader = DataLoader()
+    
+    temp_file = ram_tmp_path / "datas.csv"
+    temp_file.write_text(
+        "data,valor,categoria,ativo\n"
+        "2024-01-01,10.5,A,True\n"
+        "2024-01-02,,B,False\n"
+        "2024-01-03,7.25,,True\n",
+        encoding='utf-8'
+    )
+    
+    df, _ = loader.load_from_file(temp_file)
+    
+    pd.testing.assert_series_equal(df.dtypes, pd.read_csv(temp_file, engine='c').dtypes)
+
+
+def test_data_validator_basic(validator):
+    """Testa validação básica de dados."""
     # Criar dados com problemas conhecidos
     problematic_df = pd.DataFrame({
         'good_col': [1, 2, 3, 4, 5],
@@ -163,14 +206,10 @@ def test_data_validator_basic():
     assert 0 <= results['overall_score'] <= 100, "Score deve estar entre 0-100"
     assert 'basic_info' in results, "Informações básicas devem estar presentes"
     assert results['basic_info']['shape'] == (5, 5), "Shape incorreto"
-    
-    return True
 
 
-def test_data_validator_cleaning():
+def test_data_validator_cleaning(validator):
     """Testa limpeza automática de dados."""
-    validator = DataValidator()
-    
     # Criar dados que precisam de limpeza
     dirty_df = pd.DataFrame({
         'id': [1, 2, 2, 4, 5],  # Duplicata
@@ -186,16 +225,31 @@ def test_data_validator_cleaning():
     assert len(clean_df) <= len(dirty_df), "Dados limpos não devem ter mais linhas"
     assert len(cleaning_report['actions_taken']) > 0, "Deve ter realizado ações de limpeza"
     assert 'rows_removed' in cleaning_report, "Deve reportar linhas removidas"
-    
-    return True
 
 
-def test_data_processor_integration():
+def test_data_validator_memoizes_identical_dataframes(validator):
+    """Testa reaproveitamento da validação para DataFrames idênticos."""
+    df = pd.DataFrame({'a': [1, '2', 3.0], 'b': [1, 2, 3]})
+    same_values_other_types = pd.DataFrame({'a': ['1', '2', 3.0], 'b': [1, 2, 3]})
+    
+    first = validator.validate_dataframe(df)
+    second = validator.validate_dataframe(df.copy())
+    
+    assert {**second, 'timestamp': None} == {**first, 'timestamp': None}
+    assert second is not first, "Resultado em cache deve ser devolvido como cópia"
+    # O horário reportado é o da validação atual, não o da entrada em cache
+    assert second['timestamp'] >= first['timestamp']
+    assert validator.get_validation_summary()['timestamp'] == second['timestamp']
+    assert (validator._dataframe_fingerprint(df)
+            != validator._dataframe_fingerprint(same_values_other_types))
+
+
+def test_data_processor_integration(fraud_df):
     """Testa integração completa do DataProcessor."""
     processor = DataProcessor(caller_agent='test_system', auto_validate=True, auto_clean=True)
     
-    # Carregar dados sintéticos
-    result = processor.load_synthetic_data("fraud_detection", 500)
+    # Carregar dados sintéticos (fatia do dataset compartilhado)
+    result = processor.load_from_dataframe(fraud_df.head(500).copy(), "fraud_detection")
     
     # Verificações do carregamento
     assert result['success'], f"Carregamento falhou: {result.get('error', 'Sem erro especificado')}"
@@ -214,72 +268,49 @@ def test_data_processor_integration():
     # Testar relatório de qualidade
     quality = processor.get_data_quality_report()
     assert 'overall_score' in quality, "Relatório de qualidade deve ter score"
-    
-    return True
 
 
-def test_synthetic_data_generation():
+@pytest.mark.parametrize("data_type,params", [
+    ("fraud_detection", {"num_rows": 200, "fraud_rate": 0.1}),
+    ("sales", {"num_rows": 150, "start_date": "2024-01-01"}),
+    ("generic", {"num_rows": 100, "num_numeric": 3, "num_categorical": 2}),
+    pytest.param("customer", {"num_rows": 120},
+                 marks=pytest.mark.xfail(reason="Falha conhecida no tipo customer", strict=False)),
+])
+def test_synthetic_data_generation(data_type, params):
     """Testa geração de diferentes tipos de dados sintéticos."""
-    test_cases = [
-        ("fraud_detection", {"num_rows": 200, "fraud_rate": 0.1}),
-        ("sales", {"num_rows": 150, "start_date": "2024-01-01"}),
-        ("generic", {"num_rows": 100, "num_numeric": 3, "num_categorical": 2})
-    ]
-
-    for data_type, params in test_cases:
-        try:
-            processor = create_demo_data(data_type, caller_agent='test_system', **params)
-            summary = processor.get_dataset_summary()
-            
-            expected_rows = params.get("num_rows", 1000)
-            actual_rows = summary['basic_info']['shape'][0]
-            
-            assert actual_rows == expected_rows, f"{data_type}: Esperado {expected_rows} linhas, obtido {actual_rows}"
-            
-        except Exception as e:
-            if data_type == "customer":
-                # Permitir falha conhecida no tipo customer
-                print(f"⚠️  Falha conhecida em {data_type}: {str(e)}")
-                continue
-            else:
-                raise e
-    
-    return True
-
-
-def test_export_import_cycle():
+    processor = create_demo_data(data_type, caller_agent='test_system', **params)
+    summary = processor.get_dataset_summary()
+    
+    expected_rows = params.get("num_rows", 1000)
+    actual_rows = summary['basic_info']['shape'][0]
+    
+    assert actual_rows == expected_rows, f"{data_type}: Esperado {expected_rows} linhas, obtido {actual_rows}"
+
+
+def test_export_import_cycle(ram_tmp_path, make_processor):
     """Testa ciclo completo de exportação e importação."""
     # Criar dados
-    processor1 = create_demo_data("fraud_detection", 300, caller_agent='test_system')
+    processor1 = make_processor(300)
     
-    # Exportar para arquivo temporário
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as f:
-        temp_file = f.name
+    temp_file = str(ram_tmp_path / "exportado.csv")
     
-    try:
-        # Exportar
-        success = processor1.export_to_csv(temp_file)
-        assert success, "Exportação falhou"
-        assert os.path.exists(temp_file), "Arquivo exportado não existe"
-        
-        # Importar
-        processor2 = DataProcessor(caller_agent='test_system')
-        result = processor2.load_from_file(temp_file)
-        
-        assert result['success'], f"Importação falhou: {result.get('error')}"
-        
-        # Comparar
-        summary1 = processor1.get_dataset_summary()
-        summary2 = processor2.get_dataset_summary()
-        
-        assert summary1['basic_info']['shape'] == summary2['basic_info']['shape'], "Shapes diferentes após export/import"
-        
-        return True
-        
-    finally:
-        # Limpar arquivo temporário
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
+    # Exportar
+    success = processor1.export_to_csv(temp_file)
+    assert success, "Exportação falhou"
+    assert os.path.exists(temp_file), "Arquivo exportado não existe"
+    
+    # Importar
+    processor2 = DataProcessor(caller_agent='test_system')
+    result = processor2.load_from_file(temp_file)
+    
+    assert result['success'], f"Importação falhou: {result.get('error')}"
+    
+    # Comparar
+    summary1 = processor1.get_dataset_summary()
+    summary2 = processor2.get_dataset_summary()
+    
+    assert summary1['basic_info']['shape'] == summary2['basic_info']['shape'], "Shapes diferentes após export/import"
 
 
 def test_error_handling():
@@ -309,73 +340,23 @@ def test_error_handling():
     result = processor_empty.analyze("teste")
     # Sistema retorna resposta via agente mesmo sem dados locais, verificando embeddings
     assert 'content' in result or 'error' in result, "Deve retornar conteúdo ou erro"
-    
-    return True
-
 
-def test_performance_basic():
-    """Testa performance básica do sistema."""
-    import time
 
-    # Teste com dataset médio
-    start_time = time.time()
-    processor = create_demo_data("fraud_detection", 5000, caller_agent='test_system')
-    end_time = time.time()
-    
-    processing_time = end_time - start_time
+@pytest.mark.benchmark(group="data_loading", min_rounds=3)
+def test_performance_basic(benchmark):
+    """Mede a geração + validação + limpeza de um dataset médio."""
+    processor = benchmark(create_demo_data, "fraud_detection", 5000, caller_agent='test_system')
     
-    # Verificações de performance (limites generosos)
-    assert processing_time < 10, f"Processamento muito lento: {processing_time:.2f}s"
-    
-    # Teste de análise
-    start_time = time.time()
-    result = processor.analyze("Faça um resumo dos dados")
-    end_time = time.time()
-    
-    analysis_time = end_time - start_time
-    assert analysis_time < 5, f"Análise muito lenta: {analysis_time:.2f}s"
-    
-    return True
+    assert processor.current_df is not None
+    assert len(processor.current_df) == 5000
 
 
-def main():
-    """Executa todos os testes."""
-    print("🚀 EXECUTANDO TESTES DO SISTEMA DE CARREGAMENTO")
-    print("=" * 80)
-    
-    runner = TestRunner()
-    
-    # Lista de testes
-    tests = [
-        ("Carregamento Básico de Dados", test_data_loader_basic),
-        ("Carregamento de DataFrame", test_data_loader_from_dataframe),
-        ("Operações com Arquivos", test_data_loader_file_operations),
-        ("Validação Básica", test_data_validator_basic),
-        ("Limpeza Automática", test_data_validator_cleaning),
-        ("Integração do DataProcessor", test_data_processor_integration),
-        ("Geração de Dados Sintéticos", test_synthetic_data_generation),
-        ("Ciclo Exportar/Importar", test_export_import_cycle),
-        ("Tratamento de Erros", test_error_handling),
-        ("Performance Básica", test_performance_basic),
-    ]
+@pytest.mark.benchmark(group="data_loading")
+def test_performance_analysis(benchmark, make_processor):
+    """Mede uma análise sobre o dataset médio (rodada única: envolve o LLM)."""
+    processor = make_processor(5000)
     
-    # Executar testes
-    for test_name, test_func in tests:
-        runner.run_test(test_name, test_func)
+    result = benchmark.pedantic(processor.analyze, args=("Faça um resumo dos dados",),
+                                rounds=1, iterations=1)
     
-    # Imprimir resumo
-    success = runner.print_summary()
-    
-    if success:
-        print(f"\n🎉 TODOS OS TESTES PASSARAM!")
-        print(f"✅ Sistema de carregamento funcionando perfeitamente")
-        return 0
-    else:
-        print(f"\n⚠️  ALGUNS TESTES FALHARAM")
-        print(f"🔧 Verificar problemas antes de usar em produção")
-        return 1
-
-
-if __name__ == "__main__":
-    exit_code = main()
-    exit(exit_code)
\ No newline at end of file
+    assert 'content' in result or 'error' in result, "Deve retornar conteúdo ou erro"
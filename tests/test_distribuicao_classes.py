@@ -10,16 +10,14 @@ sys.path.insert(0, str(root_dir))
 
 from src.agent.orchestrator_agent import OrchestratorAgent
 
-def test_class_distribution():
+def test_class_distribution(orchestrator):
     """Testa especificamente a pergunta sobre distribuição de classes"""
     
     print("🧪 Teste Distribuição de Classes")
     print("=" * 50)
     
-    # Inicializar orquestrador
-    print("🔧 Inicializando orquestrador...")
-    orchestrator = OrchestratorAgent("orchestrator")
-    print("✅ Orquestrador inicializado")
+    # Orquestrador compartilhado (fixture de sessão em conftest.py)
+    orchestrator.reset_session()
     
     # Pergunta sobre distribuição de classes
     query = "Qual é a distribuição das classes de fraude? Quantos % são normais vs fraudulentas?"
@@ -49,5 +47,6 @@ def test_class_distribution():
         return False
 
 if __name__ == "__main__":
-    success = test_class_distribution()
+    print("🔧 Inicializando orquestrador...")
+    success = test_class_distribution(OrchestratorAgent())
     exit(0 if success else 1)
\ No newline at end of file
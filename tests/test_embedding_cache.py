@@ -0,0 +1,86 @@
+"""Testes do cache persistente de embeddings (SQLite, sem chamadas de rede)."""
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from src.embeddings.cache import SQLiteEmbeddingCache, get_embedding_cache
+from src.embeddings.generator import EmbeddingGenerator, EmbeddingProvider
+from src.settings import EMBEDDING_CACHE_PATH
+
+
+def test_sqlite_embedding_cache(tmp_path):
+    """Vetores sobrevivem ao fechamento do arquivo e voltam como float32."""
+    path = tmp_path / "embeddings.sqlite"
+    vector = np.random.default_rng(0).random(384).tolist()
+
+    cache = SQLiteEmbeddingCache(path)
+    assert cache.get("chave") is None
+    cache.put("chave", vector, provider="sentence_transformer", model="all-MiniLM-L6-v2")
+    cache.close()
+
+    reopened = SQLiteEmbeddingCache(path)
+    stored = reopened.get("chave")
+    assert stored.dtype == np.float32 and stored.shape == (384,)
+    np.testing.assert_allclose(stored, vector, rtol=1e-6)
+    assert len(reopened) == 1
+
+    # Substituir a chave não duplica a entrada
+    reopened.put("chave", [0.0] * 384, provider="sentence_transformer", model="all-MiniLM-L6-v2")
+    assert len(reopened) == 1 and not reopened.get("chave").any()
+
+    reopened.clear()
+    assert reopened.get("chave") is None
+    reopened.close()
+
+
+def test_get_embedding_cache_shared(tmp_path):
+    """Uma única conexão por arquivo."""
+    path = tmp_path / "embeddings.sqlite"
+    assert get_embedding_cache(path) is get_embedding_cache(str(path))
+
+
+def test_cache_key_depends_on_quantization(monkeypatch):
+    """Vetores FP32 e ONNX int8 (por arquivo) não compartilham entradas de cache."""
+    fp32 = EmbeddingGenerator(EmbeddingProvider.MOCK, quantized=False, persistent_cache=False)
+    int8 = EmbeddingGenerator(EmbeddingProvider.MOCK, quantized=True, persistent_cache=False)
+    key = int8._cache_key("texto")
+
+    assert fp32._cache_key("texto") != key
+
+    monkeypatch.setattr("src.embeddings.generator.EMBEDDING_ONNX_FILE", "onnx/model_qint8_arm64.onnx")
+    assert int8._cache_key("texto") != key
+
+
+def test_sqlite_embedding_cache_eviction(tmp_path, monkeypatch):
+    """put_many grava o lote de uma vez e descarta as entradas mais antigas acima do limite."""
+    cache = SQLiteEmbeddingCache(tmp_path / "embeddings.sqlite", max_entries=2)
+    clock = iter(range(1_000, 2_000))
+    monkeypatch.setattr("src.embeddings.cache.time.time", lambda: next(clock))
+
+    cache.put_many([("a", [1.0]), ("b", [2.0])], provider="mock", model="mock-model")
+    cache.put_many([("c", [3.0])], provider="mock", model="mock-model")
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
+    cache.close()
+
+
+def test_generator_persists_batch_in_one_call(tmp_path):
+    """Os embeddings novos de um lote vão ao SQLite em uma única gravação."""
+    cache = SQLiteEmbeddingCache(tmp_path / "embeddings.sqlite")
+    generator = EmbeddingGenerator(EmbeddingProvider.MOCK, persistent_cache=False)
+    generator._disk_cache = cache
+
+    with patch.object(cache, "put_many", wraps=cache.put_many) as put_many:
+        generator.generate_embeddings_for_texts(["um", "dois", "um"])
+
+    put_many.assert_called_once()
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_embedding_cache_path_is_absolute():
+    """O arquivo padrão fica na raiz do projeto, independente do diretório de execução."""
+    assert Path(EMBEDDING_CACHE_PATH).is_absolute()
@@ -0,0 +1,32 @@
+"""Testes do índice de similaridade dos guardrails (provider MOCK, sem rede)."""
+import numpy as np
+import pytest
+
+from src.embeddings.generator import EmbeddingGenerator, EmbeddingProvider
+from src.tools.guardrail_similarity import FastGuardrailIndex
+
+CANONICALS = [
+    "Todas as 31 colunas são numéricas",
+    "O dataset possui 284.807 registros",
+    "A média da coluna Amount é 88.35",
+]
+
+
+def test_fast_guardrail_index():
+    """A resposta idêntica a uma canônica tem similaridade 1 com ela."""
+    index = FastGuardrailIndex(CANONICALS, EmbeddingGenerator(EmbeddingProvider.MOCK))
+
+    assert index.vecs.dtype == np.float32 and index.vecs.shape[0] == len(CANONICALS)
+    np.testing.assert_allclose(np.linalg.norm(index.vecs, axis=1), 1.0, rtol=1e-5)
+
+    canonical, score = index.best_match(CANONICALS[1])
+    assert canonical == CANONICALS[1]
+    assert score == pytest.approx(1.0, abs=1e-5)
+
+    # Vetor nulo não gera divisão por zero
+    assert not index.score(np.zeros(index.vecs.shape[1])).any()
+
+
+def test_fast_guardrail_index_requires_canonicals():
+    with pytest.raises(ValueError):
+        FastGuardrailIndex([], EmbeddingGenerator(EmbeddingProvider.MOCK))
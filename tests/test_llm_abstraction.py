@@ -9,219 +9,314 @@ Este script testa se a camada de abstração LLM Manager funciona corretamente:
 - Integração com o orquestrador
 
 Uso:
-    python test_llm_abstraction.py
+    pytest tests/test_llm_abstraction.py -s
+    pytest tests/test_llm_abstraction.py -s --no-llm-cache   # sempre chama os provedores
+    pytest tests/test_llm_abstraction.py -n 4 --dist=load    # chamadas de rede em paralelo (pytest-xdist)
+    pytest tests/test_llm_abstraction.py -m "not integration" # apenas testes offline
+    pytest tests/test_llm_abstraction.py -m "not slow"        # sem chats reais a cada provedor
+    python tests/test_llm_abstraction.py [opções do pytest]
 """
 
 from __future__ import annotations
 import sys
+import time
 from pathlib import Path
 
+import pytest
+
 # Adiciona o diretório raiz do projeto ao PYTHONPATH
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
-from src.llm.manager import get_llm_manager, LLMConfig, LLMProvider
-from src.agent.orchestrator_agent import OrchestratorAgent
+from src.llm.manager import LLMConfig, LLMProvider, LLMResponse, ProviderCircuit
+from src.llm.cache import LLMCache, MemoryBackend
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-def test_llm_manager_basic():
+def test_llm_manager_basic(llm_manager):
     """Testa funcionalidades básicas do LLM Manager."""
     print("\n" + "="*60)
     print("🧪 TESTE 1: LLM Manager - Funcionalidades Básicas")
     print("="*60)
-    
-    try:
-        # Inicializar manager
-        manager = get_llm_manager()
-        print(f"✅ LLM Manager inicializado")
-        
-        # Verificar status
-        status = manager.get_status()
-        print(f"🤖 Provedor ativo: {status['active_provider']}")
-        print(f"📋 Ordem de preferência: {', '.join(status['preferred_order'])}")
-        
-        # Listar provedores disponíveis
-        print("\n📊 Status dos Provedores:")
-        for provider, info in status['provider_status'].items():
-            status_icon = "✅" if info['available'] else "❌"
-            print(f"   {status_icon} {provider.upper()}: {info['message']}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Erro no teste do LLM Manager: {e}")
-        return False
-
-def test_llm_manager_chat():
+
+    # Verificar status
+    status = llm_manager.get_status()
+    print(f"🤖 Provedor ativo: {status['active_provider']}")
+    print(f"📋 Ordem de preferência: {', '.join(status['preferred_order'])}")
+
+    # Listar provedores disponíveis
+    print("\n📊 Status dos Provedores:")
+    for provider, info in status['provider_status'].items():
+        status_icon = "✅" if info['available'] else "❌"
+        print(f"   {status_icon} {provider.upper()}: {info['message']}")
+
+    assert status['active_provider'] is not None
+
+@pytest.mark.integration
+def test_llm_manager_chat(llm_manager):
     """Testa chamada de chat do LLM Manager."""
     print("\n" + "="*60)
     print("🧪 TESTE 2: LLM Manager - Chat")
     print("="*60)
-    
-    try:
-        manager = get_llm_manager()
-        
-        # Configuração de teste
-        config = LLMConfig(temperature=0.1, max_tokens=100)
-        
-        # Prompt de teste
-        prompt = "Responda em uma frase: Qual é a capital do Brasil?"
-        
-        print(f"📝 Prompt: {prompt}")
-        print("🔄 Enviando para LLM...")
-        
-        # Fazer chamada
-        response = manager.chat(prompt, config)
-        
+
+    # Configuração de teste
+    config = LLMConfig(temperature=0.1, max_tokens=100)
+
+    # Prompts de teste independentes, enviados em um único lote
+    prompts = [
+        "Responda em uma frase: Qual é a capital do Brasil?",
+        "Diga olá",
+        "Responda em uma frase: quais são os tipos de dados (numéricos, categóricos)?",
+    ]
+
+    print(f"📝 Prompts: {len(prompts)}")
+    print("🔄 Enviando lote para LLM...")
+
+    # Fazer chamada
+    responses = llm_manager.chat_batch(prompts, config)
+
+    for prompt, response in zip(prompts, responses):
+        print(f"\n📝 Prompt: {prompt}")
         if response.success:
             print(f"✅ Resposta recebida via {response.provider.value}")
             print(f"📄 Conteúdo: {response.content}")
             print(f"⏱️ Tempo: {response.processing_time:.2f}s")
             print(f"🔢 Tokens: {response.tokens_used}")
-            return True
         else:
             print(f"❌ Falha na chamada: {response.error}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Erro no teste de chat: {e}")
-        return False
 
-def test_orchestrator_integration():
+    assert all(response.success for response in responses)
+
+    # As chamadas reutilizam o pool HTTP único do manager (keep-alive)
+    http_client = llm_manager._http_client
+    if http_client is not None:
+        connections = http_client._transport._pool.connections
+        print(f"🔌 Conexões HTTP abertas: {len(connections)}")
+        assert len(connections) <= len(prompts)
+
+@pytest.mark.integration
+def test_llm_manager_stream_chat(llm_manager):
+    """Testa o streaming: consome a resposta só até a primeira frase completa."""
+    config = LLMConfig(temperature=0.1, max_tokens=100)
+    prompt = "Responda em uma frase: Qual é a capital do Brasil?"
+
+    start = time.perf_counter()
+    time_to_first_token = None
+    pieces = []
+
+    stream = llm_manager.stream_chat(prompt, config)
+    for piece in stream:
+        if time_to_first_token is None:
+            time_to_first_token = time.perf_counter() - start
+        pieces.append(piece)
+        if "." in piece:
+            break
+    # Fecha a conexão sem esperar o restante da geração
+    stream.close()
+
+    text = "".join(pieces)
+    print(f"\n⏱️ Primeiro token: {time_to_first_token:.2f}s | total: {time.perf_counter() - start:.2f}s")
+    print(f"📄 Conteúdo: {text}")
+
+    assert time_to_first_token is not None and text.strip()
+
+@pytest.mark.integration
+def test_orchestrator_integration(orchestrator):
     """Testa integração do LLM Manager com o orquestrador."""
     print("\n" + "="*60)
     print("🧪 TESTE 3: Integração com Orquestrador")
     print("="*60)
-    
-    try:
-        # Inicializar orquestrador
-        print("🔧 Inicializando orquestrador...")
-        orchestrator = OrchestratorAgent()
-        print("✅ Orquestrador inicializado")
-        
-        # Verificar se LLM Manager está disponível
-        if orchestrator.llm_manager:
-            print("✅ LLM Manager integrado ao orquestrador")
-            
-            # Testar consulta
-            query = "Quais são os tipos de dados (numéricos, categóricos)?"
-            print(f"📝 Consulta de teste: {query}")
-            print("🔄 Processando...")
-            
-            result = orchestrator.process(query)
-            
-            if result.get("metadata", {}).get("error", False):
-                print(f"❌ Erro na consulta: {result.get('content')}")
-                return False
-            else:
-                print("✅ Consulta processada com sucesso")
-                print(f"📄 Resposta: {result.get('content', '')[:200]}...")
-                agents_used = result.get("metadata", {}).get("agents_used", [])
-                print(f"🤖 Agentes usados: {', '.join(agents_used)}")
-                return True
-        else:
-            print("❌ LLM Manager não está integrado ao orquestrador")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Erro no teste de integração: {e}")
-        return False
-
-def test_fallback_mechanism():
-    """Testa mecanismo de fallback entre provedores."""
+
+    orchestrator.reset_session()
+
+    # Verificar se LLM Manager está disponível
+    assert orchestrator.llm_manager, "LLM Manager não está integrado ao orquestrador"
+    print("✅ LLM Manager integrado ao orquestrador")
+
+    # Testar consulta
+    query = "Quais são os tipos de dados (numéricos, categóricos)?"
+    print(f"📝 Consulta de teste: {query}")
+    print("🔄 Processando...")
+
+    result = orchestrator.process(query)
+
+    assert not result.get("metadata", {}).get("error", False), result.get('content')
+    print("✅ Consulta processada com sucesso")
+    print(f"📄 Resposta: {result.get('content', '')[:200]}...")
+    agents_used = result.get("metadata", {}).get("agents_used", [])
+    print(f"🤖 Agentes usados: {', '.join(agents_used)}")
+
+def _available_providers(llm_manager):
+    status = llm_manager.get_status()
+    return [p for p, info in status['provider_status'].items() if info['available']]
+
+@pytest.mark.integration
+def test_fallback_mechanism(llm_manager):
+    """Testa mecanismo de fallback entre provedores (saúde em cache, sem chats reais)."""
     print("\n" + "="*60)
     print("🧪 TESTE 4: Mecanismo de Fallback")
     print("="*60)
-    
-    try:
-        manager = get_llm_manager()
-        
-        # Verificar quantos provedores estão disponíveis
-        status = manager.get_status()
-        available_providers = [
-            p for p, info in status['provider_status'].items() 
-            if info['available']
-        ]
-        
-        print(f"📊 Provedores disponíveis: {len(available_providers)}")
-        
-        if len(available_providers) > 1:
-            print("✅ Múltiplos provedores disponíveis - fallback pode ser testado")
-            
-            # Testar com provedor específico
-            for provider_name in available_providers:
-                try:
-                    provider = LLMProvider(provider_name)
-                    config = LLMConfig(temperature=0.1, max_tokens=50)
-                    response = manager.chat("Diga olá", config, force_provider=provider)
-                    
-                    if response.success:
-                        print(f"✅ {provider.value}: {response.content[:50]}...")
-                    else:
-                        print(f"❌ {provider.value}: {response.error}")
-                        
-                except Exception as e:
-                    print(f"❌ {provider_name}: Erro - {e}")
-            
-            return True
-            
-        elif len(available_providers) == 1:
-            print(f"⚠️ Apenas um provedor disponível ({available_providers[0]}) - fallback não pode ser testado")
-            return True
+
+    # Verificar quantos provedores estão disponíveis
+    available_providers = _available_providers(llm_manager)
+    print(f"📊 Provedores disponíveis: {len(available_providers)}")
+
+    if len(available_providers) < 2:
+        pytest.skip(f"Apenas {len(available_providers)} provedor(es) disponível(is) - fallback não pode ser testado")
+
+    print("✅ Múltiplos provedores disponíveis - fallback pode ser testado")
+
+    for provider_name in available_providers:
+        provider = LLMProvider(provider_name)
+
+        # Sonda o provedor no máximo uma vez a cada 60s; chats recentes já contam
+        ok = llm_manager.healthcheck(provider)
+        health = llm_manager.provider_health(provider)
+
+        assert health['configured'] and health['fresh'], health
+        assert health['ok'] is ok
+        if ok:
+            assert health['circuit'] == "closed", health
+        print(f"{'✅' if ok else '❌'} {provider.value}: circuito {health['circuit']}")
+
+@pytest.mark.slow
+@pytest.mark.integration
+def test_fallback_mechanism_live(llm_manager):
+    """Testa cada provedor com uma chamada real de chat."""
+    available_providers = _available_providers(llm_manager)
+    if len(available_providers) < 2:
+        pytest.skip(f"Apenas {len(available_providers)} provedor(es) disponível(is) - fallback não pode ser testado")
+
+    config = LLMConfig(temperature=0.1, max_tokens=50)
+    for provider_name in available_providers:
+        provider = LLMProvider(provider_name)
+
+        # Fallback verifica provedores reais: nunca usar o cache
+        start = time.perf_counter()
+        response = llm_manager.chat("Diga olá", config, force_provider=provider, use_cache=False)
+        elapsed = time.perf_counter() - start
+
+        # Um provedor travado deve falhar dentro do limite total da chamada
+        assert elapsed <= config.timeout_ms / 1000 + 5, f"{provider.value}: {elapsed:.1f}s"
+
+        health = llm_manager.provider_health(provider)
+        if response.success:
+            assert health['circuit'] == "closed" and health['ok'], health
+            print(f"✅ {provider.value}: {response.content[:50]}... (circuito {health['circuit']})")
         else:
-            print("❌ Nenhum provedor disponível")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Erro no teste de fallback: {e}")
-        return False
-
-def main():
-    """Executa todos os testes."""
-    print("\n" + "="*80)
-    print("🚀 TESTE DA CAMADA DE ABSTRAÇÃO LLM MANAGER".center(80))
-    print("="*80)
-    
-    tests = [
-        ("LLM Manager Básico", test_llm_manager_basic),
-        ("Chat LLM Manager", test_llm_manager_chat),
-        ("Integração Orquestrador", test_orchestrator_integration),
-        ("Mecanismo Fallback", test_fallback_mechanism)
-    ]
-    
-    results = []
-    
-    for test_name, test_func in tests:
-        try:
-            success = test_func()
-            results.append((test_name, success))
-        except Exception as e:
-            print(f"❌ Erro crítico no teste {test_name}: {e}")
-            results.append((test_name, False))
-    
-    # Resumo dos resultados
-    print("\n" + "="*60)
-    print("📊 RESUMO DOS TESTES")
-    print("="*60)
-    
-    passed = 0
-    for test_name, success in results:
-        status = "✅ PASSOU" if success else "❌ FALHOU"
-        print(f"{status} - {test_name}")
-        if success:
-            passed += 1
-    
-    print(f"\n🎯 Resultado Final: {passed}/{len(results)} testes passaram")
-    
-    if passed == len(results):
-        print("🎉 Todos os testes passaram! A camada de abstração está funcionando corretamente.")
-        return True
-    else:
-        print("⚠️ Alguns testes falharam. Verifique as configurações dos provedores LLM.")
-        return False
+            print(f"❌ {provider.value}: {response.error}")
+
+def test_llm_cache():
+    """Testa o cache de respostas (sem chamadas de rede)."""
+    cache = LLMCache(MemoryBackend(max_entries=2, ttl_seconds=60), semantic_model=None)
+    config = LLMConfig(temperature=0.0)
+    response = LLMResponse(content="Olá!", provider=LLMProvider.GROQ, model="teste", processing_time=1.5)
+
+    assert cache.get("Diga olá", config) is None
+    cache.set("Diga olá", config, response)
+
+    cached = cache.get("Diga olá", config)
+    assert cached is not None and cached.cached
+    assert cached.content == "Olá!" and cached.provider is LLMProvider.GROQ
+    assert cached.processing_time == 0.0
+
+    # Parâmetros diferentes geram chaves diferentes
+    assert cache.get("Diga olá", LLMConfig(temperature=0.0, max_tokens=10)) is None
+    assert cache.get("Diga olá", config, system_prompt="Seja formal") is None
+
+    # Respostas com falha não são armazenadas
+    cache.set("Falhou", config, LLMResponse(content="", provider=LLMProvider.GROQ, model="teste", success=False))
+    assert cache.get("Falhou", config) is None
+
+    # LRU: a entrada menos usada é descartada
+    cache.set("Prompt 2", config, response)
+    cache.get("Diga olá", config)
+    cache.set("Prompt 3", config, response)
+    assert cache.get("Prompt 2", config) is None
+    assert cache.get("Diga olá", config) is not None
+
+    # TTL expirado
+    expired = LLMCache(MemoryBackend(ttl_seconds=-1), semantic_model=None)
+    expired.set("Diga olá", config, response)
+    assert expired.get("Diga olá", config) is None
+
+def test_llm_cache_counters_thread_safe():
+    """Testa que hits/misses não perdem incrementos com get() em várias threads (chat_batch)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = LLMCache(MemoryBackend(ttl_seconds=60), semantic_model=None)
+    config = LLMConfig(temperature=0.0)
+    cache.set("Diga olá", config, LLMResponse(content="Olá!", provider=LLMProvider.GROQ, model="teste"))
+
+    prompts = ["Diga olá", "Outro prompt"] * 2000
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda prompt: cache.get(prompt, config), prompts))
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 2000 and stats["misses"] == 2000
+
+def test_llm_manager_cache_exact_by_default(monkeypatch):
+    """Sem LLM_CACHE_SEMANTIC, o cache do singleton usa apenas a chave exata."""
+    import src.llm.manager as manager_module
+
+    monkeypatch.setattr(manager_module, "LLM_CACHE_SEMANTIC", False)
+    monkeypatch.setattr(manager_module, "REDIS_URL", None)
+    monkeypatch.setattr(manager_module, "_llm_manager_instance", None)
+    monkeypatch.setattr(manager_module.LLMManager, "__init__", lambda self: setattr(self, "cache", None))
+
+    manager = manager_module.get_llm_manager(use_cache=True)
+    assert manager.cache is not None
+    assert manager.cache.semantic_model is None
+    assert not manager.cache.get_stats()["semantic_enabled"]
+
+@pytest.mark.integration
+def test_llm_manager_chat_cached(llm_manager):
+    """Testa que a repetição de prompts é respondida pelo cache."""
+    if llm_manager.cache is None:
+        pytest.skip("Cache desativado")
+
+    config = LLMConfig(temperature=0.1, max_tokens=100)
+    prompt = "Responda em uma frase: Qual é a capital do Brasil?"
+
+    first = llm_manager.chat(prompt, config)
+    second = llm_manager.chat(prompt, config)
+
+    assert first.success, first.error
+    assert second.cached and second.content == first.content
+    print(f"✅ Segunda chamada respondida pelo cache: {llm_manager.cache.get_stats()}")
+
+def test_read_timeout_first_token_only_when_streaming():
+    """O limite de primeiro token vale só para streaming; chat espera até timeout_ms."""
+    from collections import deque
+    import threading
+    from src.llm.manager import LLMManager
+
+    manager = object.__new__(LLMManager)
+    manager._latencies = {p: deque(maxlen=128) for p in LLMProvider}
+    manager._latencies_lock = threading.Lock()
+    config = LLMConfig(first_token_timeout_ms=20_000, timeout_ms=60_000)
+
+    assert manager._read_timeout(LLMProvider.GROQ, config) == 60.0
+    assert manager._read_timeout(LLMProvider.GROQ, config, streaming=True) == 20.0
+
+def test_provider_circuit_breaker():
+    """Testa o circuit breaker por provedor (sem chamadas de rede)."""
+    circuit = ProviderCircuit(failure_threshold=3, cooldown_s=60)
+
+    circuit.record_failure()
+    circuit.record_failure()
+    assert circuit.state == "closed" and circuit.allows_request()
+
+    circuit.record_failure()
+    assert circuit.state == "open" and not circuit.allows_request()
+
+    # Após o cooldown, uma chamada de teste é permitida
+    circuit.cooldown_s = 0
+    assert circuit.state == "half_open" and circuit.allows_request()
+
+    circuit.record_success()
+    assert circuit.state == "closed" and circuit.failures == 0
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-s", *sys.argv[1:]]))
@@ -6,48 +6,41 @@ Este script mostra as capacidades do orquestrador:
 - Manutenção de contexto
 - Interface unificada
 """
+import asyncio
 import sys
-import os
 from pathlib import Path
 
+import pytest
+
 # Adicionar o diretório raiz ao PYTHONPATH
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from src.agent.orchestrator_agent import OrchestratorAgent
-from src.data.data_processor import create_demo_data
+SEPARATOR = "=" * 70
+SECTION_RULE = "-" * 50
+QUERY_RULE = "─" * 30
 
 
-def test_orchestrator_comprehensive():
+def test_orchestrator_comprehensive(orchestrator, buffered_stdout):
     """Teste completo do sistema orquestrador."""
     
     print("🚀 DEMONSTRAÇÃO DO AGENTE ORQUESTRADOR CENTRAL")
-    print("=" * 70)
+    print(SEPARATOR)
     
-    # 1. Inicializar orquestrador
+    # 1. Orquestrador compartilhado (CSV, RAG e Data Processor habilitados)
     print("\n🤖 INICIALIZANDO SISTEMA...")
-    print("-" * 50)
+    print(SECTION_RULE)
     
-    try:
-        orchestrator = OrchestratorAgent(
-            enable_csv_agent=True,
-            enable_rag_agent=True, 
-            enable_data_processor=True
-        )
-        print("✅ Sistema inicializado com sucesso!")
-        
-        # Verificar status
-        status = orchestrator.process("status do sistema")
-        print(status['content'])
-        
-    except Exception as e:
-        print(f"❌ Erro na inicialização: {str(e)}")
-        return
+    orchestrator.reset_session()
+    
+    # Verificar status
+    status = orchestrator.process("status do sistema")
+    print(status['content'])
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     
     # 2. Testes de saudação e ajuda
     print("\n💬 TESTES DE INTERAÇÃO BÁSICA")
-    print("-" * 50)
+    print(SECTION_RULE)
     
     basic_queries = [
         "olá, como você pode me ajudar?",
@@ -57,7 +50,7 @@ def test_orchestrator_comprehensive():
     
     for query in basic_queries:
         print(f"\n📝 Consulta: {query}")
-        print("─" * 30)
+        print(QUERY_RULE)
         
         result = orchestrator.process(query)
         print(result['content'])
@@ -67,15 +60,17 @@ def test_orchestrator_comprehensive():
         if 'agents_used' in metadata:
             print(f"🤖 Agentes utilizados: {metadata['agents_used']}")
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     
     # 3. Teste de carregamento de dados
     print("\n📁 TESTE DE CARREGAMENTO DE DADOS")
-    print("-" * 50)
+    print(SECTION_RULE)
     
     # Criar dados sintéticos para demonstração
     print("🔧 Criando dados sintéticos...")
     try:
+        from src.data.data_processor import create_demo_data
+        
         demo_file = create_demo_data()
         print(f"✅ Dados criados: {demo_file}")
         
@@ -85,7 +80,7 @@ def test_orchestrator_comprehensive():
         
         print(f"\n📝 Consulta: {load_query}")
         print(f"📂 Contexto: {load_context}")
-        print("─" * 30)
+        print(QUERY_RULE)
         
         result = orchestrator.process(load_query, load_context)
         print(result['content'])
@@ -97,12 +92,12 @@ def test_orchestrator_comprehensive():
         print(f"❌ Erro no carregamento: {str(e)}")
         demo_file = None
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     
     # 4. Testes de análise CSV (se dados foram carregados)
     if demo_file:
         print("\n📊 TESTES DE ANÁLISE CSV")
-        print("-" * 50)
+        print(SECTION_RULE)
         
         csv_queries = [
             "faça um resumo dos dados carregados",
@@ -111,11 +106,11 @@ def test_orchestrator_comprehensive():
             "quais são as estatísticas básicas?"
         ]
         
-        for query in csv_queries:
+        results = orchestrator.process_batch(csv_queries)
+        for query, result in zip(csv_queries, results):
             print(f"\n📝 Consulta: {query}")
-            print("─" * 30)
+            print(QUERY_RULE)
             
-            result = orchestrator.process(query)
             print(result['content'])
             
             # Mostrar uso de agentes
@@ -123,11 +118,11 @@ def test_orchestrator_comprehensive():
             agents_used = metadata.get('agents_used', [])
             print(f"🤖 Agentes: {', '.join(agents_used) if agents_used else 'nenhum'}")
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     
     # 5. Testes RAG (busca semântica)
     print("\n🔍 TESTES DE BUSCA SEMÂNTICA (RAG)")
-    print("-" * 50)
+    print(SECTION_RULE)
     
     # Primeiro, adicionar alguns documentos à base de conhecimento
     print("📚 Adicionando conhecimento à base...")
@@ -148,12 +143,16 @@ def test_orchestrator_comprehensive():
             """
         }
         
-        for doc_id, content in documents.items():
-            ingest_result = orchestrator.agents["rag"].ingest_text(
-                text=content,
-                source_id=doc_id,
-                source_type="demo"
-            )
+        # Documentos independentes: ingeridos em paralelo
+        rag = orchestrator.agents["rag"]
+        
+        async def ingest_all():
+            return await asyncio.gather(*[
+                rag.ingest_text_async(text=content, source_id=doc_id, source_type="demo")
+                for doc_id, content in documents.items()
+            ])
+        
+        for doc_id, ingest_result in zip(documents, asyncio.run(ingest_all())):
             if not ingest_result.get('metadata', {}).get('error'):
                 print(f"✅ Documento '{doc_id}' adicionado")
         
@@ -170,12 +169,13 @@ def test_orchestrator_comprehensive():
         "qual o contexto sobre visualização de dados?"
     ]
     
-    for query in rag_queries:
+    # Embeddings das consultas gerados em lote
+    results = orchestrator.process_batch(rag_queries)
+    for query, result in zip(rag_queries, results):
         print(f"\n📝 Consulta: {query}")
-        print("─" * 30)
+        print(QUERY_RULE)
         
         try:
-            result = orchestrator.process(query)
             content = result['content']
             
             # Limitar saída para demonstração
@@ -194,16 +194,16 @@ def test_orchestrator_comprehensive():
         except Exception as e:
             print(f"⚠️ Erro na busca: {str(e)}")
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     
     # 6. Teste de consulta híbrida
     print("\n🔄 TESTE DE CONSULTA HÍBRIDA")
-    print("-" * 50)
+    print(SECTION_RULE)
     
     if demo_file:
         hybrid_query = "analise os dados carregados e busque informações similares sobre fraude"
         print(f"📝 Consulta: {hybrid_query}")
-        print("─" * 30)
+        print(QUERY_RULE)
         
         try:
             result = orchestrator.process(hybrid_query)
@@ -224,11 +224,11 @@ def test_orchestrator_comprehensive():
         except Exception as e:
             print(f"⚠️ Erro na consulta híbrida: {str(e)}")
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     
     # 7. Estatísticas finais
     print("\n📈 ESTATÍSTICAS FINAIS")
-    print("-" * 50)
+    print(SECTION_RULE)
     
     try:
         # Histórico da conversa
@@ -247,39 +247,34 @@ def test_orchestrator_comprehensive():
     except Exception as e:
         print(f"⚠️ Erro nas estatísticas: {str(e)}")
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
 
 
-def test_simple_orchestrator():
+def test_simple_orchestrator(orchestrator):
     """Teste simples e rápido do orquestrador."""
     print("⚡ TESTE RÁPIDO DO ORQUESTRADOR")
     print("=" * 40)
     
-    try:
-        orchestrator = OrchestratorAgent()
-        
-        # Teste básico
-        queries = [
-            "olá",
-            "status",
-            "ajuda"
-        ]
-        
-        for query in queries:
-            print(f"\n❓ {query}")
-            result = orchestrator.process(query)
-            print(f"✅ Resposta recebida ({len(result['content'])} chars)")
-        
-        print("\n✅ Teste rápido concluído!")
-        
-    except Exception as e:
-        print(f"❌ Erro: {str(e)}")
+    orchestrator.reset_session()
+    
+    # Teste básico
+    queries = [
+        "olá",
+        "status",
+        "ajuda"
+    ]
+    
+    for query in queries:
+        print(f"\n❓ {query}")
+        result = orchestrator.process(query)
+        assert result['content']
+        print(f"✅ Resposta recebida ({len(result['content'])} chars)")
+    
+    print("\n✅ Teste rápido concluído!")
 
 
 if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) > 1 and sys.argv[1] == "--quick":
-        test_simple_orchestrator()
-    else:
-        test_orchestrator_comprehensive()
\ No newline at end of file
+    args = sys.argv[1:]
+    if "--quick" in args:
+        args = [a for a in args if a != "--quick"] + ["-k", "test_simple_orchestrator"]
+    sys.exit(pytest.main([__file__, "-s", *args]))
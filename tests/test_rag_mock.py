@@ -1,232 +1,179 @@
-"""Teste do sistema de embeddings RAG com mocks para desenvolvimento."""
+"""Teste do sistema de embeddings RAG com mocks para desenvolvimento.
+
+Cada etapa (chunking, embeddings, workflow completo) é medida com pytest-benchmark.
+
+Uso:
+    pytest tests/test_rag_mock.py
+    pytest tests/test_rag_mock.py --benchmark-disable   # apenas correção, sem medições
+    python tests/test_rag_mock.py [opções do pytest]
+"""
+import itertools
 import sys
-import os
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, patch
 import numpy as np
+import pytest
 
 # Adicionar o diretório raiz ao PYTHONPATH
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+# Sem as dependências o módulo inteiro é pulado antes de montar qualquer mock
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("supabase")
+
+from src.embeddings.cache import SQLiteEmbeddingCache
+from src.embeddings.chunker import TextChunker, ChunkStrategy
+from src.embeddings.generator import EmbeddingGenerator, EmbeddingProvider
+from src.embeddings.vector_store import VectorStore
+
+
+# Embeddings mock pré-alocados (384 dimensões, padrão sentence-transformers)
+MOCK_EMBEDDING_POOL = np.random.default_rng(42).random((256, 384), dtype=np.float32)
+_mock_embedding_counter = itertools.count()
+
+EMBEDDING_TEXTS = [
+    "Fraude em cartão de crédito é um problema sério",
+    "Machine learning pode detectar padrões suspeitos",
+    "Análise de dados revela insights importantes"
+]
+
+WORKFLOW_TEXT = "Esta é uma demonstração do sistema RAG. Inclui análise de fraudes, machine learning e dados."
+
 
 def create_mock_embedding():
-    """Cria um embedding mock de 384 dimensões (padrão sentence-transformers)."""
-    return np.random.rand(384).tolist()
+    """Retorna um embedding mock float32 de 384 dimensões (próxima linha do pool)."""
+    return MOCK_EMBEDDING_POOL[next(_mock_embedding_counter) % len(MOCK_EMBEDDING_POOL)]
+
+
+def _mock_encode(texts, **kwargs):
+    """Substituto de SentenceTransformer.encode: uma linha do pool por texto."""
+    return MOCK_EMBEDDING_POOL[:len(texts)]
 
 
-def test_chunking_system():
+@pytest.fixture
+def sentence_transformer_mock():
+    """Substitui o modelo sentence-transformers carregado pelo gerador."""
+    with patch('src.embeddings.generator.SentenceTransformer') as mock_model:
+        mock_model.return_value.encode.side_effect = _mock_encode
+        yield mock_model
+
+
+@pytest.fixture
+def supabase_mock():
+    """Mock do Supabase novo para cada teste, usado pelo VectorStore."""
+    mock_supabase = MagicMock()
+    mock_supabase.table.return_value.select.return_value.execute.return_value.data = []
+    mock_supabase.rpc.return_value.execute.return_value.data = []
+    with patch('src.embeddings.vector_store.supabase', mock_supabase):
+        yield mock_supabase
+
+
+@pytest.mark.benchmark(group="chunking")
+@pytest.mark.parametrize("strategy", [ChunkStrategy.FIXED_SIZE, ChunkStrategy.PARAGRAPH, ChunkStrategy.SENTENCE])
+def test_chunking_system(benchmark, chunker, sample_text, strategy):
     """Testa apenas o sistema de chunking sem dependências externas."""
-    print("🧩 TESTE DO SISTEMA DE CHUNKING")
-    print("=" * 50)
-    
-    try:
-        from src.embeddings.chunker import TextChunker, ChunkStrategy
-        
-        # Texto de exemplo
-        sample_text = """
-        As fraudes em cartões de crédito são um problema crescente. 
-        
-        Os principais indicadores incluem:
-        - Transações em horários incomuns
-        - Mudanças súbitas de localização
-        - Valores muito acima do perfil histórico
-        
-        Para prevenção, recomenda-se:
-        1. Machine Learning para detecção em tempo real
-        2. Análise comportamental contínua
-        3. Autenticação biométrica
-        """
-        
-        chunker = TextChunker(chunk_size=150, overlap_size=30)
-        
-        # Teste diferentes estratégias
-        strategies = [ChunkStrategy.FIXED_SIZE, ChunkStrategy.PARAGRAPH, ChunkStrategy.SENTENCE]
-        
-        for strategy in strategies:
-            print(f"\n📄 Estratégia: {strategy.value}")
-            chunks = chunker.chunk_text(sample_text, "test_document", strategy)
-            print(f"   Número de chunks: {len(chunks)}")
-            
-            for i, chunk in enumerate(chunks):
-                print(f"   Chunk {i+1}: {chunk.content[:80]}{'...' if len(chunk.content) > 80 else ''}")
-                print(f"      Posição: {chunk.metadata.start_char}-{chunk.metadata.end_char}")
-        
-        print("✅ Sistema de chunking funcionando corretamente!")
-        
-    except Exception as e:
-        print(f"❌ Erro no sistema de chunking: {str(e)}")
-        return False
-    
-    return True
-
-
-def test_embeddings_generation():
+    chunks = benchmark(chunker.chunk_text, sample_text, "test_document", strategy)
+
+    assert chunks
+    for chunk in chunks:
+        assert chunk.metadata.strategy == strategy
+        assert chunk.metadata.start_position <= chunk.metadata.end_position
+
+
+@pytest.mark.benchmark(group="embeddings")
+def test_embeddings_generation(benchmark, sentence_transformer_mock):
     """Testa a geração de embeddings (sem modelo real)."""
-    print("\n🔢 TESTE DE GERAÇÃO DE EMBEDDINGS")
-    print("=" * 50)
-    
-    try:
-        from src.embeddings.generator import EmbeddingGenerator, EmbeddingProvider
-        
-        # Mock do modelo sentence-transformers
-        with patch('sentence_transformers.SentenceTransformer') as mock_model:
-            # Configurar mock para retornar embeddings fake
-            mock_instance = Mock()
-            mock_instance.encode.return_value = [create_mock_embedding() for _ in range(3)]
-            mock_model.return_value = mock_instance
-            
-            generator = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER)
-            
-            texts = [
-                "Fraude em cartão de crédito é um problema sério",
-                "Machine learning pode detectar padrões suspeitos",
-                "Análise de dados revela insights importantes"
-            ]
-            
-            print(f"📝 Gerando embeddings para {len(texts)} textos...")
-            embeddings = generator.generate_embeddings(texts)
-            
-            print(f"✅ Gerados {len(embeddings)} embeddings")
-            print(f"   Dimensões: {len(embeddings[0]) if embeddings else 0}")
-            print(f"   Formato: {type(embeddings[0][0]) if embeddings and embeddings[0] else 'N/A'}")
-            
-            return True
-            
-    except Exception as e:
-        print(f"❌ Erro na geração de embeddings: {str(e)}")
-        return False
-
-
-def test_complete_workflow():
+    generator = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER, persistent_cache=False)
+
+    embeddings = benchmark(generator.generate_embeddings_for_texts, EMBEDDING_TEXTS)
+
+    assert len(embeddings) == len(EMBEDDING_TEXTS)
+    assert all(result.dimensions == 384 for result in embeddings)
+    assert [result.chunk_content for result in embeddings] == EMBEDDING_TEXTS
+
+
+def test_embedding_cache(sentence_transformer_mock):
+    """Testa que textos repetidos são respondidos pelo cache sem chamar o modelo."""
+    generator = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER, persistent_cache=False)
+    encode = sentence_transformer_mock.return_value.encode
+
+    first = generator.generate_embedding(EMBEDDING_TEXTS[0])
+    second = generator.generate_embedding(EMBEDDING_TEXTS[0])
+    assert encode.call_count == 1
+    assert second.embedding == first.embedding and second.processing_time == 0.0
+
+    # Em lote, apenas os textos ainda não vistos são codificados
+    generator.generate_embeddings_for_texts(EMBEDDING_TEXTS)
+    assert encode.call_count == 2
+    assert encode.call_args.args[0] == EMBEDDING_TEXTS[1:]
+
+    stats = generator.cache_stats()
+    assert stats["hits"] == 2 and stats["entries"] == len(EMBEDDING_TEXTS)
+
+
+def test_embedding_cache_persistent(sentence_transformer_mock, tmp_path, monkeypatch):
+    """Testa que um novo gerador reaproveita os embeddings gravados em disco."""
+    disk_cache = SQLiteEmbeddingCache(tmp_path / "embeddings.sqlite")
+    monkeypatch.setattr("src.embeddings.generator.get_embedding_cache", lambda: disk_cache)
+    encode = sentence_transformer_mock.return_value.encode
+
+    first = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER, persistent_cache=True)
+    expected = first.generate_embedding(EMBEDDING_TEXTS[0])
+
+    # Simula uma nova execução: outro gerador, sem o LRU em memória
+    second = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER, persistent_cache=True)
+    result = second.generate_embedding(EMBEDDING_TEXTS[0])
+
+    assert encode.call_count == 1
+    assert result.embedding == pytest.approx(expected.embedding)
+    assert result.processing_time == 0.0
+
+
+def _run_workflow(supabase_mock):
+    """Chunking → embeddings → armazenamento → busca, com Supabase e modelo mockados."""
+    chunker = TextChunker(chunk_size=200, overlap_size=50)
+    chunks = chunker.chunk_text(WORKFLOW_TEXT, "test_workflow", ChunkStrategy.SENTENCE)
+
+    generator = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER, persistent_cache=False)
+    embeddings = generator.generate_embeddings_for_texts([chunk.content for chunk in chunks])
+
+    # Uma única inserção em lote para todos os chunks
+    for i, embedding in enumerate(embeddings):
+        embedding.chunk_metadata = {
+            'source': 'test',
+            'chunk_index': i,
+            'strategy': ChunkStrategy.SENTENCE.value
+        }
+    insert_response = supabase_mock.table.return_value.insert.return_value.execute.return_value
+    insert_response.error = None
+    insert_response.data = [{'id': f'mock-{i}'} for i in range(len(embeddings))]
+
+    vector_store = VectorStore()
+    stored_ids = vector_store.store_embeddings(embeddings, source_type="test")
+
+    # Mock dos resultados de busca
+    supabase_mock.rpc.return_value.execute.return_value.data = [
+        {
+            'id': stored_ids[0],
+            'chunk_text': chunks[0].content,
+            'similarity': 0.85,
+            'metadata': {'source': 'test', 'chunk_index': 0}
+        }
+    ]
+    results = vector_store.search_similar(create_mock_embedding(), limit=3)
+    return chunks, stored_ids, results
+
+
+@pytest.mark.benchmark(group="workflow")
+def test_complete_workflow(benchmark, sentence_transformer_mock, supabase_mock):
     """Testa o workflow completo com mocks."""
-    print("\n🔄 TESTE DE WORKFLOW COMPLETO")
-    print("=" * 50)
-    
-    try:
-        from src.embeddings.chunker import TextChunker, ChunkStrategy
-        from src.embeddings.generator import EmbeddingGenerator, EmbeddingProvider
-        
-        # Mock do Supabase
-        mock_supabase = Mock()
-        mock_table = Mock()
-        mock_execute = Mock()
-        
-        # Configurar cadeia de mocks do Supabase
-        mock_execute.data = []
-        mock_table.insert.return_value.execute.return_value = mock_execute
-        mock_table.select.return_value.execute.return_value = mock_execute
-        mock_supabase.table.return_value = mock_table
-        mock_supabase.rpc.return_value.execute.return_value = mock_execute
-        
-        # Mock do sentence transformers
-        with patch('sentence_transformers.SentenceTransformer') as mock_st:
-            with patch('src.vectorstore.supabase_client.supabase', mock_supabase):
-                
-                # Configurar mock sentence transformers
-                mock_model = Mock()
-                mock_model.encode.return_value = [create_mock_embedding() for _ in range(2)]
-                mock_st.return_value = mock_model
-                
-                # Workflow completo
-                print("1. 📋 Chunking do texto...")
-                chunker = TextChunker(chunk_size=200, overlap_size=50)
-                text = "Esta é uma demonstração do sistema RAG. Inclui análise de fraudes, machine learning e dados."
-                chunks = chunker.chunk_text(text, "test_workflow", ChunkStrategy.SENTENCE)
-                print(f"   ✅ {len(chunks)} chunks criados")
-                
-                print("2. 🔢 Geração de embeddings...")
-                generator = EmbeddingGenerator(EmbeddingProvider.SENTENCE_TRANSFORMER)
-                embeddings = generator.generate_embeddings([chunk.content for chunk in chunks])
-                print(f"   ✅ {len(embeddings)} embeddings gerados")
-                
-                print("3. 💾 Simulação de armazenamento vetorial...")
-                from src.embeddings.vector_store import VectorStore
-                
-                vector_store = VectorStore()
-                
-                for chunk, embedding in zip(chunks, embeddings):
-                    result = vector_store.add_embedding(
-                        text=chunk.content,
-                        embedding=embedding,
-                        metadata={
-                            'source': 'test',
-                            'chunk_index': chunks.index(chunk),
-                            'strategy': ChunkStrategy.SENTENCE.value
-                        }
-                    )
-                    print(f"   📦 Chunk armazenado: {result}")
-                
-                print("4. 🔍 Simulação de busca por similaridade...")
-                query_embedding = create_mock_embedding()
-                
-                # Mock dos resultados de busca
-                mock_search_result = Mock()
-                mock_search_result.data = [
-                    {
-                        'chunk_text': chunks[0].content,
-                        'similarity': 0.85,
-                        'metadata': {'source': 'test', 'chunk_index': 0}
-                    }
-                ]
-                mock_supabase.rpc.return_value.execute.return_value = mock_search_result
-                
-                results = vector_store.search_similar(query_embedding, limit=3)
-                print(f"   🎯 Encontrados {len(results)} resultados similares")
-                
-                for result in results:
-                    print(f"      - Similaridade: {result.similarity:.3f}")
-                    print(f"      - Texto: {result.text[:60]}...")
-                
-                print("\n✅ WORKFLOW COMPLETO TESTADO COM SUCESSO!")
-                return True
-                
-    except Exception as e:
-        print(f"❌ Erro no workflow: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def main():
-    """Executa todos os testes."""
-    print("🚀 SISTEMA DE TESTE RAG - MODO DESENVOLVIMENTO")
-    print("=" * 60)
-    print("ℹ️  Este teste simula o sistema RAG sem necessidade de credenciais reais")
-    print()
-    
-    success_count = 0
-    total_tests = 3
-    
-    # Teste 1: Chunking
-    if test_chunking_system():
-        success_count += 1
-    
-    # Teste 2: Embeddings
-    if test_embeddings_generation():
-        success_count += 1
-    
-    # Teste 3: Workflow completo
-    if test_complete_workflow():
-        success_count += 1
-    
-    print(f"\n🏁 RESULTADO DOS TESTES")
-    print("=" * 30)
-    print(f"✅ Sucessos: {success_count}/{total_tests}")
-    print(f"❌ Falhas: {total_tests - success_count}/{total_tests}")
-    
-    if success_count == total_tests:
-        print("\n🎉 TODOS OS TESTES PASSARAM!")
-        print("   O sistema RAG está pronto para integração com credenciais reais.")
-    else:
-        print("\n⚠️  Alguns testes falharam.")
-        print("   Verifique os logs acima para detalhes.")
-    
-    print("\n📋 PRÓXIMOS PASSOS:")
-    print("1. Configure as credenciais em configs/.env")
-    print("2. Execute migrations com: python scripts/run_migrations.py")  
-    print("3. Teste com dados reais usando o agente CSV")
-    print("4. Integre RAG + CSV para análises contextualizadas")
+    chunks, stored_ids, results = benchmark(_run_workflow, supabase_mock)
+
+    assert len(stored_ids) == len(chunks)
+    assert len(results) == 1
+    assert results[0].chunk_text == chunks[0].content
+    assert results[0].similarity_score == pytest.approx(0.85)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))
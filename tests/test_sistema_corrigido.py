@@ -1,123 +1,59 @@
 #!/usr/bin/env python3
-"""Teste do sistema corrigido com estatísticas reais"""
+"""Teste do sistema corrigido com estatísticas reais
 
+Uso:
+    pytest tests/test_sistema_corrigido.py -s
+"""
+
+import asyncio
 import sys
 from pathlib import Path
 
+import pytest
+
 # Adiciona o diretório raiz do projeto ao PYTHONPATH
 root_dir = Path(__file__).parent
 sys.path.insert(0, str(root_dir))
 
-from src.agent.orchestrator_agent import OrchestratorAgent
+CASES = [
+    ("📋 Tipos de dados", "Quais são os tipos de dados (numéricos, categóricos)?"),
+    ("📊 Estatísticas específicas", "Quais são as estatísticas do campo Amount (média, desvio padrão, mín, máx)?"),
+    ("📈 Distribuição de classes", "Qual é a distribuição das classes de fraude? Quantos % são normais vs fraudulentas?"),
+]
+
+@pytest.fixture(scope="module")
+def corrected_results(orchestrator):
+    """Respostas das consultas de CASES, processadas concorrentemente."""
+    async def run_all():
+        return await asyncio.gather(*(orchestrator.aprocess(query) for _, query in CASES))
 
-def test_corrected_system():
+    results = asyncio.run(run_all())
+    return {query: result for (_, query), result in zip(CASES, results)}
+
+@pytest.mark.integration
+@pytest.mark.parametrize("label,query", CASES, ids=["tipos", "estatisticas", "distribuicao"])
+def test_corrected_system(corrected_results, label, query):
     """Testa o sistema corrigido com ferramentas Python e guardrails"""
     
-    print("🧪 Teste do Sistema Corrigido")
-    print("=" * 60)
-    
-    # Inicializar orquestrador
-    print("🔧 Inicializando orquestrador com ferramentas corrigidas...")
-    orchestrator = OrchestratorAgent("orchestrator")
-    
-    print("✅ Orquestrador inicializado")
-    
-    # Teste 1: Pergunta sobre tipos de dados
     print(f"\n{'='*60}")
-    print("📋 TESTE 1: Tipos de dados")
+    print(f"🧪 Teste do Sistema Corrigido - {label}")
     print("="*60)
     
-    query1 = "Quais são os tipos de dados (numéricos, categóricos)?"
-    print(f"❓ Pergunta: {query1}")
-    print("🔄 Processando...")
-    
-    result1 = orchestrator.process(query1)
+    print(f"❓ Pergunta: {query}")
     
-    if result1:
-        print("\n✅ Sucesso!")
-        print("🤖 Resposta:")
-        print(result1.get("content", "Sem resposta"))
-        
-        metadata1 = result1.get("metadata", {})
-        print(f"\n🛠️ Agentes usados: {', '.join(metadata1.get('agents_used', []))}")
-        print(f"🤖 Provedor LLM: {metadata1.get('provider', 'N/A')}")
-        print(f"⏱️ Tempo: {metadata1.get('processing_time', 0):.2f}s")
-        
-        if metadata1.get("error", False):
-            print("🎯 Resultado: ❌ FALHA")
-            return False
-        else:
-            print("🎯 Resultado: ✅ SUCESSO")
-    else:
-        print("❌ Erro: Nenhuma resposta recebida")
-        return False
+    result = corrected_results[query]
     
-    # Teste 2: Pergunta sobre estatísticas específicas
-    print(f"\n{'='*60}")
-    print("📊 TESTE 2: Estatísticas específicas")
-    print("="*60)
+    assert result, "Nenhuma resposta recebida"
     
-    query2 = "Quais são as estatísticas do campo Amount (média, desvio padrão, mín, máx)?"
-    print(f"❓ Pergunta: {query2}")
-    print("🔄 Processando...")
+    print("🤖 Resposta:")
+    print(result.get("content", "Sem resposta"))
     
-    result2 = orchestrator.process(query2)
+    metadata = result.get("metadata", {})
+    print(f"\n🛠️ Agentes usados: {', '.join(metadata.get('agents_used', []))}")
+    print(f"🤖 Provedor LLM: {metadata.get('provider', 'N/A')}")
+    print(f"⏱️ Tempo: {metadata.get('processing_time', 0):.2f}s")
     
-    if result2:
-        print("\n✅ Sucesso!")
-        print("🤖 Resposta:")
-        print(result2.get("content", "Sem resposta"))
-        
-        metadata2 = result2.get("metadata", {})
-        print(f"\n🛠️ Agentes usados: {', '.join(metadata2.get('agents_used', []))}")
-        print(f"🤖 Provedor LLM: {metadata2.get('provider', 'N/A')}")
-        print(f"⏱️ Tempo: {metadata2.get('processing_time', 0):.2f}s")
-        
-        if metadata2.get("error", False):
-            print("🎯 Resultado: ❌ FALHA")
-            return False
-        else:
-            print("🎯 Resultado: ✅ SUCESSO")
-    else:
-        print("❌ Erro: Nenhuma resposta recebida")
-        return False
-    
-    # Teste 3: Pergunta sobre distribuição de classes
-    print(f"\n{'='*60}")
-    print("📈 TESTE 3: Distribuição de classes")
-    print("="*60)
-    
-    query3 = "Qual é a distribuição das classes de fraude? Quantos % são normais vs fraudulentas?"
-    print(f"❓ Pergunta: {query3}")
-    print("🔄 Processando...")
-    
-    result3 = orchestrator.process(query3)
-    
-    if result3:
-        print("\n✅ Sucesso!")
-        print("🤖 Resposta:")
-        print(result3.get("content", "Sem resposta"))
-        
-        metadata3 = result3.get("metadata", {})
-        print(f"\n🛠️ Agentes usados: {', '.join(metadata3.get('agents_used', []))}")
-        print(f"🤖 Provedor LLM: {metadata3.get('provider', 'N/A')}")
-        print(f"⏱️ Tempo: {metadata3.get('processing_time', 0):.2f}s")
-        
-        if metadata3.get("error", False):
-            print("🎯 Resultado: ❌ FALHA")
-            return False
-        else:
-            print("🎯 Resultado: ✅ SUCESSO")
-    else:
-        print("❌ Erro: Nenhuma resposta recebida")
-        return False
-    
-    print(f"\n{'='*60}")
-    print("🎯 RESULTADO GERAL: ✅ TODOS OS TESTES PASSARAM")
-    print("✅ Sistema corrigido funcionando com estatísticas reais!")
-    print("="*60)
-    return True
+    assert not metadata.get("error", False), result.get("content")
 
 if __name__ == "__main__":
-    success = test_corrected_system()
-    exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-s", *sys.argv[1:]]))
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """Teste para validar sistema genérico com diferentes CSVs"""
 
+import functools
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 # Adiciona o diretório raiz do projeto ao PYTHONPATH
@@ -11,29 +13,38 @@ sys.path.insert(0, str(root_dir))
 
 from src.tools.python_analyzer import python_analyzer
 from src.tools.guardrails import statistics_guardrails
+from tests._utils import banner
+
+@functools.lru_cache(maxsize=1)
+def _ensure_data_dir():
+    """Cria o diretório data/ uma única vez por sessão"""
+    data_dir = Path("data")
+    data_dir.mkdir(exist_ok=True)
+    return data_dir
 
 def create_sample_csv():
     """Cria um CSV de exemplo para testar sistema genérico"""
     
     print("📊 Criando CSV de exemplo para teste...")
     
-    # Criar dados de exemplo (vendas)
+    # Criar dados de exemplo (vendas) com operações vetorizadas do NumPy
+    n = 1000
+    produto_id = np.arange(1, n + 1)
     data = {
-        'produto_id': range(1, 1001),
-        'nome_produto': [f'Produto_{i}' for i in range(1, 1001)],
-        'categoria': ['Eletrônicos', 'Roupas', 'Casa', 'Livros'] * 250,
-        'preco': [10.99 + (i * 0.5) for i in range(1000)],
-        'quantidade_vendida': [1, 2, 3, 5, 10] * 200,
-        'desconto_aplicado': ['Sim', 'Não'] * 500,
-        'avaliacao': [1, 2, 3, 4, 5] * 200
+        'produto_id': produto_id,
+        'nome_produto': np.char.add('Produto_', produto_id.astype(str)),
+        'categoria': np.tile(['Eletrônicos', 'Roupas', 'Casa', 'Livros'], n // 4),
+        'preco': 10.99 + 0.5 * np.arange(n, dtype=np.float64),
+        'quantidade_vendida': np.tile([1, 2, 3, 5, 10], n // 5),
+        'desconto_aplicado': np.tile(['Sim', 'Não'], n // 2),
+        'avaliacao': np.tile([1, 2, 3, 4, 5], n // 5)
     }
     
     df = pd.DataFrame(data)
     
     # Salvar CSV de teste
-    csv_path = Path("data/vendas_exemplo.csv")
-    csv_path.parent.mkdir(exist_ok=True)
-    df.to_csv(csv_path, index=False)
+    csv_path = _ensure_data_dir() / "vendas_exemplo.csv"
+    df.to_csv(csv_path, index=False, chunksize=500)
     
     print(f"✅ CSV criado: {csv_path}")
     print(f"   - {len(df)} registros")
@@ -45,8 +56,7 @@ def create_sample_csv():
 def test_generic_system():
     """Testa sistema genérico com CSV diferente"""
     
-    print("🧪 Teste do Sistema Genérico")
-    print("=" * 60)
+    banner("🧪 Teste do Sistema Genérico")
     
     # Criar CSV de exemplo
     csv_path, original_df = create_sample_csv()
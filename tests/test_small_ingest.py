@@ -11,12 +11,9 @@ from src.agent.rag_agent import RAGAgent
 def test_small_ingest():
     print("🧪 Teste rápido: Ingestão das primeiras 500 linhas")
     
-    # Criar dataset de teste com 500 linhas
+    # Criar dataset de teste com 500 linhas (lê apenas as linhas necessárias)
     print("📁 Lendo arquivo original...")
-    df_full = pd.read_csv("data/creditcard.csv")
-    
-    # Pegar apenas as primeiras 500 linhas
-    df_test = df_full.head(500)
+    df_test = pd.read_csv("data/creditcard.csv", nrows=500)
     
     # Salvar arquivo de teste
     test_file = "data/creditcard_test_500.csv"
@@ -1,29 +1,29 @@
 #!/usr/bin/env python3
 """Teste para verificar se a correção da verificação de dados funciona."""
 
-import sys
-from pathlib import Path
+import logging
 
-# Adiciona o diretório raiz ao PYTHONPATH
-root_dir = Path(__file__).parent
-sys.path.insert(0, str(root_dir))
+from src.utils.logging_config import get_logger
 
-from src.agent.orchestrator_agent import OrchestratorAgent
+# Diagnósticos detalhados saem em DEBUG (pytest --log-cli-level=DEBUG ou
+# LOG_LEVEL=DEBUG): com o nível padrão, fatiamento e formatação das
+# respostas nem são executados
+logger = get_logger(__name__)
 
-def test_verificacao_dados_corrigida():
+def test_verificacao_dados_corrigida(orchestrator):
     """Testa se o sistema agora detecta corretamente dados na base."""
     
     print("🧪 TESTE: Verificação de dados corrigida")
     print("=" * 50)
     
     try:
-        # Criar agente orquestrador
-        orchestrator = OrchestratorAgent()
+        # Orquestrador compartilhado da sessão, com histórico limpo
+        orchestrator.reset_session()
         
         # Teste 1: Verificar se detecta dados na base
         print("\n📊 TESTE 1: Verificando detecção de dados na base...")
         has_data = orchestrator._check_data_availability()
-        print(f"   Resultado: {has_data}")
+        logger.debug("Resultado: %s", has_data)
         
         if has_data:
             print("   ✅ SUCESSO: Sistema detectou dados na base de dados!")
@@ -36,9 +36,11 @@ def test_verificacao_dados_corrigida():
         query = "Quais são os tipos de dados (numéricos, categóricos)?"
         response = orchestrator.process(query)
         
-        print(f"   Resposta: {response['content'][:100]}...")
-        print(f"   Agentes usados: {response.get('metadata', {}).get('agents_used', [])}")
-        print(f"   Erro: {response.get('metadata', {}).get('error', False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            metadata = response.get('metadata', {})
+            logger.debug("Resposta: %s...", response['content'][:100])
+            logger.debug("Agentes usados: %s", metadata.get('agents_used', []))
+            logger.debug("Erro: %s", metadata.get('error', False))
         
         # Verificar se não retornou a mensagem de "Base de Dados Necessária"
         if "Base de Dados Necessária" in response['content']:
@@ -56,9 +58,11 @@ def test_verificacao_dados_corrigida():
         return False
 
 if __name__ == "__main__":
+    from src.agent.orchestrator_agent import OrchestratorAgent
+    
     print("🚀 Iniciando teste de verificação de dados corrigida...")
     
-    success = test_verificacao_dados_corrigida()
+    success = test_verificacao_dados_corrigida(OrchestratorAgent())
     
     if success:
         print("\n🎉 TODOS OS TESTES PASSARAM!")
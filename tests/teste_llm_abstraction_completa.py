@@ -1,15 +1,12 @@
 #!/usr/bin/env python3
 """Teste completo de abstração LLM e validação genérica"""
 
-import sys
-from pathlib import Path
+import re
 
-# Adiciona o diretório raiz do projeto ao PYTHONPATH
-root_dir = Path(__file__).parent
-sys.path.insert(0, str(root_dir))
+import pytest
 
 from src.llm.manager import LLMManager, LLMConfig
-from src.tools.guardrails import statistics_guardrails
+from src.tools.guardrails import CsvAnalysis, TiposDados, statistics_guardrails
 from src.tools.python_analyzer import python_analyzer
 
 def test_llm_abstraction():
@@ -66,19 +63,14 @@ def test_llm_abstraction():
     
     try:
         # Simular contexto com dados reais
-        context = {
-            'csv_analysis': {
-                'total_records': 284807,
-                'total_columns': 31,
-                'tipos_dados': {
-                    'total_numericos': 31,
-                    'total_categoricos': 0
-                },
-                'estatisticas': {
-                    'Amount': {'mean': 88.35, 'std': 250.12}
-                }
+        context = CsvAnalysis(
+            total_records=284807,
+            total_columns=31,
+            tipos_dados=TiposDados(total_numericos=31, total_categoricos=0),
+            estatisticas={
+                'Amount': {'mean': 88.35, 'std': 250.12}
             }
-        }
+        )
         
         # Resposta correta
         correct_response = """
@@ -140,50 +132,58 @@ def test_llm_abstraction():
     
     return True
 
+PERGUNTAS_TESTE = [
+    "Quantos registros temos no dataset?",
+    "Quais são os tipos de dados das colunas?",
+    "Qual é a média da coluna Amount?",
+    "Como estão distribuídas as classes?",
+    "Existem valores ausentes nos dados?",
+    "Quais são as estatísticas principais?"
+]
+
+# Palavras-chave que indicam uma pergunta sobre os dados
+DATA_KEYWORDS = frozenset({
+    'quantos', 'tipos', 'média', 'distribuição', 'estatísticas',
+    'valores', 'dados', 'colunas', 'registros'
+})
+# Compilada uma vez: cada pergunta é verificada em uma única busca
+_DATA_KEYWORDS_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in sorted(DATA_KEYWORDS)))
+
 def test_different_questions():
     """Testa diferentes tipos de perguntas para garantir genericidade"""
     
     print(f"\n🎯 TESTE DE PERGUNTAS DIVERSAS")
     print("=" * 50)
     
-    perguntas_teste = [
-        "Quantos registros temos no dataset?",
-        "Quais são os tipos de dados das colunas?", 
-        "Qual é a média da coluna Amount?",
-        "Como estão distribuídas as classes?",
-        "Existem valores ausentes nos dados?",
-        "Quais são as estatísticas principais?"
-    ]
-    
-    for i, pergunta in enumerate(perguntas_teste, 1):
+    for i, pergunta in enumerate(PERGUNTAS_TESTE, 1):
         print(f"{i}. {pergunta}")
         
-        try:
-            # Simular contexto básico
-            context = {
-                'csv_analysis': {
-                    'total_records': 284807,
-                    'total_columns': 31,
-                    'tipos_dados': {'total_numericos': 31, 'total_categoricos': 0}
-                }
-            }
-            
-            # Verificar se pergunta seria classificada corretamente pelo sistema
-            needs_data = any(keyword in pergunta.lower() for keyword in [
-                'quantos', 'tipos', 'média', 'distribuição', 'estatísticas', 
-                'valores', 'dados', 'colunas', 'registros'
-            ])
-            
-            if needs_data:
-                print(f"   ✅ Seria classificada como pergunta de dados")
-            else:
-                print(f"   ⚠️ Pode não ser classificada como pergunta de dados")
-                
-        except Exception as e:
-            print(f"   ❌ Erro: {str(e)}")
+        # Verificar se pergunta seria classificada corretamente pelo sistema
+        needs_data = _DATA_KEYWORDS_PATTERN.search(pergunta.lower()) is not None
+        
+        if needs_data:
+            print(f"   ✅ Seria classificada como pergunta de dados")
+        else:
+            print(f"   ⚠️ Pode não ser classificada como pergunta de dados")
     
     return True
 
+@pytest.mark.integration
+def test_different_questions_llm(llm_manager):
+    """Classifica todas as perguntas com o LLM em um único lote (chat_batch)"""
+    
+    config = LLMConfig(temperature=0.0, max_tokens=5)
+    system_prompt = (
+        "Classifique a pergunta do usuário. Responda apenas DADOS se ela exige "
+        "consultar o dataset, ou GERAL caso contrário."
+    )
+    
+    responses = llm_manager.chat_batch(PERGUNTAS_TESTE, config, system_prompt=system_prompt)
+    
+    assert all(response.success for response in responses), [r.error for r in responses]
+    for pergunta, response in zip(PERGUNTAS_TESTE, responses):
+        print(f"   {response.content.strip():>6} ← {pergunta}")
+
 if __name__ == "__main__":
     print("🚀 VALIDAÇÃO COMPLETA: SISTEMA AGNÓSTICO A PROVEDOR LLM")
     print("=" * 80)